@@ -121,15 +121,22 @@ async def update_exchange_config(
         )
 
     cfg = container.exchange_config_store.update(payload)
+    if container.engine_process is not None:
+        # 交易所连接由引擎进程持有，由其重读配置文件后重建。
+        await container.engine_process.reload_exchange_config()
+        return container.exchange_config_store.to_view()
     adapter = build_exchange_adapter(
         container.settings,
         grvt_env=cfg.grvt_env,
         grvt_api_key=cfg.grvt_api_key,
         grvt_api_secret=cfg.grvt_api_secret,
         grvt_trading_account_id=cfg.grvt_trading_account_id,
+        telemetry=container.adapter_telemetry,
     )
+    previous_adapter = container.adapter
     container.adapter = adapter
     container.engine.replace_adapter(adapter)
+    await previous_adapter.close()
     return container.exchange_config_store.to_view()
 
 
@@ -149,6 +156,8 @@ async def update_telegram_config(
             detail="引擎运行中禁止修改配置，请先停止引擎",
         )
     container.telegram_config_store.update(payload)
+    if container.engine_process is not None:
+        await container.engine_process.reload_telegram_config()
     return container.telegram_config_store.to_view()
 
 
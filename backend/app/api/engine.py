@@ -1,9 +1,12 @@
 ﻿from __future__ import annotations
 
+import asyncio
+import os
+
 from fastapi import APIRouter, Depends
 
 from app.core.deps import get_container, require_user
-from app.schemas import EngineCommandResponse, HealthStatus
+from app.schemas import EngineCommandResponse, EngineProcessInfo, HealthStatus
 
 router = APIRouter(prefix="/api", tags=["engine"])
 
@@ -23,3 +26,15 @@ async def start_engine(container=Depends(get_container)) -> EngineCommandRespons
 async def stop_engine(container=Depends(get_container)) -> EngineCommandResponse:
     mode = await container.engine.stop(reason="manual")
     return EngineCommandResponse(message="引擎已停止", mode=mode)
+
+
+@router.get("/engine/process", response_model=EngineProcessInfo, dependencies=[Depends(require_user)])
+async def engine_process(container=Depends(get_container)) -> EngineProcessInfo:
+    if container.engine_process is not None:
+        return EngineProcessInfo(dedicated=True, **container.engine_process.state["process"])
+    return EngineProcessInfo(
+        dedicated=False,
+        pid=os.getpid(),
+        event_loop=type(asyncio.get_running_loop()).__module__.split(".")[0],
+        cpu_affinity=sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else [],
+    )
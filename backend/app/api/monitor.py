@@ -1,9 +1,26 @@
 ﻿from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
 from app.core.deps import get_container, require_user
-from app.schemas import MetricsResponse, OrderView, TradeView
+from app.schemas import (
+    AdapterCallStats,
+    AlertQueueStats,
+    ExecutorLaneStats,
+    LoopHealthStats,
+    MetricsHistoryPoint,
+    MetricsHistoryResponse,
+    MetricsResponse,
+    OrderView,
+    QuantileStats,
+    StreamSubscriberStats,
+    TickJournalStats,
+    TradeView,
+)
 
 router = APIRouter(prefix="/api", tags=["monitor"])
 
@@ -13,6 +30,89 @@ async def metrics(container=Depends(get_container)) -> MetricsResponse:
     return MetricsResponse(summary=container.monitor.summary, series=container.monitor.series())
 
 
+@router.get("/metrics/history", response_model=MetricsHistoryResponse, dependencies=[Depends(require_user)])
+async def metrics_history(
+    series: str,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    points: int = Query(default=500, ge=2, le=5000),
+    method: Literal["minmax", "lttb"] = "minmax",
+    container=Depends(get_container),
+) -> MetricsHistoryResponse:
+    if container.history is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="tick 日志未启用")
+    end = _as_utc(end) if end else datetime.now(timezone.utc)
+    start = _as_utc(start) if start else end - timedelta(hours=1)
+    if start >= end:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start 必须早于 end")
+    try:
+        # 读文件与降采样放到线程中，避免长区间查询占用事件循环。
+        resolution, rows = await asyncio.to_thread(
+            container.history.query, series, start.timestamp(), end.timestamp(), points, method
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return MetricsHistoryResponse(
+        series=series,
+        start=start,
+        end=end,
+        resolution=resolution,
+        method=method,
+        points=[
+            MetricsHistoryPoint(t=datetime.fromtimestamp(row.t, timezone.utc), value=row.value, min=row.min, max=row.max)
+            for row in rows
+        ],
+    )
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+@router.get(
+    "/metrics/quantiles",
+    response_model=dict[str, dict[str, QuantileStats]],
+    dependencies=[Depends(require_user)],
+)
+async def quantile_metrics(container=Depends(get_container)) -> dict[str, dict[str, QuantileStats]]:
+    return {
+        metric: {window: QuantileStats(**stats) for window, stats in windows.items()}
+        for metric, windows in container.monitor.quantile_summary().items()
+    }
+
+
+@router.get("/metrics/executors", response_model=dict[str, ExecutorLaneStats], dependencies=[Depends(require_user)])
+async def executor_metrics(container=Depends(get_container)) -> dict[str, ExecutorLaneStats]:
+    if container.engine_process is not None:
+        engine_lanes = container.engine_process.state.get("executors") or {}
+    else:
+        engine_lanes = container.adapter.executor_stats()
+    lanes = {**engine_lanes, **container.backtest_service.executor_stats()}
+    return {name: ExecutorLaneStats(**stats) for name, stats in lanes.items()}
+
+
+@router.get("/metrics/adapter", response_model=list[AdapterCallStats], dependencies=[Depends(require_user)])
+async def adapter_metrics(container=Depends(get_container)) -> list[AdapterCallStats]:
+    if container.engine_process is not None:
+        return [AdapterCallStats(**row) for row in container.engine_process.state.get("adapter_calls") or []]
+    if container.adapter_telemetry is None:
+        return []
+    return [AdapterCallStats(**row) for row in container.adapter_telemetry.snapshot()]
+
+
+@router.get("/metrics/alerts", response_model=AlertQueueStats, dependencies=[Depends(require_user)])
+async def alert_metrics(container=Depends(get_container)) -> AlertQueueStats:
+    if container.engine_process is not None:
+        # 告警由引擎进程发送，API 进程内的告警队列始终为空。
+        return AlertQueueStats(**container.engine_process.state["alerts"])
+    return AlertQueueStats(**container.alert_service.stats())
+
+
+@router.get("/metrics/stream", response_model=list[StreamSubscriberStats], dependencies=[Depends(require_user)])
+async def stream_metrics(container=Depends(get_container)) -> list[StreamSubscriberStats]:
+    return [StreamSubscriberStats(**item) for item in container.event_bus.stats()]
+
+
 @router.get("/orders/open", response_model=list[OrderView], dependencies=[Depends(require_user)])
 async def open_orders(container=Depends(get_container)) -> list[OrderView]:
     rows = container.monitor.open_orders
@@ -44,3 +144,25 @@ async def recent_trades(container=Depends(get_container)) -> list[TradeView]:
         )
         for t in rows
     ]
+
+
+@router.get("/metrics/loop", response_model=LoopHealthStats, dependencies=[Depends(require_user)])
+async def loop_metrics(container=Depends(get_container)) -> LoopHealthStats:
+    if container.engine_process is not None:
+        snapshot = container.engine_process.state.get("loop")
+    else:
+        snapshot = container.loop_monitor.snapshot() if container.loop_monitor is not None else None
+    if snapshot is None:
+        return LoopHealthStats(enabled=False)
+    return LoopHealthStats(enabled=True, **snapshot)
+
+
+@router.get("/metrics/journal", response_model=TickJournalStats, dependencies=[Depends(require_user)])
+async def journal_metrics(container=Depends(get_container)) -> TickJournalStats:
+    if container.engine_process is not None:
+        stats = container.engine_process.state.get("journal")
+    else:
+        stats = container.journal.stats() if container.journal is not None else None
+    if stats is None:
+        return TickJournalStats(enabled=False)
+    return TickJournalStats(enabled=True, **stats)
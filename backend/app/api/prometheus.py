@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import secrets
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+
+from app.core.auth import AuthError, decode_access_token
+from app.core.settings import Settings, get_settings
+from app.services.prometheus import CONTENT_TYPE, REGISTRY, family_names
+
+router = APIRouter(tags=["prometheus"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def prometheus_metrics(request: Request, settings: Settings = Depends(get_settings)) -> Response:
+    _authorize(request.headers.get("Authorization", ""), settings)
+    engine_process = request.app.state.container.engine_process
+    if engine_process is None:
+        return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+    # 引擎相关指标以引擎进程为准，API 进程只补充其独有的指标族（如 WS 订阅者）。
+    engine_text = await engine_process.prometheus_text()
+    return Response(engine_text + REGISTRY.render(skip=family_names(engine_text)), media_type=CONTENT_TYPE)
+
+
+def _authorize(header: str, settings: Settings) -> None:
+    """抓取端可用 METRICS_TOKEN，也可用登录 JWT；两者都不满足时拒绝，未配置 token 时不对外裸露。"""
+    provided = header.removeprefix("Bearer ").strip()
+    if settings.metrics_token and secrets.compare_digest(provided.encode(), settings.metrics_token.encode()):
+        return
+    try:
+        decode_access_token(settings, provided)
+    except AuthError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="metrics token 无效",
+            headers={"WWW-Authenticate": "Bearer"},
+        ) from exc
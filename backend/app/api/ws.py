@@ -6,6 +6,7 @@ from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
 
 from app.core.auth import AuthError, decode_access_token
 from app.core.settings import Settings, get_settings
+from app.services.stream_delta import PROTOCOL_VERSION, TickDeltaEncoder
 
 router = APIRouter(tags=["ws"])
 
@@ -20,17 +21,32 @@ async def stream_ws(websocket: WebSocket, settings: Settings = Depends(get_setti
         await websocket.close(code=4401)
         return
 
+    topics = [item for item in websocket.query_params.get("topics", "").split(",") if item.strip()]
+    # 默认合并 tick：慢客户端只拿到最新一帧，不积压；conflate=0 可关闭。
+    conflate = websocket.query_params.get("conflate", "1").lower() not in {"0", "false", "off"}
+    # protocol=delta 时 tick 改为快照 + 增量；缺省仍推送完整 tick，兼容现有前端。
+    delta = websocket.query_params.get("protocol", "full").lower() == "delta"
+    encoder = TickDeltaEncoder(settings.stream_delta_resync_sec) if delta else None
     await websocket.accept()
-    queue = container.event_bus.subscribe()
+    client = websocket.client
+    label = f"{client.host}:{client.port}" if client else ""
+    subscription = container.event_bus.subscribe(topics or None, conflate=conflate, label=label)
     try:
-        await websocket.send_json({"type": "hello", "payload": {"message": "connected"}})
+        hello: dict = {"message": "connected", "topics": topics or ["*"], "protocol": "delta" if delta else "full"}
+        if delta:
+            hello["version"] = PROTOCOL_VERSION
+        await websocket.send_json({"type": "hello", "payload": hello})
         while True:
             try:
-                event = await asyncio.wait_for(queue.get(), timeout=30.0)
-                await websocket.send_json(event)
+                event = await asyncio.wait_for(subscription.get(), timeout=30.0)
+                if encoder is not None and event.type == "tick":
+                    await websocket.send_text(encoder.encode(event))
+                else:
+                    # 事件已在发布时统一序列化，这里直接发送共享文本，不再逐连接编码。
+                    await websocket.send_text(event.text)
             except asyncio.TimeoutError:
                 await websocket.send_json({"type": "ping", "payload": {}})
     except WebSocketDisconnect:
         pass
     finally:
-        container.event_bus.unsubscribe(queue)
+        container.event_bus.unsubscribe(subscription)
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from app.core.settings import Settings
+from app.engine.strategy_engine import StrategyEngine
+from app.exchange.instrumented import AdapterTelemetry, InstrumentedAdapter
+from app.exchange.recording import ReplayAdapter
+from app.services.alerting import AlertService
+from app.services.event_bus import EventBus
+from app.services.monitoring import MonitoringService
+from app.services.prometheus import TICKS_TOTAL
+from app.services.runtime_config import RuntimeConfigStore
+from app.services.telegram_config import TelegramConfigStore
+
+
+async def replay_session(
+    recording: str | Path,
+    *,
+    speed: float = 0.0,
+    runtime_config_path: str | Path | None = None,
+    timeout_sec: float | None = None,
+) -> dict[str, Any]:
+    """用录制日志驱动完整的 StrategyEngine，直到录制耗尽或引擎熔断，返回 tick 数与每 tick CPU 耗时。"""
+    replay = ReplayAdapter(recording, speed=speed)
+    telemetry = AdapterTelemetry()
+    adapter = InstrumentedAdapter(replay, telemetry)
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = Settings()
+        config_store = RuntimeConfigStore(Path(runtime_config_path) if runtime_config_path else Path(tmp) / "runtime.json")
+        alert = AlertService(TelegramConfigStore(Path(tmp) / "telegram.json", settings))
+        engine = StrategyEngine(
+            adapter=adapter,
+            config_store=config_store,
+            monitor=MonitoringService(),
+            event_bus=EventBus(),
+            alert_service=alert,
+            interval_scale=1.0 / speed if speed > 0 else 0.0,
+        )
+        ticks_before = TICKS_TOTAL.labels().value
+        wall_started, cpu_started = time.perf_counter(), time.process_time()
+        await engine.start()
+        deadline = None if timeout_sec is None else time.monotonic() + timeout_sec
+        while not replay.finished.is_set() and engine.mode == "running":
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            await asyncio.sleep(0.02)
+        wall = time.perf_counter() - wall_started
+        cpu = time.process_time() - cpu_started
+        ticks = int(TICKS_TOTAL.labels().value - ticks_before)
+        if engine.mode == "running":
+            await engine.stop(reason="replay-finished")
+        await alert.aclose()
+    return {
+        "recording": str(recording),
+        "speed": speed,
+        "records": replay.total_records,
+        "replayed": replay.replayed,
+        "ticks": ticks,
+        "wall_sec": round(wall, 3),
+        "cpu_sec": round(cpu, 3),
+        "cpu_ms_per_tick": round(cpu * 1000.0 / ticks, 3) if ticks else None,
+        "final_mode": engine.mode,
+        "adapter_calls": telemetry.snapshot(),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="回放录制的交易所会话并统计引擎每 tick 开销")
+    parser.add_argument("--recording", required=True, help="EXCHANGE_RECORD_PATH 写出的录制文件")
+    parser.add_argument("--speed", type=float, default=0.0, help="回放倍速；0 表示不等待、尽快回放")
+    parser.add_argument("--runtime-config", default="", help="运行配置 JSON（可选，默认使用内置默认值）")
+    parser.add_argument("--timeout", type=float, default=0.0, help="最长运行秒数（0 为不限制）")
+    parser.add_argument("--out", default="", help="结果输出 JSON 文件路径（可选）")
+    args = parser.parse_args()
+
+    result = asyncio.run(
+        replay_session(
+            args.recording,
+            speed=args.speed,
+            runtime_config_path=args.runtime_config or None,
+            timeout_sec=args.timeout or None,
+        )
+    )
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        print(f"回放完成，结果已写入: {args.out}")
+    else:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -7,6 +7,7 @@ from pathlib import Path
 from uuid import uuid4
 
 from app.backtest.engine import run_backtest
+from app.core.executor import ExecutorLane
 from app.core.settings import Settings
 from app.schemas import BacktestJobRequest, BacktestJobStatus, BacktestJobView, BacktestReport
 
@@ -29,6 +30,8 @@ class BacktestService:
         self._settings = settings
         self._jobs: dict[str, _BacktestJobState] = {}
         self._lock = asyncio.Lock()
+        # 回测为 CPU 密集任务，独占线程池，避免挤占默认线程池中的交易调用。
+        self._lane = ExecutorLane("backtest", settings.backtest_workers)
 
     async def create_job(self, payload: BacktestJobRequest) -> BacktestJobView:
         request = payload.model_copy(update={"data_file": str(self._resolve_data_file(payload.data_file))})
@@ -69,7 +72,7 @@ class BacktestService:
             request = state.request
 
         try:
-            report = await asyncio.to_thread(run_backtest, request)
+            report = await self._lane.run(run_backtest, request)
             async with self._lock:
                 finished = self._jobs[job_id]
                 finished.status = "completed"
@@ -82,6 +85,9 @@ class BacktestService:
                 failed.error = str(exc)
                 failed.updated_at = datetime.now(timezone.utc)
 
+    def executor_stats(self) -> dict[str, dict]:
+        return {self._lane.name: self._lane.stats()}
+
     def _resolve_data_file(self, data_file: str) -> Path:
         raw = Path(data_file)
         if raw.is_absolute():
@@ -1,28 +1,124 @@
 ﻿from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
 from app.core.settings import Settings
 from app.engine.strategy_engine import StrategyEngine
 from app.exchange.base import ExchangeAdapter
+from app.exchange.factory import build_exchange_adapter
+from app.exchange.instrumented import AdapterTelemetry
 from app.backtest.service import BacktestService
 from app.services.alerting import AlertService
 from app.services.event_bus import EventBus
 from app.services.exchange_config import ExchangeConfigStore
+from app.services.loop_monitor import LoopMonitor
+from app.services.metrics_history import MetricsHistory
 from app.services.monitoring import MonitoringService
 from app.services.runtime_config import RuntimeConfigStore
 from app.services.telegram_config import TelegramConfigStore
+from app.services.tick_journal import TickJournal
+
+if TYPE_CHECKING:
+    from app.engine.process import EngineProcessClient, RemoteMonitor
 
 
 @dataclass(slots=True)
 class AppContainer:
     settings: Settings
-    adapter: ExchangeAdapter
+    adapter: ExchangeAdapter | None
     config_store: RuntimeConfigStore
     exchange_config_store: ExchangeConfigStore
     telegram_config_store: TelegramConfigStore
-    monitor: MonitoringService
+    monitor: MonitoringService | RemoteMonitor
     event_bus: EventBus
     alert_service: AlertService
     backtest_service: BacktestService
+    engine: StrategyEngine | EngineProcessClient
+    journal: TickJournal | None = None
+    history: MetricsHistory | None = None
+    adapter_telemetry: AdapterTelemetry | None = None
+    loop_monitor: LoopMonitor | None = None
+    # 独立引擎进程模式下为 IPC 客户端；engine/monitor 此时是它提供的代理与镜像。
+    engine_process: EngineProcessClient | None = None
+
+
+@dataclass(slots=True)
+class EngineStack:
+    """引擎及其直接依赖；API 进程内联运行与独立引擎进程共用同一套装配。"""
+
+    adapter: ExchangeAdapter
+    adapter_telemetry: AdapterTelemetry
+    monitor: MonitoringService
+    event_bus: EventBus
+    alert_service: AlertService
     engine: StrategyEngine
+    journal: TickJournal | None = None
+    history: MetricsHistory | None = None
+    loop_monitor: LoopMonitor | None = None
+
+
+def build_engine_stack(
+    settings: Settings,
+    config_store: RuntimeConfigStore,
+    exchange_config_store: ExchangeConfigStore,
+    telegram_config_store: TelegramConfigStore,
+) -> EngineStack:
+    exchange_cfg = exchange_config_store.get()
+    monitor_service = MonitoringService(max_points=1200)
+    event_bus = EventBus(queue_size=settings.stream_queue_size)
+    alert_service = AlertService(telegram_config_store)
+    journal: TickJournal | None = None
+    history: MetricsHistory | None = None
+    if settings.tick_journal_enabled:
+        # 1s/1m/1h 汇总在日志写线程中随每条记录增量更新，长区间查询不扫原始 tick。
+        rollups = MetricsHistory.build_writers(
+            settings.tick_journal_dir,
+            retention_sec=settings.tick_journal_retention_sec,
+            retention_max_bytes=settings.tick_journal_max_bytes,
+        )
+        journal = TickJournal(
+            settings.tick_journal_dir,
+            segment_records=settings.tick_journal_segment_records,
+            segment_max_age_sec=settings.tick_journal_segment_max_age_sec,
+            retention_sec=settings.tick_journal_retention_sec,
+            retention_max_bytes=settings.tick_journal_max_bytes,
+            sinks=rollups,
+        )
+        history = MetricsHistory(settings.tick_journal_dir, rollups)
+    adapter_telemetry = AdapterTelemetry()
+    loop_monitor: LoopMonitor | None = None
+    if settings.loop_monitor_enabled:
+        loop_monitor = LoopMonitor(
+            probe_interval_sec=settings.loop_lag_probe_interval_sec,
+            alert_ratio=settings.loop_lag_alert_ratio,
+            monitor=monitor_service,
+        )
+    adapter = build_exchange_adapter(
+        settings,
+        grvt_env=exchange_cfg.grvt_env,
+        grvt_api_key=exchange_cfg.grvt_api_key,
+        grvt_api_secret=exchange_cfg.grvt_api_secret,
+        grvt_trading_account_id=exchange_cfg.grvt_trading_account_id,
+        telemetry=adapter_telemetry,
+    )
+    engine = StrategyEngine(
+        adapter=adapter,
+        config_store=config_store,
+        monitor=monitor_service,
+        event_bus=event_bus,
+        alert_service=alert_service,
+        journal=journal,
+        loop_monitor=loop_monitor,
+    )
+    return EngineStack(
+        adapter=adapter,
+        adapter_telemetry=adapter_telemetry,
+        monitor=monitor_service,
+        event_bus=event_bus,
+        alert_service=alert_service,
+        engine=engine,
+        journal=journal,
+        history=history,
+        loop_monitor=loop_monitor,
+    )
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class ExecutorLane:
+    """独立、限容的线程池通道，记录排队深度与排队等待耗时。"""
+
+    def __init__(self, name: str, max_workers: int) -> None:
+        self._name = name
+        self._max_workers = max(1, int(max_workers))
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._submitted = 0
+        self._completed = 0
+        self._wait_ms_last = 0.0
+        self._wait_ms_max = 0.0
+        self._wait_ms_total = 0.0
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """在本通道线程池执行同步函数，语义同 asyncio.to_thread。"""
+        ctx = contextvars.copy_context()
+        call = functools.partial(ctx.run, self._invoke, time.perf_counter(), fn, *args)
+        with self._lock:
+            self._queued += 1
+            self._submitted += 1
+        try:
+            future = self._ensure_executor().submit(call)
+        except BaseException:
+            self._drop_queued()
+            raise
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def _on_done(self, future: Any) -> None:
+        # 排队中被取消时 _invoke 不会执行，这里补扣排队计数。
+        if future.cancelled():
+            self._drop_queued()
+
+    def _drop_queued(self) -> None:
+        with self._lock:
+            self._queued -= 1
+
+    def _invoke(self, submitted_at: float, fn: Callable[..., T], *args: Any) -> T:
+        wait_ms = (time.perf_counter() - submitted_at) * 1000.0
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._wait_ms_last = wait_ms
+            self._wait_ms_max = max(self._wait_ms_max, wait_ms)
+            self._wait_ms_total += wait_ms
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+
+    def _ensure_executor(self) -> ThreadPoolExecutor:
+        executor = self._executor
+        if executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self._max_workers,
+                        thread_name_prefix=f"lane-{self._name}",
+                    )
+                executor = self._executor
+        return executor
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            started = self._completed + self._running
+            return {
+                "max_workers": self._max_workers,
+                "queue_depth": self._queued,
+                "running": self._running,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "wait_ms_last": self._wait_ms_last,
+                "wait_ms_max": self._wait_ms_max,
+                "wait_ms_avg": self._wait_ms_total / started if started else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        """关闭线程池，不等待在途任务；再次调用 run 时按需重建。"""
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -23,10 +23,40 @@ class Settings(BaseSettings):
     app_admin_user: str = Field(default="admin", alias="APP_ADMIN_USER")
     app_admin_password_hash: str = Field(default="$pbkdf2-sha256$29000$vDem1FpLiRECIKSUsjYGoA$18PFiYxoPnnIz2EFPTAy.RpuVX9c8FCexDibwe7.Uok", alias="APP_ADMIN_PASSWORD_HASH")
 
+    exchange_venue: str = Field(default="grvt", alias="EXCHANGE_VENUE")
+    exchange_record_path: str = Field(default="", alias="EXCHANGE_RECORD_PATH")
+    replay_path: str = Field(default="", alias="REPLAY_PATH")
+    replay_speed: float = Field(default=1.0, alias="REPLAY_SPEED")
+
     grvt_env: str = Field(default="prod", alias="GRVT_ENV")
     grvt_api_key: str = Field(default="", alias="GRVT_API_KEY")
     grvt_api_secret: str = Field(default="", alias="GRVT_API_SECRET")
     grvt_trading_account_id: str = Field(default="", alias="GRVT_TRADING_ACCOUNT_ID")
+    grvt_market_stream_enabled: bool = Field(default=False, alias="GRVT_MARKET_STREAM_ENABLED")
+    grvt_market_stream_stale_sec: float = Field(default=2.0, alias="GRVT_MARKET_STREAM_STALE_SEC")
+    grvt_market_stream_rate_ms: int = Field(default=100, alias="GRVT_MARKET_STREAM_RATE_MS")
+    grvt_market_ws_url: str = Field(default="", alias="GRVT_MARKET_WS_URL")
+    grvt_async_http_enabled: bool = Field(default=False, alias="GRVT_ASYNC_HTTP_ENABLED")
+    grvt_http_timeout_sec: float = Field(default=5.0, alias="GRVT_HTTP_TIMEOUT_SEC")
+    grvt_http_max_connections: int = Field(default=20, alias="GRVT_HTTP_MAX_CONNECTIONS")
+    grvt_trade_workers: int = Field(default=4, alias="GRVT_TRADE_WORKERS")
+    grvt_read_workers: int = Field(default=4, alias="GRVT_READ_WORKERS")
+
+    sim_start_price: float = Field(default=600.0, alias="SIM_START_PRICE")
+    sim_volatility_per_sqrt_sec: float = Field(default=0.0002, alias="SIM_VOLATILITY_PER_SQRT_SEC")
+    sim_spread_bps: float = Field(default=2.0, alias="SIM_SPREAD_BPS")
+    sim_tick_size: float = Field(default=0.01, alias="SIM_TICK_SIZE")
+    sim_min_size: float = Field(default=0.001, alias="SIM_MIN_SIZE")
+    sim_taker_rate_per_sec: float = Field(default=2.0, alias="SIM_TAKER_RATE_PER_SEC")
+    sim_taker_size_base: float = Field(default=0.05, alias="SIM_TAKER_SIZE_BASE")
+    sim_maker_fee_bps: float = Field(default=-0.5, alias="SIM_MAKER_FEE_BPS")
+    sim_taker_fee_bps: float = Field(default=4.5, alias="SIM_TAKER_FEE_BPS")
+    sim_latency_ms: float = Field(default=0.0, alias="SIM_LATENCY_MS")
+    sim_jitter_ms: float = Field(default=0.0, alias="SIM_JITTER_MS")
+    sim_initial_usdt: float = Field(default=10_000.0, alias="SIM_INITIAL_USDT")
+    sim_seed: int = Field(default=-1, alias="SIM_SEED")
+    sim_price_file: str = Field(default="", alias="SIM_PRICE_FILE")
+    sim_price_speed: float = Field(default=1.0, alias="SIM_PRICE_SPEED")
 
     telegram_bot_token: str = Field(default="", alias="TELEGRAM_BOT_TOKEN")
     telegram_chat_id: str = Field(default="", alias="TELEGRAM_CHAT_ID")
@@ -35,8 +65,27 @@ class Settings(BaseSettings):
     exchange_config_path: str = Field(default="data/exchange_config.json", alias="EXCHANGE_CONFIG_PATH")
     telegram_config_path: str = Field(default="data/telegram_config.json", alias="TELEGRAM_CONFIG_PATH")
     data_dir: str = Field(default="data", alias="DATA_DIR")
+    backtest_workers: int = Field(default=1, alias="BACKTEST_WORKERS")
+    tick_journal_enabled: bool = Field(default=True, alias="TICK_JOURNAL_ENABLED")
+    tick_journal_dir: str = Field(default="data/journal", alias="TICK_JOURNAL_DIR")
+    tick_journal_segment_records: int = Field(default=65536, alias="TICK_JOURNAL_SEGMENT_RECORDS")
+    tick_journal_segment_max_age_sec: float = Field(default=3600.0, alias="TICK_JOURNAL_SEGMENT_MAX_AGE_SEC")
+    tick_journal_retention_sec: float = Field(default=604800.0, alias="TICK_JOURNAL_RETENTION_SEC")
+    tick_journal_max_bytes: int = Field(default=1073741824, alias="TICK_JOURNAL_MAX_BYTES")
+
+    metrics_token: str = Field(default="", alias="METRICS_TOKEN")
+    loop_monitor_enabled: bool = Field(default=True, alias="LOOP_MONITOR_ENABLED")
+    loop_lag_probe_interval_sec: float = Field(default=0.05, alias="LOOP_LAG_PROBE_INTERVAL_SEC")
+    loop_lag_alert_ratio: float = Field(default=0.5, alias="LOOP_LAG_ALERT_RATIO")
+
+    engine_process_enabled: bool = Field(default=False, alias="ENGINE_PROCESS")
+    engine_ipc_socket: str = Field(default="data/engine.sock", alias="ENGINE_IPC_SOCKET")
+    engine_uvloop: bool = Field(default=False, alias="ENGINE_UVLOOP")
+    engine_cpu_affinity: str = Field(default="", alias="ENGINE_CPU_AFFINITY")
+    engine_state_interval_sec: float = Field(default=1.0, alias="ENGINE_STATE_INTERVAL_SEC")
 
     stream_queue_size: int = 1024
+    stream_delta_resync_sec: float = Field(default=30.0, alias="STREAM_DELTA_RESYNC_SEC")
 
     @property
     def runtime_config_file(self) -> Path:
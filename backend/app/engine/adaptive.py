@@ -2,7 +2,69 @@
 
 import math
 from collections import deque
-from statistics import mean, pstdev
+from collections.abc import Iterable
+
+
+class _RollingStats:
+    """定长滑窗的 sum / sum-of-squares 累加器，O(1) 给出均值与总体标准差。"""
+
+    def __init__(self, maxlen: int) -> None:
+        self._values: deque[float] = deque(maxlen=max(1, int(maxlen)))
+        # 以窗口内某个实际值为平移基准累加，降低 sumsq 相减时的抵消误差；常数序列保持精确为 0。
+        self._shift = 0.0
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._pushes_since_rebuild = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @property
+    def maxlen(self) -> int:
+        return self._values.maxlen or 0
+
+    def last(self) -> float:
+        return self._values[-1]
+
+    def push(self, value: float) -> None:
+        values = self._values
+        if not values:
+            self._shift = value
+        if len(values) == values.maxlen:
+            old = values[0] - self._shift
+            self._sum -= old
+            self._sumsq -= old * old
+        values.append(value)
+        delta = value - self._shift
+        self._sum += delta
+        self._sumsq += delta * delta
+        self._pushes_since_rebuild += 1
+        if self._pushes_since_rebuild >= values.maxlen:
+            self._rebuild()
+
+    def mean(self) -> float:
+        n = len(self._values)
+        return self._shift + self._sum / n if n else 0.0
+
+    def pstdev(self) -> float:
+        n = len(self._values)
+        if n == 0:
+            return 0.0
+        avg = self._sum / n
+        return math.sqrt(max(0.0, self._sumsq / n - avg * avg))
+
+    def resize(self, maxlen: int, source: Iterable[float]) -> None:
+        """按新窗口长度从原始序列尾部重建。"""
+        maxlen = max(1, int(maxlen))
+        self._values = deque(list(source)[-maxlen:], maxlen=maxlen)
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        values = self._values
+        self._shift = values[-1] if values else 0.0
+        self._sum = math.fsum(v - self._shift for v in values)
+        self._sumsq = math.fsum((v - self._shift) ** 2 for v in values)
+        self._pushes_since_rebuild = 0
 
 
 class AdaptiveController:
@@ -10,79 +72,122 @@ class AdaptiveController:
 
     def __init__(self, maxlen: int = 600) -> None:
         self._returns: deque[float] = deque(maxlen=maxlen)
-        self._depth_scores: deque[float] = deque(maxlen=maxlen)
-        self._trade_intensity: deque[float] = deque(maxlen=maxlen)
+        self._depth_scores = _RollingStats(maxlen)
+        self._trade_intensity = _RollingStats(maxlen)
         self._sigma_history: deque[float] = deque(maxlen=maxlen)
         self._last_mid: float | None = None
         self._sigma_fallback: float = 0.001
         self._sigma_window_points: int = 60
         self._sigma_z_window_points: int = 180
         self._ewma_lambda: float = 0.94
+        # 窗口内 EWMA 的增量状态：_sq_window 为窗口内收益平方，_ewma_acc = Σ λ^(t-j)·r_j²。
+        self._sq_window: deque[float] = deque(maxlen=self._sigma_window_points)
+        self._ewma_acc: float = 0.0
+        self._ewma_evict_weight: float = self._ewma_lambda ** self._sigma_window_points
+        self._ewma_updates_since_rebuild: int = 0
+        self._sigma_cache: float | None = None
+        self._sigma_z_stats = _RollingStats(min(self._sigma_z_window_points, maxlen))
 
     def set_windows(self, sigma_window_sec: int, quote_interval_sec: float) -> None:
         points = int(round(float(sigma_window_sec) / max(quote_interval_sec, 0.05)))
         points = max(10, min(600, points))
-        self._sigma_window_points = points
-        self._sigma_z_window_points = max(20, min(2000, points * 3))
+        z_points = max(20, min(2000, points * 3))
+        if z_points != self._sigma_z_window_points:
+            self._sigma_z_window_points = z_points
+            self._sigma_z_stats.resize(min(z_points, self._sigma_history.maxlen or z_points), self._sigma_history)
+        if points != self._sigma_window_points:
+            self._sigma_window_points = points
+            self._rebuild_ewma()
 
     def set_sigma_baseline(self, sigma: float) -> None:
         if sigma <= 0:
             return
         self._sigma_fallback = max(1e-6, float(sigma))
+        self._sigma_cache = None
 
     def update(self, mid: float, depth_score: float, trade_intensity: float) -> tuple[float, float]:
         if self._last_mid and self._last_mid > 0:
             ret = math.log(max(mid, 1e-9) / self._last_mid)
             self._returns.append(ret)
+            self._push_ewma(ret * ret)
         self._last_mid = mid
 
-        self._depth_scores.append(depth_score)
-        self._trade_intensity.append(trade_intensity)
+        self._depth_scores.push(depth_score)
+        self._trade_intensity.push(trade_intensity)
 
         sigma = self.current_sigma()
         self._sigma_history.append(sigma)
+        self._sigma_z_stats.push(sigma)
         z = self.sigma_zscore(sigma)
         return sigma, z
 
     def current_sigma(self) -> float:
-        if len(self._returns) < 4:
-            return self._sigma_fallback
-        recent = list(self._returns)[-self._sigma_window_points :]
-        if len(recent) < 4:
+        """窗口内 EWMA 波动率，O(1) 计算并缓存到下一次 update。"""
+        if self._sigma_cache is None:
+            self._sigma_cache = self._compute_sigma()
+        return self._sigma_cache
+
+    def _compute_sigma(self) -> float:
+        window = self._sq_window
+        n = len(window)
+        if len(self._returns) < 4 or n < 4:
             return self._sigma_fallback
-        ewma_var = max(recent[0] * recent[0], 1e-12)
-        lam = self._ewma_lambda
-        for ret in recent[1:]:
-            ewma_var = lam * ewma_var + (1.0 - lam) * (ret * ret)
+        # 与逐点递推等价：以窗口首个收益平方为种子，其后按 λ 衰减累加。
+        first = window[0]
+        first_weight = self._ewma_lambda ** (n - 1)
+        tail = max(0.0, self._ewma_acc - first_weight * first)
+        ewma_var = first_weight * max(first, 1e-12) + (1.0 - self._ewma_lambda) * tail
         sigma = math.sqrt(max(ewma_var, 1e-12))
         return max(1e-6, sigma)
 
+    def _push_ewma(self, sq: float) -> None:
+        window = self._sq_window
+        self._ewma_acc = self._ewma_lambda * self._ewma_acc + sq
+        if len(window) == window.maxlen:
+            self._ewma_acc -= self._ewma_evict_weight * window[0]
+        window.append(sq)
+        self._sigma_cache = None
+        self._ewma_updates_since_rebuild += 1
+        # 增减累计存在浮点漂移，每滚动一个完整窗口精确重算一次，摊还仍为 O(1)。
+        if self._ewma_updates_since_rebuild >= window.maxlen:
+            self._rebuild_ewma()
+
+    def _rebuild_ewma(self) -> None:
+        points = self._sigma_window_points
+        self._sq_window = deque((ret * ret for ret in list(self._returns)[-points:]), maxlen=points)
+        acc = 0.0
+        for sq in self._sq_window:
+            acc = self._ewma_lambda * acc + sq
+        self._ewma_acc = acc
+        self._ewma_evict_weight = self._ewma_lambda ** points
+        self._ewma_updates_since_rebuild = 0
+        self._sigma_cache = None
+
     def sigma_zscore(self, sigma_now: float | None = None) -> float:
         if sigma_now is None:
             sigma_now = self.current_sigma()
         if len(self._sigma_history) < 20:
             return 0.0
-        recent = list(self._sigma_history)[-self._sigma_z_window_points :]
-        mu = mean(recent)
-        sd = pstdev(recent)
+        stats = self._sigma_z_stats
+        sd = stats.pstdev()
         if sd < 1e-12:
             return 0.0
-        return (sigma_now - mu) / sd
+        return (sigma_now - stats.mean()) / sd
 
     def depth_factor(self) -> float:
-        if not self._depth_scores:
+        if not len(self._depth_scores):
             return 1.0
-        cur = self._depth_scores[-1]
-        avg = mean(self._depth_scores)
+        cur = self._depth_scores.last()
+        avg = self._depth_scores.mean()
         ratio = cur / max(avg, 1e-9)
         # 深度差时增大点差，深度好时减小点差。
         return max(0.7, min(1.8, 1.2 - 0.35 * (ratio - 1.0)))
 
     def intensity_factor(self) -> float:
-        if not self._trade_intensity:
+        if not len(self._trade_intensity):
             return 1.0
-        cur = self._trade_intensity[-1]
-        avg = mean(self._trade_intensity)
+        cur = self._trade_intensity.last()
+        avg = self._trade_intensity.mean()
         ratio = cur / max(avg, 1e-9)
         # 成交强度高时可以适当缩小价差，低流动性时放宽。
         return max(0.7, min(1.6, 1.15 - 0.25 * (ratio - 1.0)))
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from datetime import datetime
+
+from app.models import OrderSnapshot, TradeSnapshot
+
+
+class OrderTracker:
+    """本方挂单的内存视图，按 order_id / client_order_id 双索引，定期与 REST 对账。"""
+
+    TERMINAL_STATUSES = frozenset({"filled", "cancelled", "canceled", "rejected", "expired", "closed"})
+    # GRVT 下单回执的 order_id 为占位值 0x00，真实 id 需对账时按 client_order_id 补全。
+    UNRESOLVED_ORDER_IDS = frozenset({"", "0", "0x0", "0x00"})
+    _UNRESOLVED_GRACE_SEC = 10.0
+    _SIZE_EPSILON = 1e-12
+
+    def __init__(self, seen_fill_limit: int = 4096) -> None:
+        self._orders: dict[str, OrderSnapshot] = {}
+        self._client_index: dict[str, str] = {}
+        # 未解析挂单：client_order_id -> 开始跟踪的 monotonic 时间。
+        self._unresolved: dict[str, float] = {}
+        self._seen_fill_limit = seen_fill_limit
+        self._seen_fill_ids: set[str] = set()
+        self._seen_fill_queue: deque[str] = deque()
+        self._last_reconciled_at: float | None = None
+        # 最近一次对账快照已反映的成交截止时间，此前的成交不再从剩余量中扣减。
+        self._fills_covered_until: datetime | None = None
+        self._dirty = True
+
+    def needs_reconcile(self, interval_sec: float, now: float | None = None) -> bool:
+        if self._dirty or self._last_reconciled_at is None:
+            return True
+        point = time.monotonic() if now is None else now
+        return point - self._last_reconciled_at >= interval_sec
+
+    @classmethod
+    def is_resolved(cls, order: OrderSnapshot) -> bool:
+        return str(order.order_id).strip().lower() not in cls.UNRESOLVED_ORDER_IDS
+
+    def reconcile(
+        self,
+        orders: list[OrderSnapshot],
+        now: float | None = None,
+        fills_until: datetime | None = None,
+    ) -> None:
+        """以交易所返回的挂单为准整体替换本地视图；REST 尚未返回的未解析挂单在宽限期内保留。
+
+        REST 挂单量已是扣除成交后的剩余量，fills_until 为快照取回时刻，早于它的成交视为已计入。
+        """
+        point = time.monotonic() if now is None else now
+        pending = [
+            self._orders[key]
+            for key, tracked_at in self._unresolved.items()
+            if key in self._orders and point - tracked_at < self._UNRESOLVED_GRACE_SEC
+        ]
+        unresolved = {key: self._unresolved[key] for key in (order.client_order_id for order in pending)}
+        self._orders.clear()
+        self._client_index.clear()
+        self._unresolved.clear()
+        for order in orders:
+            self._track(order)
+        for order in pending:
+            if order.client_order_id not in self._client_index:
+                self._track(order)
+                self._unresolved[order.client_order_id] = unresolved[order.client_order_id]
+        self._last_reconciled_at = point
+        if fills_until is not None:
+            self._fills_covered_until = fills_until
+        # 仍有未解析挂单时保持待对账，直到 REST 返回其真实 order_id。
+        self._dirty = bool(self._unresolved)
+
+    def mark_dirty(self) -> None:
+        """本地状态不再可信（如撤单结果未知），下次读取前强制对账。"""
+        self._dirty = True
+
+    def clear(self) -> None:
+        self._orders.clear()
+        self._client_index.clear()
+        self._unresolved.clear()
+        self._dirty = True
+
+    def on_placed(self, order: OrderSnapshot) -> None:
+        if str(order.status).lower() in self.TERMINAL_STATUSES:
+            return
+        self._track(order)
+
+    def on_canceled(self, order_id: str) -> None:
+        self._remove(self._resolve_id(order_id))
+
+    def apply_order_update(
+        self,
+        *,
+        order_id: str | None = None,
+        client_order_id: str | None = None,
+        status: str | None = None,
+        remaining_size: float | None = None,
+    ) -> None:
+        key = self._resolve_id(order_id) or self._resolve_id(client_order_id)
+        if key is None:
+            return
+        order = self._orders[key]
+        if status is not None:
+            order.status = str(status).lower()
+            if order.status in self.TERMINAL_STATUSES:
+                self._remove(key)
+                return
+        if remaining_size is not None:
+            order.size = max(0.0, float(remaining_size))
+            if order.size <= self._SIZE_EPSILON:
+                self._remove(key)
+
+    def apply_fills(self, trades: list[TradeSnapshot]) -> None:
+        """按成交扣减挂单剩余量，完全成交即移除；成交按 trade_id 去重，已被对账快照覆盖的成交跳过。"""
+        for trade in trades:
+            if not trade.order_id:
+                continue
+            if trade.trade_id:
+                if trade.trade_id in self._seen_fill_ids:
+                    continue
+                self._seen_fill_ids.add(trade.trade_id)
+                self._seen_fill_queue.append(trade.trade_id)
+                if len(self._seen_fill_queue) > self._seen_fill_limit:
+                    self._seen_fill_ids.discard(self._seen_fill_queue.popleft())
+            if self._fills_covered_until is not None and trade.created_at <= self._fills_covered_until:
+                continue
+            key = self._resolve_id(trade.order_id)
+            if key is None:
+                continue
+            order = self._orders[key]
+            self.apply_order_update(order_id=key, remaining_size=order.size - abs(float(trade.size)))
+
+    def get(self, order_id: str) -> OrderSnapshot | None:
+        key = self._resolve_id(order_id)
+        return self._orders.get(key) if key is not None else None
+
+    def open_orders(self) -> list[OrderSnapshot]:
+        return list(self._orders.values())
+
+    def _track(self, order: OrderSnapshot) -> None:
+        key = order.order_id
+        if not self.is_resolved(order):
+            if not order.client_order_id:
+                self._dirty = True
+                return
+            # 占位 id 会让同 tick 的多笔挂单互相覆盖，改用 client_order_id 作键并等待对账补全。
+            key = order.client_order_id
+            self._unresolved.setdefault(key, time.monotonic())
+            self._dirty = True
+        self._orders[key] = order
+        if order.client_order_id:
+            self._client_index[order.client_order_id] = key
+
+    def _remove(self, key: str | None) -> None:
+        if key is None:
+            return
+        order = self._orders.pop(key, None)
+        self._unresolved.pop(key, None)
+        if order is not None and order.client_order_id:
+            self._client_index.pop(order.client_order_id, None)
+
+    def _resolve_id(self, order_id: str | None) -> str | None:
+        if not order_id:
+            return None
+        if order_id in self._orders:
+            return order_id
+        return self._client_index.get(order_id)
@@ -0,0 +1,526 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import itertools
+import logging
+import multiprocessing
+import os
+import signal
+from collections import deque
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+from app.core.container import EngineStack, build_engine_stack
+from app.core.settings import Settings, get_settings
+from app.exchange.factory import build_exchange_adapter
+from app.models import OrderSnapshot, TradeSnapshot
+from app.schemas import HealthStatus, MetricsSummary, TimeSeriesPoint
+from app.services.event_bus import EventBus
+from app.services.exchange_config import ExchangeConfigStore
+from app.services.prometheus import REGISTRY, register_alert_metrics
+from app.services.runtime_config import RuntimeConfigStore
+from app.services.telegram_config import TelegramConfigStore
+
+# 单帧为一行 JSON；状态快照含挂单与成交列表，放宽默认 64KiB 的行长限制。
+STREAM_LIMIT = 16 * 1024 * 1024
+STATE_FRAME = "$state"
+SERIES_FIELDS = (
+    "sigma",
+    "spread_bps",
+    "distance_bid_bps",
+    "distance_ask_bps",
+    "inventory_notional",
+    "mid_price",
+    "quote_size_notional",
+    "pnl_total",
+)
+
+
+class EngineProcessError(RuntimeError):
+    """引擎进程不可达或命令执行失败。"""
+
+
+def _encode(obj: Any) -> bytes:
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS, default=str) + b"\n"
+
+
+class EngineProcessServer:
+    """引擎进程内的 IPC 服务：命令连接逐条应答启停与配置重载，订阅连接持续推送事件与状态快照。"""
+
+    def __init__(
+        self,
+        settings: Settings,
+        stack: EngineStack,
+        config_store: RuntimeConfigStore,
+        exchange_config_store: ExchangeConfigStore,
+        telegram_config_store: TelegramConfigStore,
+    ) -> None:
+        self._settings = settings
+        self._stack = stack
+        self._config_store = config_store
+        self._exchange_config_store = exchange_config_store
+        self._telegram_config_store = telegram_config_store
+        self._path = Path(settings.engine_ipc_socket)
+        self._state_interval = max(0.1, settings.engine_state_interval_sec)
+        self._shutdown = asyncio.Event()
+        self._logger = logging.getLogger("engine_process")
+        self._ops: dict[str, Callable[..., Any]] = {
+            "status": self._op_status,
+            "start": self._op_start,
+            "stop": self._op_stop,
+            "reload_runtime_config": self._op_reload_runtime_config,
+            "reload_exchange_config": self._op_reload_exchange_config,
+            "reload_telegram_config": self._op_reload_telegram_config,
+            "state": self._op_state,
+            "prometheus": self._op_prometheus,
+            "shutdown": self._op_shutdown,
+        }
+
+    def request_shutdown(self) -> None:
+        self._shutdown.set()
+
+    async def serve(self) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._path.unlink(missing_ok=True)
+        server = await asyncio.start_unix_server(self._handle, path=str(self._path), limit=STREAM_LIMIT)
+        os.chmod(self._path, 0o600)
+        if self._stack.loop_monitor is not None:
+            self._stack.loop_monitor.start()
+        self._logger.info("引擎进程已就绪: pid=%s socket=%s", os.getpid(), self._path)
+        try:
+            await self._shutdown.wait()
+        finally:
+            server.close()
+            await self._close_stack()
+            self._path.unlink(missing_ok=True)
+            self._logger.info("引擎进程已退出")
+
+    async def _close_stack(self) -> None:
+        stack = self._stack
+        if stack.engine.mode != "idle":
+            await stack.engine.stop(reason="shutdown")
+        await stack.adapter.close()
+        await stack.alert_service.aclose()
+        if stack.journal is not None:
+            await asyncio.to_thread(stack.journal.close)
+        if stack.loop_monitor is not None:
+            await stack.loop_monitor.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                request = orjson.loads(line)
+                if request.get("op") == "subscribe":
+                    await self._stream(writer)
+                    break
+                writer.write(_encode(await self._respond(request)))
+                await writer.drain()
+        except (ConnectionError, orjson.JSONDecodeError) as exc:
+            self._logger.warning("IPC 连接异常断开: %s", exc)
+        finally:
+            writer.close()
+            with contextlib.suppress(Exception):
+                await writer.wait_closed()
+
+    async def _respond(self, request: dict[str, Any]) -> dict[str, Any]:
+        request_id, op = request.get("id"), request.get("op", "")
+        handler = self._ops.get(op)
+        if handler is None:
+            return {"id": request_id, "ok": False, "error": f"未知命令: {op}"}
+        try:
+            result = await handler(**(request.get("args") or {}))
+        except Exception as exc:
+            self._logger.exception("IPC 命令 %s 执行失败", op)
+            return {"id": request_id, "ok": False, "error": str(exc)}
+        return {"id": request_id, "ok": True, "result": result}
+
+    async def _stream(self, writer: asyncio.StreamWriter) -> None:
+        # tick 按订阅者合并：API 进程消费变慢时只丢中间帧，不会反压引擎循环。
+        subscription = self._stack.event_bus.subscribe(label="engine-ipc")
+        loop = asyncio.get_running_loop()
+        try:
+            writer.write(_encode({"type": STATE_FRAME, "payload": self.state(full=True)}))
+            await writer.drain()
+            next_state_at = loop.time() + self._state_interval
+            while not self._shutdown.is_set():
+                try:
+                    event = await asyncio.wait_for(subscription.get(), max(0.0, next_state_at - loop.time()))
+                    # 事件发布时已序列化，原样转发，不在引擎进程重复编码。
+                    writer.write(event.data + b"\n")
+                except asyncio.TimeoutError:
+                    writer.write(_encode({"type": STATE_FRAME, "payload": self.state()}))
+                    next_state_at = loop.time() + self._state_interval
+                await writer.drain()
+        finally:
+            self._stack.event_bus.unsubscribe(subscription)
+
+    def state(self, full: bool = False) -> dict[str, Any]:
+        """周期推送给 API 进程的状态快照；full 时附带完整时序，供新连接初始化镜像。"""
+        stack = self._stack
+        payload: dict[str, Any] = {
+            "status": stack.engine.status().model_dump(mode="json"),
+            "process": {
+                "pid": os.getpid(),
+                "event_loop": type(asyncio.get_running_loop()).__module__.split(".")[0],
+                "cpu_affinity": sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else [],
+            },
+            "summary": stack.monitor.summary.model_dump(mode="json"),
+            "open_orders": stack.monitor.open_orders,
+            "recent_trades": stack.monitor.recent_trades,
+            "adapter_calls": stack.adapter_telemetry.snapshot(),
+            "executors": stack.adapter.executor_stats(),
+            "alerts": stack.alert_service.stats(),
+            "journal": stack.journal.stats() if stack.journal is not None else None,
+            "loop": stack.loop_monitor.snapshot() if stack.loop_monitor is not None else None,
+            # 分位数不随每个 tick 推送，只随低频状态快照同步给 /api/metrics/quantiles。
+            "quantiles": stack.monitor.quantile_summary(),
+        }
+        if full:
+            payload["series"] = {
+                name: [point.model_dump(mode="json") for point in points]
+                for name, points in stack.monitor.series().items()
+            }
+        return payload
+
+    def _status(self) -> dict[str, Any]:
+        return self._stack.engine.status().model_dump(mode="json")
+
+    async def _op_status(self) -> dict[str, Any]:
+        return self._status()
+
+    async def _op_start(self) -> dict[str, Any]:
+        mode = await self._stack.engine.start()
+        return {"mode": mode, "status": self._status()}
+
+    async def _op_stop(self, reason: str = "manual") -> dict[str, Any]:
+        mode = await self._stack.engine.stop(reason=reason)
+        return {"mode": mode, "status": self._status()}
+
+    async def _op_reload_runtime_config(self) -> dict[str, Any]:
+        self._config_store.reload()
+        await self._stack.engine.refresh_runtime_config()
+        return self._status()
+
+    async def _op_reload_exchange_config(self) -> dict[str, Any]:
+        stack = self._stack
+        if stack.engine.mode not in {"idle", "halted"}:
+            raise EngineProcessError("引擎运行中禁止切换交易所连接")
+        cfg = self._exchange_config_store.reload()
+        adapter = build_exchange_adapter(
+            self._settings,
+            grvt_env=cfg.grvt_env,
+            grvt_api_key=cfg.grvt_api_key,
+            grvt_api_secret=cfg.grvt_api_secret,
+            grvt_trading_account_id=cfg.grvt_trading_account_id,
+            telemetry=stack.adapter_telemetry,
+        )
+        previous_adapter, stack.adapter = stack.adapter, adapter
+        stack.engine.replace_adapter(adapter)
+        await previous_adapter.close()
+        return self._status()
+
+    async def _op_reload_telegram_config(self) -> dict[str, Any]:
+        self._telegram_config_store.reload()
+        return self._status()
+
+    async def _op_state(self) -> dict[str, Any]:
+        return self.state()
+
+    async def _op_prometheus(self) -> str:
+        return REGISTRY.render()
+
+    async def _op_shutdown(self) -> dict[str, Any]:
+        self.request_shutdown()
+        return self._status()
+
+
+class RemoteMonitor:
+    """API 进程内的监控镜像：由引擎进程推送的 tick 与状态快照更新，只读接口与 MonitoringService 一致。"""
+
+    def __init__(self, max_points: int = 1200) -> None:
+        self._max_points = max_points
+        self._summary: MetricsSummary | None = None
+        self._quantiles: dict[str, dict[str, dict]] = {}
+        self._series: dict[str, deque[TimeSeriesPoint]] = {name: deque(maxlen=max_points) for name in SERIES_FIELDS}
+        self._open_orders: list[OrderSnapshot] = []
+        self._recent_trades: list[TradeSnapshot] = []
+
+    def apply_tick(self, payload: dict[str, Any]) -> None:
+        summary = self._apply_summary(payload["summary"])
+        for name in SERIES_FIELDS:
+            self._series[name].append(TimeSeriesPoint(t=summary.timestamp, value=getattr(summary, name)))
+        self._open_orders = [_order_from_json(row) for row in payload.get("open_orders", [])]
+
+    def apply_state(self, payload: dict[str, Any]) -> None:
+        self._apply_summary(payload["summary"])
+        self._open_orders = [_order_from_json(row) for row in payload.get("open_orders", [])]
+        self._recent_trades = [_trade_from_json(row) for row in payload.get("recent_trades", [])]
+        self._quantiles = payload.get("quantiles") or {}
+        series = payload.get("series")
+        if series is not None:
+            for name in SERIES_FIELDS:
+                points = (TimeSeriesPoint.model_validate(point) for point in series.get(name, []))
+                self._series[name] = deque(points, maxlen=self._max_points)
+
+    def _apply_summary(self, raw: dict[str, Any]) -> MetricsSummary:
+        self._summary = MetricsSummary.model_validate(raw)
+        return self._summary
+
+    @property
+    def summary(self) -> MetricsSummary:
+        if self._summary is None:
+            raise EngineProcessError("尚未收到引擎进程的状态快照")
+        return self._summary
+
+    def series(self) -> dict[str, list[TimeSeriesPoint]]:
+        return {k: list(v) for k, v in self._series.items()}
+
+    @property
+    def open_orders(self) -> list[OrderSnapshot]:
+        return list(self._open_orders)
+
+    @property
+    def recent_trades(self) -> list[TradeSnapshot]:
+        return list(self._recent_trades)
+
+    def quantile_summary(self) -> dict[str, dict[str, dict]]:
+        return self._quantiles
+
+
+def _order_from_json(row: dict[str, Any]) -> OrderSnapshot:
+    return OrderSnapshot(
+        order_id=row["order_id"],
+        side=row["side"],
+        price=row["price"],
+        size=row["size"],
+        status=row["status"],
+        created_at=datetime.fromisoformat(row["created_at"]),
+        client_order_id=row.get("client_order_id"),
+    )
+
+
+def _trade_from_json(row: dict[str, Any]) -> TradeSnapshot:
+    return TradeSnapshot(
+        trade_id=row["trade_id"],
+        side=row["side"],
+        price=row["price"],
+        size=row["size"],
+        fee=row["fee"],
+        created_at=datetime.fromisoformat(row["created_at"]),
+        symbol=row.get("symbol"),
+        order_id=row.get("order_id"),
+    )
+
+
+class EngineProcessClient:
+    """API 进程侧的引擎代理：接口与 StrategyEngine 对齐，命令经本地套接字发往引擎进程，状态来自其推送流。"""
+
+    def __init__(self, settings: Settings, event_bus: EventBus, *, start_timeout_sec: float = 30.0) -> None:
+        self._settings = settings
+        self._path = Path(settings.engine_ipc_socket)
+        self._event_bus = event_bus
+        self._start_timeout = start_timeout_sec
+        self._logger = logging.getLogger("engine_process")
+        self.monitor = RemoteMonitor()
+        self.state: dict[str, Any] = {}
+        self._status: HealthStatus | None = None
+        self._process: multiprocessing.process.BaseProcess | None = None
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._stream_task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+        self._ids = itertools.count(1)
+        self._ready = asyncio.Event()
+        self._closing = False
+
+    async def launch(self) -> None:
+        """以 spawn 方式拉起引擎进程（不继承 API 进程的事件循环与线程），并等待首个状态快照。"""
+        self._path.unlink(missing_ok=True)
+        self._process = multiprocessing.get_context("spawn").Process(
+            target=run_engine_process,
+            name="strategy-engine",
+            daemon=True,
+        )
+        self._process.start()
+        await self.connect()
+
+    async def connect(self) -> None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._start_timeout
+        while True:
+            try:
+                self._reader, self._writer = await asyncio.open_unix_connection(str(self._path), limit=STREAM_LIMIT)
+                break
+            except (FileNotFoundError, ConnectionRefusedError):
+                if self._process is not None and not self._process.is_alive():
+                    raise EngineProcessError(f"引擎进程启动失败，退出码 {self._process.exitcode}") from None
+                if loop.time() >= deadline:
+                    raise EngineProcessError("等待引擎进程就绪超时") from None
+                await asyncio.sleep(0.1)
+        stream_reader, stream_writer = await asyncio.open_unix_connection(str(self._path), limit=STREAM_LIMIT)
+        stream_writer.write(_encode({"op": "subscribe"}))
+        await stream_writer.drain()
+        self._stream_task = asyncio.create_task(self._consume(stream_reader, stream_writer), name="engine-ipc-stream")
+        await asyncio.wait_for(self._ready.wait(), max(0.1, deadline - loop.time()))
+
+    async def close(self, timeout_sec: float = 60.0) -> None:
+        """通知引擎进程停止引擎并退出；超时未退出时强制终止。"""
+        self._closing = True
+        with contextlib.suppress(EngineProcessError, ConnectionError, asyncio.TimeoutError):
+            await asyncio.wait_for(self._call("shutdown"), 5.0)
+        if self._process is not None:
+            await asyncio.to_thread(self._process.join, timeout_sec)
+            if self._process.is_alive():
+                self._logger.error("引擎进程 %s 秒内未退出，强制终止", timeout_sec)
+                self._process.terminate()
+                await asyncio.to_thread(self._process.join, 5.0)
+        if self._stream_task is not None:
+            self._stream_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._stream_task
+        if self._writer is not None:
+            self._writer.close()
+
+    async def _consume(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                frame = orjson.loads(line)
+                kind, payload = frame.get("type"), frame.get("payload") or {}
+                if kind == STATE_FRAME:
+                    self._apply_state(payload)
+                    continue
+                if kind == "tick":
+                    self.monitor.apply_tick(payload)
+                elif kind == "engine" and self._status is not None and "mode" in payload:
+                    self._status = self._status.model_copy(
+                        update={"mode": payload["mode"], "engine_running": payload["mode"] == "running"}
+                    )
+                await self._event_bus.publish(kind, payload)
+        except (ConnectionError, orjson.JSONDecodeError) as exc:
+            self._logger.warning("引擎进程推送流异常: %s", exc)
+        finally:
+            writer.close()
+            if not self._closing:
+                await self._mark_disconnected()
+
+    def _apply_state(self, payload: dict[str, Any]) -> None:
+        self.monitor.apply_state(payload)
+        payload.pop("series", None)
+        self.state = payload
+        self._status = HealthStatus.model_validate(payload["status"])
+        self._ready.set()
+
+    async def _mark_disconnected(self) -> None:
+        message = "引擎进程连接已断开"
+        self._logger.error(message)
+        if self._status is not None:
+            self._status = self._status.model_copy(
+                update={"engine_running": False, "mode": "halted", "exchange_connected": False, "last_error": message}
+            )
+        await self._event_bus.publish("error", {"message": message, "category": "engine_process"})
+
+    async def _call(self, op: str, **args: Any) -> Any:
+        if self._writer is None or self._reader is None or self._writer.is_closing():
+            raise EngineProcessError("引擎进程未连接")
+        async with self._lock:
+            request_id = next(self._ids)
+            self._writer.write(_encode({"id": request_id, "op": op, "args": args}))
+            await self._writer.drain()
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    raise EngineProcessError("引擎进程连接已断开")
+                response = orjson.loads(line)
+                # 先前调用在发出请求后被取消时，其应答仍留在流中，按序号丢弃。
+                if int(response.get("id") or 0) >= request_id:
+                    break
+        if response.get("id") != request_id:
+            raise EngineProcessError(f"IPC 应答序号不匹配: {response.get('id')} != {request_id}")
+        if not response.get("ok"):
+            raise EngineProcessError(response.get("error") or f"{op} 执行失败")
+        return response.get("result")
+
+    def _apply_command_status(self, result: dict[str, Any]) -> str:
+        self._status = HealthStatus.model_validate(result["status"])
+        return result["mode"]
+
+    @property
+    def mode(self) -> str:
+        return self.status().mode
+
+    def status(self) -> HealthStatus:
+        if self._status is None:
+            raise EngineProcessError("尚未收到引擎进程的状态快照")
+        return self._status
+
+    async def start(self) -> str:
+        return self._apply_command_status(await self._call("start"))
+
+    async def stop(self, reason: str = "manual") -> str:
+        return self._apply_command_status(await self._call("stop", reason=reason))
+
+    async def refresh_runtime_config(self) -> None:
+        self._status = HealthStatus.model_validate(await self._call("reload_runtime_config"))
+
+    async def reload_exchange_config(self) -> None:
+        self._status = HealthStatus.model_validate(await self._call("reload_exchange_config"))
+
+    async def reload_telegram_config(self) -> None:
+        await self._call("reload_telegram_config")
+
+    async def prometheus_text(self) -> str:
+        return await self._call("prometheus")
+
+
+def run_engine_process() -> None:
+    """独立引擎进程入口：按配置绑核、选用 uvloop，运行 IPC 服务直至收到 shutdown 命令或 SIGTERM。"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+    )
+    settings = get_settings()
+    logger = logging.getLogger("engine_process")
+    _pin_cpus(settings.engine_cpu_affinity, logger)
+    with asyncio.Runner(loop_factory=_loop_factory(settings.engine_uvloop, logger)) as runner:
+        runner.run(_serve(settings))
+
+
+async def _serve(settings: Settings) -> None:
+    config_store = RuntimeConfigStore(settings.runtime_config_file)
+    exchange_config_store = ExchangeConfigStore(settings.exchange_config_file, settings)
+    telegram_config_store = TelegramConfigStore(settings.telegram_config_file, settings)
+    stack = build_engine_stack(settings, config_store, exchange_config_store, telegram_config_store)
+    register_alert_metrics(stack.alert_service)
+    server = EngineProcessServer(settings, stack, config_store, exchange_config_store, telegram_config_store)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        with contextlib.suppress(NotImplementedError):
+            loop.add_signal_handler(sig, server.request_shutdown)
+    await server.serve()
+
+
+def _pin_cpus(spec: str, logger: logging.Logger) -> None:
+    cpus = {int(item) for item in spec.split(",") if item.strip()}
+    if not cpus:
+        return
+    if not hasattr(os, "sched_setaffinity"):
+        logger.warning("当前平台不支持绑核，已忽略 ENGINE_CPU_AFFINITY=%s", spec)
+        return
+    os.sched_setaffinity(0, cpus)
+    logger.info("引擎进程已绑定 CPU: %s", sorted(cpus))
+
+
+def _loop_factory(use_uvloop: bool, logger: logging.Logger) -> Callable[[], asyncio.AbstractEventLoop] | None:
+    if not use_uvloop:
+        return None
+    try:
+        import uvloop
+    except ImportError:
+        logger.warning("未安装 uvloop，引擎进程使用默认事件循环")
+        return None
+    return uvloop.new_event_loop
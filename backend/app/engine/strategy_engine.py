@@ -11,14 +11,19 @@ from datetime import date, datetime
 
 from app.engine.adaptive import AdaptiveController
 from app.engine.as_model import AsMarketMakerModel
+from app.engine.order_tracker import OrderTracker
 from app.engine.risk_guard import RiskGuard, RiskInput
 from app.exchange.base import ExchangeAdapter, PositionDustError
-from app.models import EngineTick, OrderSnapshot, PositionSnapshot, QuoteDecision, utcnow
+from app.exchange.errors import classify_error
+from app.models import EngineTick, MarketSnapshot, OrderRequest, OrderSnapshot, PositionSnapshot, QuoteDecision, utcnow
 from app.schemas import HealthStatus, RuntimeConfig
 from app.services.alerting import AlertService
 from app.services.event_bus import EventBus
+from app.services.loop_monitor import LoopMonitor
 from app.services.monitoring import MonitoringService
+from app.services.prometheus import ORDER_ACTIONS_TOTAL, TICK_ERRORS_TOTAL, TICK_STAGE_SECONDS, TICKS_TOTAL
 from app.services.runtime_config import RuntimeConfigStore
+from app.services.tick_journal import TickJournal
 
 
 @dataclass(slots=True)
@@ -40,18 +45,26 @@ class StrategyEngine:
         monitor: MonitoringService,
         event_bus: EventBus,
         alert_service: AlertService,
+        journal: TickJournal | None = None,
+        interval_scale: float = 1.0,
+        loop_monitor: LoopMonitor | None = None,
     ) -> None:
         self._adapter = adapter
         self._config_store = config_store
         self._monitor = monitor
         self._event_bus = event_bus
         self._alert = alert_service
+        self._journal = journal
+        # tick 间等待的缩放系数：回放/压测时按倍速缩短，0 表示不等待。
+        self._interval_scale = max(0.0, float(interval_scale))
+        self._loop_monitor = loop_monitor
 
         self._logger = logging.getLogger("engine")
 
         self._as_model = AsMarketMakerModel()
         self._adaptive = AdaptiveController(maxlen=2000)
         self._risk = RiskGuard()
+        self._orders = OrderTracker()
 
         self._task: asyncio.Task | None = None
         self._stop_event = asyncio.Event()
@@ -70,6 +83,8 @@ class StrategyEngine:
         self._inventory_side_mode: str | None = None
         self._consecutive_failures: int = 0
         self._last_status_at: datetime = utcnow()
+        self._last_market: MarketSnapshot | None = None
+        self._wake_reason: str = "interval"
 
         self._exchange_connected = False
 
@@ -87,6 +102,9 @@ class StrategyEngine:
         self._engine_started_at = utcnow()
         self._last_heartbeat_at = None
         self._inventory_side_mode = None
+        self._last_market = None
+        self._wake_reason = "interval"
+        self._orders.clear()
         self._risk.reset_peak(0.0)
         self._monitor.reset_session(started_at=self._engine_started_at)
 
@@ -203,19 +221,19 @@ class StrategyEngine:
             self._adaptive.set_windows(cfg.sigma_window_sec, effective_quote_interval)
             self._adaptive.set_sigma_baseline(cfg.as_sigma)
 
+            tick_reads: dict[str, asyncio.Task] = {}
             try:
                 loop_started_monotonic = time.perf_counter()
-
-                fetch_market_started = time.perf_counter()
-                market = await self._adapter.fetch_market_snapshot(cfg.symbol)
-                fetch_market_ms = (time.perf_counter() - fetch_market_started) * 1000.0
-
-                fetch_account_started = time.perf_counter()
-                funds, position = await asyncio.gather(
-                    self._adapter.fetch_account_funds(),
-                    self._adapter.fetch_position(cfg.symbol),
-                )
-                fetch_account_ms = (time.perf_counter() - fetch_account_started) * 1000.0
+                read_ms: dict[str, float] = {}
+                tick_reads = self._start_tick_reads(cfg, loop_started_monotonic, read_ms)
+
+                market = await tick_reads["market"]
+                self._last_market = market
+                funds, position = await asyncio.gather(tick_reads["funds"], tick_reads["position"])
+                # 报价输入就绪时刻即关键路径，各读请求耗时均自 tick 起点计。
+                quote_ready_ms = (time.perf_counter() - loop_started_monotonic) * 1000.0
+                fetch_market_ms = read_ms["market"]
+                fetch_account_ms = max(read_ms["funds"], read_ms["position"])
                 equity = float(funds.equity_usdt)
                 free_usdt = float(funds.free_usdt)
 
@@ -270,8 +288,9 @@ class StrategyEngine:
 
                 sync_result = SyncResult(requoted=False, reason="none")
                 sync_orders_ms = 0.0
+                sync_started = time.perf_counter()
+                await tick_reads["orders"]
                 if self._mode == "running":
-                    sync_started = time.perf_counter()
                     sync_result = await self._sync_orders(
                         cfg=cfg,
                         effective_capacity_notional=effective_capacity_notional,
@@ -282,14 +301,9 @@ class StrategyEngine:
                     if sync_result.requoted:
                         self._monitor.record_cancel(utcnow())
 
-                if sync_result.open_orders is None:
-                    open_orders, recent_trades = await asyncio.gather(
-                        self._adapter.fetch_open_orders(cfg.symbol),
-                        self._adapter.fetch_recent_trades(cfg.symbol, 100),
-                    )
-                else:
-                    open_orders = sync_result.open_orders
-                    recent_trades = await self._adapter.fetch_recent_trades(cfg.symbol, 100)
+                recent_trades = await tick_reads["trades"]
+                self._orders.apply_fills(recent_trades)
+                open_orders = self._orders.open_orders()
                 self._monitor.update_orders(open_orders)
                 self._monitor.update_trades(recent_trades)
 
@@ -315,6 +329,20 @@ class StrategyEngine:
                     distance_bid_bps=distance_bid_bps,
                     distance_ask_bps=distance_ask_bps,
                 )
+                loop_elapsed_ms = (time.perf_counter() - loop_started_monotonic) * 1000.0
+                stage_timings = {
+                    "loop_elapsed_ms": loop_elapsed_ms,
+                    "fetch_market_ms": fetch_market_ms,
+                    "fetch_account_ms": fetch_account_ms,
+                    "sync_orders_ms": sync_orders_ms,
+                    "fetch_orders_ms": read_ms["orders"],
+                    "fetch_trades_ms": read_ms["trades"],
+                    "quote_ready_ms": quote_ready_ms,
+                }
+                self._monitor.record_stage_timings(stage_timings, now)
+                for stage, stage_ms in stage_timings.items():
+                    TICK_STAGE_SECONDS.labels(stage).observe(stage_ms / 1000.0)
+                TICKS_TOTAL.inc()
                 self._monitor.update_tick(
                     engine_tick,
                     drawdown,
@@ -324,7 +352,9 @@ class StrategyEngine:
                 )
 
                 summary = self._monitor.summary
-                loop_elapsed_ms = (time.perf_counter() - loop_started_monotonic) * 1000.0
+                loop_health = self._loop_monitor.drain() if self._loop_monitor is not None else {}
+                if self._journal is not None:
+                    self._journal.append(engine_tick, stage_timings)
                 await self._event_bus.publish(
                     "tick",
                     {
@@ -357,10 +387,16 @@ class StrategyEngine:
                             "fetch_market_ms": round(fetch_market_ms, 3),
                             "fetch_account_ms": round(fetch_account_ms, 3),
                             "sync_orders_ms": round(sync_orders_ms, 3),
+                            "fetch_orders_ms": round(read_ms["orders"], 3),
+                            "fetch_trades_ms": round(read_ms["trades"], 3),
+                            "quote_ready_ms": round(quote_ready_ms, 3),
+                            "wake_reason": self._wake_reason,
+                            **loop_health,
                         },
                     },
                 )
 
+                await self._maybe_alert_loop_lag(cfg, loop_health)
                 await self._maybe_send_heartbeat(cfg, summary)
 
                 risk_result = self._risk.evaluate(
@@ -385,7 +421,8 @@ class StrategyEngine:
                 raise
             except Exception as exc:
                 self._consecutive_failures += 1
-                category = self._classify_error(exc)
+                category = classify_error(exc)
+                TICK_ERRORS_TOTAL.labels(category).inc()
                 self._last_error = f"[{category}] {exc}"
                 self._last_status_at = utcnow()
                 self._exchange_connected = False
@@ -405,13 +442,96 @@ class StrategyEngine:
                     dedupe_key=f"engine-error-{category}",
                     min_interval_sec=60,
                 )
+            finally:
+                await self._drain_tick_reads(tick_reads)
 
             elapsed = (utcnow() - tick_started).total_seconds()
-            sleep_for = max(0.01, effective_quote_interval - elapsed)
-            try:
-                await asyncio.wait_for(self._stop_event.wait(), timeout=sleep_for)
-            except asyncio.TimeoutError:
-                pass
+            await self._wait_next_tick(cfg, effective_quote_interval, elapsed)
+
+    def _start_tick_reads(self, cfg: RuntimeConfig, started: float, read_ms: dict[str, float]) -> dict[str, asyncio.Task]:
+        """tick 起点并发发出全部互不依赖的读请求，下游按需等待各自结果。"""
+        reads = {
+            "market": self._adapter.fetch_market_snapshot(cfg.symbol),
+            "funds": self._adapter.fetch_account_funds(),
+            "position": self._adapter.fetch_position(cfg.symbol),
+            "orders": self._tracked_open_orders(cfg),
+            "trades": self._adapter.fetch_recent_trades(cfg.symbol, 100),
+        }
+        return {
+            name: asyncio.create_task(self._timed_read(name, aw, started, read_ms), name=f"tick-read-{name}")
+            for name, aw in reads.items()
+        }
+
+    @staticmethod
+    async def _timed_read(name: str, aw, started: float, read_ms: dict[str, float]):
+        try:
+            return await aw
+        finally:
+            read_ms[name] = (time.perf_counter() - started) * 1000.0
+
+    @staticmethod
+    async def _drain_tick_reads(tasks: dict[str, asyncio.Task]) -> None:
+        """异常提前退出时回收未完成的读请求，避免遗留任务与未取回的异常。"""
+        pending = [task for task in tasks.values() if not task.done()]
+        for task in pending:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+    async def _wait_next_tick(self, cfg: RuntimeConfig, effective_quote_interval: float, elapsed: float) -> None:
+        if (
+            cfg.quote_schedule_mode == "event"
+            and self._last_market is not None
+            and self._adapter.market_stream_active(cfg.symbol)
+        ):
+            await self._wait_market_event(cfg, elapsed)
+            return
+        self._wake_reason = "interval"
+        await self._sleep_unless_stopped(max(0.01, effective_quote_interval - elapsed))
+
+    async def _wait_market_event(self, cfg: RuntimeConfig, elapsed: float) -> None:
+        """事件驱动调度：盘口偏移超过阈值即唤醒，受最小间隔与最长空闲约束。"""
+        min_wait = cfg.event_min_interval_sec - elapsed
+        if min_wait > 0:
+            await self._sleep_unless_stopped(min_wait)
+        deadline = time.perf_counter() + max(0.0, cfg.event_max_idle_sec - max(elapsed, cfg.event_min_interval_sec))
+        reference = self._last_market
+
+        # 报价计算期间到达的推送不会再触发等待，先比对一次当前盘口。
+        market: MarketSnapshot | None
+        try:
+            market = await self._adapter.fetch_market_snapshot(cfg.symbol)
+        except Exception:
+            market = None
+        while not self._stop_event.is_set():
+            if market is not None and self._market_move_bps(reference, market) >= cfg.event_requote_threshold_bps:
+                self._wake_reason = "market-move"
+                return
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                self._wake_reason = "max-idle"
+                return
+            market = await self._adapter.wait_market_update(cfg.symbol, remaining)
+
+    async def _sleep_unless_stopped(self, timeout: float) -> None:
+        timeout *= self._interval_scale
+        if timeout <= 0:
+            await asyncio.sleep(0)
+            return
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    @classmethod
+    def _market_move_bps(cls, reference: MarketSnapshot | None, current: MarketSnapshot) -> float:
+        if reference is None:
+            return math.inf
+        return max(
+            cls._price_deviation_bps(reference.mid, current.mid),
+            cls._price_deviation_bps(reference.bid, current.bid),
+            cls._price_deviation_bps(reference.ask, current.ask),
+        )
 
     @staticmethod
     def _effective_min_spread_bps(
@@ -431,7 +551,9 @@ class StrategyEngine:
     async def _cancel_all_orders_safe(self, symbol: str, stage: str) -> None:
         try:
             await self._adapter.cancel_all_orders(symbol)
+            self._orders.clear()
         except Exception as exc:
+            self._orders.mark_dirty()
             self._logger.warning("%s 鏃舵挙鍗曞け璐? %s", stage, exc)
 
     async def _flatten_position_until_done(self, cfg: RuntimeConfig, trigger: str) -> None:
@@ -526,6 +648,26 @@ class StrategyEngine:
             await asyncio.sleep(min(delay, cfg.close_retry_max_delay_sec))
             delay = min(cfg.close_retry_max_delay_sec, max(cfg.close_retry_base_delay_sec, delay * 2))
 
+    async def _maybe_alert_loop_lag(self, cfg: RuntimeConfig, loop_health: dict[str, float]) -> None:
+        if self._loop_monitor is None or not loop_health:
+            return
+        threshold_ms = self._loop_monitor.lag_threshold_ms(cfg.quote_interval_sec)
+        if threshold_ms is None or loop_health["loop_lag_max_ms"] <= threshold_ms:
+            return
+        await self._alert.send_event(
+            level="WARN",
+            event="LOOP_LAG",
+            message=f"事件循环调度延迟 {loop_health['loop_lag_max_ms']:.1f}ms 超过阈值 {threshold_ms:.1f}ms",
+            details={
+                "loop_lag_max_ms": loop_health["loop_lag_max_ms"],
+                "threshold_ms": round(threshold_ms, 3),
+                "gc_pause_ms": loop_health["gc_pause_ms"],
+                "gc_collections": loop_health["gc_collections"],
+            },
+            dedupe_key="loop-lag",
+            min_interval_sec=300,
+        )
+
     async def _maybe_send_heartbeat(self, cfg: RuntimeConfig, summary) -> None:
         if not cfg.tg_heartbeat_enabled:
             return
@@ -595,7 +737,7 @@ class StrategyEngine:
         position: PositionSnapshot,
         decision: QuoteDecision,
     ) -> SyncResult:
-        orders = await self._adapter.fetch_open_orders(cfg.symbol)
+        orders = await self._tracked_open_orders(cfg)
         now = utcnow()
         buy_order = self._latest_order_by_side(orders, "buy")
         sell_order = self._latest_order_by_side(orders, "sell")
@@ -617,51 +759,55 @@ class StrategyEngine:
         if only_buy or only_sell:
             reasons.append("inventory-limit")
 
-        if buy_order and "buy" not in desired_sides:
-            await self._cancel_order_silent(cfg.symbol, buy_order.order_id)
-            buy_order = None
-            reasons.append("inventory-exit-buy")
-            requoted = True
-        if sell_order and "sell" not in desired_sides:
-            await self._cancel_order_silent(cfg.symbol, sell_order.order_id)
-            sell_order = None
-            reasons.append("inventory-exit-sell")
-            requoted = True
-
-        if "buy" in desired_sides:
-            side_reasons, side_changed = await self._ensure_side_order(
-                cfg=cfg,
-                side="buy",
-                now=now,
-                existing=buy_order,
-                target_price=decision.bid_price,
-                target_size=decision.quote_size_base,
-            )
-            reasons.extend(side_reasons)
-            requoted = requoted or side_changed
-        if "sell" in desired_sides:
-            side_reasons, side_changed = await self._ensure_side_order(
-                cfg=cfg,
-                side="sell",
-                now=now,
-                existing=sell_order,
-                target_price=decision.ask_price,
-                target_size=decision.quote_size_base,
-            )
+        # 两侧互不依赖，下单/撤单并发发出；全部落定后再汇总错误，避免半途退出遗漏本地状态更新。
+        side_jobs = []
+        for side, existing, target_price in (
+            ("buy", buy_order, decision.bid_price),
+            ("sell", sell_order, decision.ask_price),
+        ):
+            if side in desired_sides:
+                side_jobs.append(
+                    self._ensure_side_order(
+                        cfg=cfg,
+                        side=side,
+                        now=now,
+                        existing=existing,
+                        target_price=target_price,
+                        target_size=decision.quote_size_base,
+                    )
+                )
+            elif existing is not None:
+                side_jobs.append(self._exit_side_order(cfg.symbol, side, existing))
+
+        results = await asyncio.gather(*side_jobs, return_exceptions=True)
+        errors: list[BaseException] = []
+        for result in results:
+            if isinstance(result, BaseException):
+                errors.append(result)
+                continue
+            side_reasons, side_changed = result
             reasons.extend(side_reasons)
             requoted = requoted or side_changed
+        if errors:
+            for extra in errors[1:]:
+                self._logger.warning("同 tick 另一侧挂单同步失败: %s", extra)
+            # 任一侧失败即整体计一次失败，由主循环累加 _consecutive_failures。
+            raise errors[0]
 
         if not requoted:
             return SyncResult(requoted=False, reason="none", open_orders=orders)
 
-        try:
-            self._consecutive_failures = 0
-            refreshed_orders = await self._adapter.fetch_open_orders(cfg.symbol)
-            reason_text = ",".join(dict.fromkeys(reasons)) if reasons else "none"
-            return SyncResult(requoted=True, reason=reason_text, open_orders=refreshed_orders)
-        except Exception:
-            self._consecutive_failures += 1
-            raise
+        # 下单/撤单结果已写入本地挂单视图，无需再次拉取 REST。
+        self._consecutive_failures = 0
+        reason_text = ",".join(dict.fromkeys(reasons)) if reasons else "none"
+        return SyncResult(requoted=True, reason=reason_text, open_orders=self._orders.open_orders())
+
+    async def _tracked_open_orders(self, cfg: RuntimeConfig) -> list[OrderSnapshot]:
+        if self._orders.needs_reconcile(cfg.order_reconcile_interval_sec):
+            orders = await self._adapter.fetch_open_orders(cfg.symbol)
+            # 与本 tick 并发取回的成交可能已反映在快照的剩余量里，以取回时刻为界避免重复扣减。
+            self._orders.reconcile(orders, fills_until=utcnow())
+        return self._orders.open_orders()
 
     def _resolve_inventory_side_mode(
         self,
@@ -703,15 +849,12 @@ class StrategyEngine:
         reasons: list[str] = []
         if existing is None:
             reasons.append(f"missing-side-{side}")
-            await self._adapter.place_limit_order(
-                symbol=cfg.symbol,
-                side=side,
-                price=target_price,
-                size=target_size,
-                post_only=True,
-                client_order_id=self._new_client_order_id(side),
-            )
+            await self._place_tracked_order(cfg, side, target_price, target_size)
+            ORDER_ACTIONS_TOTAL.labels("place", reasons[0]).inc()
             return reasons, True
+        if not OrderTracker.is_resolved(existing):
+            # 真实 order_id 尚未经对账补全，无法撤改，本轮维持现有挂单。
+            return [], False
 
         order_age = max(0.0, (now - existing.created_at).total_seconds())
         ttl_expired = order_age > cfg.order_ttl_sec
@@ -729,23 +872,79 @@ class StrategyEngine:
         if not should_replace:
             return [], False
 
-        # 先挂新单再撤旧单，尽量避免该侧出现“真空窗口”。
-        await self._adapter.place_limit_order(
-            symbol=cfg.symbol,
-            side=side,
-            price=target_price,
-            size=target_size,
-            post_only=True,
-            client_order_id=self._new_client_order_id(side),
+        # 撤旧挂新的时序由适配器决定：
+        # - 基类默认先挂新单再撤旧单：新单失败时旧单保留、不出现报价空窗，但两步之间同侧新旧两单
+        #   同时在簿，该侧敞口短暂翻倍（约一个撤单往返）；
+        # - GRVT 等并发实现：撤单与下单同时在途、无双倍敞口，新单失败时旧单已撤，下方立即补挂。
+        started = time.perf_counter()
+        result = await self._adapter.cancel_replace_order(
+            cfg.symbol,
+            existing.order_id,
+            self._order_request(side, target_price, target_size),
         )
-        await self._cancel_order_silent(cfg.symbol, existing.order_id)
+        if result.cancel_error is not None:
+            self._orders.mark_dirty()
+            self._logger.warning("撤单失败(order_id=%s): %s", existing.order_id, result.cancel_error)
+        elif not result.cancel_skipped:
+            self._orders.on_canceled(existing.order_id)
+            ORDER_ACTIONS_TOTAL.labels("cancel", reasons[0]).inc()
+        if result.place_error is not None:
+            # 下单请求可能已到达交易所，本地视图需与 REST 重新对账。
+            self._orders.mark_dirty()
+            if result.cancel_error is not None or result.cancel_skipped:
+                raise result.place_error
+            # 适配器并发撤旧挂新时可能旧单已撤而新单失败，该侧处于无报价状态，立即补挂一次而不是等下一个 tick。
+            self._logger.warning("撤旧挂新下单失败，立即补挂(side=%s): %s", side, result.place_error)
+            await self._place_tracked_order(cfg, side, target_price, target_size)
+            ORDER_ACTIONS_TOTAL.labels("place", "replace-retry").inc()
+            return reasons, True
+        self._monitor.record_latency("order_rtt_ms", (time.perf_counter() - started) * 1000.0)
+        self._orders.on_placed(result.order)
+        ORDER_ACTIONS_TOTAL.labels("place", reasons[0]).inc()
         return reasons, True
 
-    async def _cancel_order_silent(self, symbol: str, order_id: str) -> None:
+    async def _exit_side_order(self, symbol: str, side: str, existing: OrderSnapshot) -> tuple[list[str], bool]:
+        reason = f"inventory-exit-{side}"
+        if not OrderTracker.is_resolved(existing):
+            self._orders.mark_dirty()
+            return [reason], False
+        if await self._cancel_order_silent(symbol, existing.order_id):
+            ORDER_ACTIONS_TOTAL.labels("cancel", reason).inc()
+        return [reason], True
+
+    async def _place_tracked_order(self, cfg: RuntimeConfig, side: str, price: float, size: float) -> OrderSnapshot:
+        started = time.perf_counter()
+        try:
+            request = self._order_request(side, price, size)
+            order = await self._adapter.place_limit_order(
+                symbol=cfg.symbol,
+                side=request.side,
+                price=request.price,
+                size=request.size,
+                post_only=request.post_only,
+                client_order_id=request.client_order_id,
+            )
+        except Exception:
+            # 下单请求可能已到达交易所，本地视图需与 REST 重新对账。
+            self._orders.mark_dirty()
+            raise
+        self._monitor.record_latency("order_rtt_ms", (time.perf_counter() - started) * 1000.0)
+        self._orders.on_placed(order)
+        return order
+
+    @classmethod
+    def _order_request(cls, side: str, price: float, size: float) -> OrderRequest:
+        return OrderRequest(side=side, price=price, size=size, client_order_id=cls._new_client_order_id(side))
+
+    async def _cancel_order_silent(self, symbol: str, order_id: str) -> bool:
         try:
             await self._adapter.cancel_order(symbol, order_id)
+            self._orders.on_canceled(order_id)
+            return True
         except Exception as exc:
+            self._orders.mark_dirty()
             self._logger.warning("撤单失败(order_id=%s): %s", order_id, exc)
+            return False
 
     @staticmethod
     def _latest_order_by_side(orders: list[OrderSnapshot], side: str) -> OrderSnapshot | None:
@@ -794,17 +993,6 @@ class StrategyEngine:
         suffix = uuid.uuid4().int % 10_000
         return f"{side_flag}{nonce_ms}{suffix:04d}"
 
-    @staticmethod
-    def _classify_error(exc: Exception) -> str:
-        text = str(exc).lower()
-        if "event_time" in text or "malformed syntax" in text or "order_book" in text or "ticker" in text:
-            return "market_data"
-        if "invalid literal for int" in text or "order_id" in text:
-            return "order_id"
-        if "trading_account_id" in text or "api_key" in text or "unauthorized" in text or "forbidden" in text:
-            return "auth"
-        return "unknown"
-
     @staticmethod
     def _price_deviation_bps(old: float, new: float) -> float:
         if old <= 0:
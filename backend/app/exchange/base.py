@@ -1,13 +1,24 @@
 ﻿from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
 
-from app.models import AccountFundsSnapshot, MarketSnapshot, OrderSnapshot, PositionSnapshot, TradeSnapshot
+from app.models import (
+    AccountFundsSnapshot,
+    CancelReplaceResult,
+    MarketSnapshot,
+    OrderRequest,
+    OrderSnapshot,
+    PositionSnapshot,
+    TradeSnapshot,
+)
 
 
 class PositionDustError(RuntimeError):
     """仓位小于交易所可成交最小量，无法继续 taker 平仓。"""
 
+    error_class = "position_dust"
+
     def __init__(self, symbol: str, remaining_size: float, min_close_size: float) -> None:
         self.symbol = symbol
         self.remaining_size = float(remaining_size)
@@ -17,6 +28,13 @@ class PositionDustError(RuntimeError):
         )
 
 
+def _reraise_cancelled(result):
+    """gather(return_exceptions=True) 会吞掉取消信号，这里重新抛出非 Exception 的中断。"""
+    if isinstance(result, BaseException) and not isinstance(result, Exception):
+        raise result
+    return result
+
+
 class ExchangeAdapter(ABC):
     """交易所抽象层。"""
 
@@ -68,6 +86,78 @@ class ExchangeAdapter(ABC):
     async def cancel_all_orders(self, symbol: str) -> None:
         """全撤。"""
 
+    async def place_limit_orders(self, symbol: str, requests: list[OrderRequest]) -> list[OrderSnapshot | Exception]:
+        """批量下限价单，结果与请求一一对应、单笔失败以异常返回；默认并发逐笔提交。"""
+        results = await asyncio.gather(
+            *(
+                self.place_limit_order(
+                    symbol=symbol,
+                    side=request.side,
+                    price=request.price,
+                    size=request.size,
+                    post_only=request.post_only,
+                    client_order_id=request.client_order_id,
+                )
+                for request in requests
+            ),
+            return_exceptions=True,
+        )
+        return [_reraise_cancelled(result) for result in results]
+
+    async def cancel_orders(self, symbol: str, order_ids: list[str]) -> list[Exception | None]:
+        """批量撤单，返回与 order_ids 对应的异常（成功为 None）；默认并发逐笔提交。"""
+        results = await asyncio.gather(
+            *(self.cancel_order(symbol, order_id) for order_id in order_ids),
+            return_exceptions=True,
+        )
+        return [_reraise_cancelled(result) if isinstance(result, BaseException) else None for result in results]
+
+    async def cancel_replace_order(self, symbol: str, cancel_order_id: str, request: OrderRequest) -> CancelReplaceResult:
+        """撤旧挂新（非原子）：先下新单，成功后再撤旧单；下单失败则不撤旧单，以免该侧无报价。
+
+        两步之间同侧会短暂并存新旧两笔挂单；交易所提供原子改单接口时应覆盖本方法。
+        """
+        try:
+            placed = await self.place_limit_order(
+                symbol=symbol,
+                side=request.side,
+                price=request.price,
+                size=request.size,
+                post_only=request.post_only,
+                client_order_id=request.client_order_id,
+            )
+        except Exception as exc:
+            return CancelReplaceResult(order=None, place_error=exc, cancel_skipped=True)
+        try:
+            await self.cancel_order(symbol, cancel_order_id)
+        except Exception as exc:
+            return CancelReplaceResult(order=placed, cancel_error=exc)
+        return CancelReplaceResult(order=placed)
+
+    async def _cancel_replace_concurrently(
+        self, symbol: str, cancel_order_id: str, request: OrderRequest
+    ) -> CancelReplaceResult:
+        """撤单与下单并发提交，耗时为一个往返且不会并存同侧新旧两单；新单失败时该侧暂无报价，由调用方补挂。"""
+        placed, canceled = await asyncio.gather(
+            self.place_limit_order(
+                symbol=symbol,
+                side=request.side,
+                price=request.price,
+                size=request.size,
+                post_only=request.post_only,
+                client_order_id=request.client_order_id,
+            ),
+            self.cancel_order(symbol, cancel_order_id),
+            return_exceptions=True,
+        )
+        placed = _reraise_cancelled(placed)
+        canceled = _reraise_cancelled(canceled)
+        return CancelReplaceResult(
+            order=None if isinstance(placed, Exception) else placed,
+            place_error=placed if isinstance(placed, Exception) else None,
+            cancel_error=canceled if isinstance(canceled, Exception) else None,
+        )
+
     @abstractmethod
     async def close_position_taker(
         self,
@@ -81,3 +171,19 @@ class ExchangeAdapter(ABC):
     @abstractmethod
     async def flatten_position_taker(self, symbol: str) -> None:
         """读取净仓并执行 taker 全平。"""
+
+    def market_stream_active(self, symbol: str) -> bool:
+        """行情是否由推送流实时维护（此时读取盘口无网络开销）。"""
+        return False
+
+    async def wait_market_update(self, symbol: str, timeout: float) -> MarketSnapshot | None:
+        """等待下一次推送行情，超时返回 None；不支持推送时仅等待超时。"""
+        await asyncio.sleep(max(0.0, timeout))
+        return None
+
+    def executor_stats(self) -> dict[str, dict]:
+        """各阻塞调用通道的排队深度与等待耗时，无独立线程池时为空。"""
+        return {}
+
+    async def close(self) -> None:
+        """释放后台连接与任务，默认无操作。"""
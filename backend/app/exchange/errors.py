@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+
+# 结构化错误分类：引擎告警、适配器调用看板与 Prometheus 标签共用同一套取值。
+ERROR_CLASSES: tuple[str, ...] = (
+    "timeout",
+    "network",
+    "rate_limit",
+    "auth",
+    "exchange",
+    "rejected",
+    "market_data",
+    "order_id",
+    "position_dust",
+    "instrument",
+    "validation",
+    "unknown",
+)
+
+# SDK 抛出的通用异常没有类型信息，只能退回按报文关键字归类。
+_TEXT_MARKERS: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("market_data", ("event_time", "malformed syntax", "order_book", "ticker")),
+    ("order_id", ("invalid literal for int", "order_id")),
+    ("auth", ("trading_account_id", "api_key", "unauthorized", "forbidden")),
+    ("rate_limit", ("rate limit", "too many requests")),
+    ("timeout", ("timed out", "timeout")),
+)
+
+
+def classify_error(exc: BaseException) -> str:
+    """异常 -> 错误分类：优先用异常自带的 error_class 与类型，最后才匹配报文。"""
+    declared = getattr(exc, "error_class", None)
+    if isinstance(declared, str) and declared in ERROR_CLASSES:
+        return declared
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError, httpx.TimeoutException)):
+        return "timeout"
+    if isinstance(exc, httpx.HTTPStatusError):
+        code = exc.response.status_code
+        if code == 429:
+            return "rate_limit"
+        if code in {401, 403}:
+            return "auth"
+        return "exchange"
+    if isinstance(exc, (httpx.TransportError, ConnectionError)):
+        return "network"
+    text = str(exc).lower()
+    for category, markers in _TEXT_MARKERS:
+        if any(marker in text for marker in markers):
+            return category
+    if isinstance(exc, (ValueError, TypeError, KeyError)):
+        return "validation"
+    return "unknown"
@@ -1,8 +1,14 @@
 ﻿from __future__ import annotations
 
+from datetime import datetime, timezone
+from pathlib import Path
+
 from app.core.settings import Settings
 from app.exchange.base import ExchangeAdapter
 from app.exchange.grvt_live import GrvtLiveAdapter
+from app.exchange.instrumented import AdapterTelemetry, InstrumentedAdapter
+from app.exchange.recording import RecordingAdapter, ReplayAdapter
+from app.exchange.simulated import SimulatedExchangeAdapter, SimulatedVenueConfig
 
 
 def build_exchange_adapter(
@@ -12,12 +18,34 @@ def build_exchange_adapter(
     grvt_api_key: str | None = None,
     grvt_api_secret: str | None = None,
     grvt_trading_account_id: str | None = None,
+    telemetry: AdapterTelemetry | None = None,
 ) -> ExchangeAdapter:
-    """根据配置构造交易所适配器。"""
-    return GrvtLiveAdapter(
-        settings,
-        grvt_env=grvt_env,
-        grvt_api_key=grvt_api_key,
-        grvt_api_secret=grvt_api_secret,
-        grvt_trading_account_id=grvt_trading_account_id,
-    )
+    """根据配置构造交易所适配器；统一包一层调用计时，重建适配器时沿用同一看板。"""
+    adapter: ExchangeAdapter
+    if settings.exchange_venue == "simulated":
+        adapter = SimulatedExchangeAdapter(SimulatedVenueConfig.from_settings(settings))
+    elif settings.exchange_venue == "replay":
+        if not settings.replay_path:
+            raise ValueError("回放模式需要设置 REPLAY_PATH")
+        return InstrumentedAdapter(ReplayAdapter(settings.replay_path, speed=settings.replay_speed), telemetry)
+    elif settings.exchange_venue == "grvt":
+        adapter = GrvtLiveAdapter(
+            settings,
+            grvt_env=grvt_env,
+            grvt_api_key=grvt_api_key,
+            grvt_api_secret=grvt_api_secret,
+            grvt_trading_account_id=grvt_trading_account_id,
+        )
+    else:
+        raise ValueError(f"未知交易所: {settings.exchange_venue}")
+    if settings.exchange_record_path:
+        adapter = RecordingAdapter(adapter, _record_file(settings.exchange_record_path))
+    return InstrumentedAdapter(adapter, telemetry)
+
+
+def _record_file(path: str) -> Path:
+    """目录形式的录制路径按启动时间生成文件名，适配器重建时不会覆盖上一段录制。"""
+    target = Path(path)
+    if target.suffix in {".jsonl", ".gz"}:
+        return target
+    return target / f"session-{datetime.now(timezone.utc):%Y%m%dT%H%M%S%f}.jsonl.gz"
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import Any, Awaitable, Callable
+
+import httpx
+from pysdk.grvt_ccxt import GrvtCcxt
+from pysdk.grvt_ccxt_env import get_grvt_endpoint
+from pysdk.grvt_ccxt_utils import EnumEncoder, get_grvt_order, get_order_payload
+
+from app.exchange.instrumented import note_payload
+
+
+class GrvtAsyncTransport:
+    """基于 httpx.AsyncClient 的 GRVT REST 异步通道，载荷构造与签名复用同步 SDK。"""
+
+    def __init__(
+        self,
+        client: GrvtCcxt,
+        *,
+        timeout_sec: float = 5.0,
+        max_connections: int = 20,
+        http_client: httpx.AsyncClient | None = None,
+        sign_runner: Callable[..., Awaitable[Any]] | None = None,
+    ) -> None:
+        self._sdk = client
+        # EIP-712 签名是 CPU 密集的同步计算，交给线程执行，事件循环只等待 HTTP。
+        self._sign_runner = sign_runner or asyncio.to_thread
+        self._logger = logging.getLogger("grvt.http")
+        self._http = http_client or httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout_sec),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            headers={"Content-Type": "application/json"},
+        )
+        self._cookie_lock = asyncio.Lock()
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    async def fetch_ticker(self, symbol: str) -> dict:
+        response = await self._post("GET_TICKER", {"instrument": symbol})
+        return response.get("result", [])
+
+    async def fetch_order_book(self, symbol: str, limit: int = 10) -> dict:
+        payload: dict[str, Any] = {"instrument": symbol, "aggregate": 1}
+        if limit:
+            payload["depth"] = limit
+        response = await self._post("GET_ORDER_BOOK", payload)
+        result = response.get("result", {})
+        if self._sdk.is_order_book_ccxt_format():
+            return self._sdk.convert_grvt_ob_to_ccxt(result)
+        return result
+
+    async def fetch_balance(self, type: str = "sub-account") -> dict:
+        self._sdk._check_account_auth()
+        if type == "sub-account":
+            endpoint, payload = "GET_ACCOUNT_SUMMARY", {"sub_account_id": self._sdk.get_trading_account_id()}
+        elif type == "funding":
+            endpoint, payload = "GET_FUNDING_ACCOUNT_SUMMARY", {}
+        elif type == "aggregated":
+            endpoint, payload = "GET_AGGREGATED_ACCOUNT_SUMMARY", {}
+        else:
+            raise ValueError(f"不支持的账户汇总类型: {type}")
+        response = await self._post(endpoint, payload)
+        return self._sdk._get_balances_from_account_summary(response.get("result", {}))
+
+    async def fetch_positions(self, symbols: list[str]) -> list[dict]:
+        self._sdk._check_account_auth()
+        payload = self._sdk._get_payload_fetch_positions(symbols, {})
+        response = await self._post("GET_POSITIONS", payload)
+        positions: list = response.get("result", [])
+        if symbols:
+            positions = [p for p in positions if p.get("instrument") in symbols]
+        return positions
+
+    async def fetch_open_orders(self, symbol: str | None = None) -> list[dict]:
+        self._sdk._check_account_auth()
+        payload = self._sdk._get_payload_fetch_open_orders(symbol, {})
+        response = await self._post("GET_OPEN_ORDERS", payload)
+        orders: list = response.get("result", [])
+        if symbol:
+            orders = [o for o in orders if o.get("legs") and o["legs"][0].get("instrument") == symbol]
+        return orders
+
+    async def fetch_my_trades(
+        self,
+        symbol: str | None = None,
+        since: int | None = None,
+        limit: int | None = None,
+        params: dict | None = None,
+    ) -> dict:
+        self._sdk._check_account_auth()
+        payload = self._sdk._get_payload_fetch_my_trades(symbol, since, limit, params or {})
+        response = await self._post("GET_FILL_HISTORY", payload)
+        if symbol:
+            trades: list = response.get("result", [])
+            response["result"] = [t for t in trades if t.get("instrument") == symbol]
+        return response
+
+    async def create_order(
+        self,
+        symbol: str,
+        order_type: str,
+        side: str,
+        amount: float,
+        price: float | None = None,
+        params: dict | None = None,
+    ) -> dict:
+        order, payload = await self._sign_runner(self._signed_order, symbol, order_type, side, amount, price, params or {})
+        response = await self._post("CREATE_ORDER", payload)
+        if response.get("result") is None:
+            self._logger.error("下单返回异常 client_order_id=%s response=%s", order.metadata.client_order_id, response)
+            return {}
+        return response.get("result", {})
+
+    def _signed_order(
+        self,
+        symbol: str,
+        order_type: str,
+        side: str,
+        amount: float,
+        price: float | None,
+        params: dict,
+    ) -> tuple[Any, dict]:
+        """构造并签名订单载荷，在线程中执行。"""
+        sdk = self._sdk
+        sdk._check_account_auth()
+        sdk._check_valid_symbol(symbol)
+        sdk._check_order_arguments(order_type, side, amount, price)
+        order = get_grvt_order(
+            sub_account_id=sdk.get_trading_account_id(),
+            symbol=symbol,
+            order_type=order_type,
+            side=side,
+            amount=amount,
+            limit_price=price,
+            order_duration_secs=params.get("order_duration_secs", 24 * 60 * 60),
+            params=params,
+        )
+        payload = get_order_payload(order, private_key=sdk._private_key, env=sdk.env, instruments=sdk.markets)
+        return order, payload
+
+    async def cancel_order(self, id: str | None = None, symbol: str | None = None, params: dict | None = None) -> bool:
+        params = params or {}
+        self._sdk._check_account_auth()
+        payload: dict[str, Any] = {"sub_account_id": self._sdk.get_trading_account_id()}
+        if id:
+            payload["order_id"] = str(id)
+        elif "client_order_id" in params:
+            payload["client_order_id"] = str(params["client_order_id"])
+        else:
+            raise ValueError("撤单需要 order_id 或 client_order_id")
+        if "time_to_live_ms" in params:
+            payload["time_to_live_ms"] = str(params["time_to_live_ms"])
+        response = await self._post("CANCEL_ORDER", payload)
+        return self._acked(response, "cancel_order")
+
+    async def cancel_all_orders(self, params: dict | None = None) -> bool:
+        self._sdk._check_account_auth()
+        payload = self._sdk._get_payload_cancel_all_orders(params or {})
+        response = await self._post("CANCEL_ALL_ORDERS", payload)
+        return self._acked(response, "cancel_all_orders")
+
+    def _acked(self, response: dict, action: str) -> bool:
+        result = response.get("result")
+        if isinstance(result, dict) and result.get("ack"):
+            return True
+        self._logger.warning("%s 未被确认 response=%s", action, response)
+        return False
+
+    async def _post(self, endpoint: str, payload: dict) -> dict:
+        path = get_grvt_endpoint(self._sdk.env, endpoint)
+        if not path:
+            raise ValueError(f"GRVT 端点不存在: {endpoint}")
+        headers = await self._auth_headers()
+        body = json.dumps(payload, cls=EnumEncoder)
+        resp = await self._http.post(path, content=body, headers=headers)
+        note_payload(len(body), len(resp.content))
+        try:
+            data = resp.json()
+        except ValueError:
+            self._logger.warning("GRVT 响应非 JSON endpoint=%s status=%s", endpoint, resp.status_code)
+            data = {}
+        if resp.is_error:
+            # 与 SDK 行为保持一致：HTTP 错误不抛出，由调用方按返回内容判断。
+            self._logger.warning("GRVT 请求失败 endpoint=%s status=%s response=%s", endpoint, resp.status_code, data)
+        return data if isinstance(data, dict) else {}
+
+    async def _auth_headers(self) -> dict[str, str]:
+        sdk = self._sdk
+        if sdk.should_refresh_cookie():
+            async with self._cookie_lock:
+                if sdk.should_refresh_cookie():
+                    # 登录换 cookie 频率极低，沿用 SDK 的同步实现即可。
+                    await asyncio.to_thread(sdk.refresh_cookie)
+        cookie = sdk._cookie or {}
+        headers: dict[str, str] = {}
+        if cookie.get("gravity"):
+            headers["Cookie"] = f"gravity={cookie['gravity']}"
+        if cookie.get("X-Grvt-Account-Id"):
+            headers["X-Grvt-Account-Id"] = str(cookie["X-Grvt-Account-Id"])
+        return headers
@@ -5,15 +5,27 @@ import logging
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from decimal import Decimal, ROUND_DOWN, ROUND_UP
-from functools import cached_property
+from functools import cached_property, partial
 from typing import Any
 
 from pysdk.grvt_ccxt import GrvtCcxt
-from pysdk.grvt_ccxt_env import GrvtEnv
+from pysdk.grvt_ccxt_env import GrvtEnv, GrvtWSEndpointType, get_grvt_ws_endpoint
 
+from app.core.executor import ExecutorLane
 from app.core.settings import Settings
 from app.exchange.base import ExchangeAdapter, PositionDustError
-from app.models import AccountFundsSnapshot, MarketSnapshot, OrderSnapshot, PositionSnapshot, TradeSnapshot
+from app.exchange.grvt_async_transport import GrvtAsyncTransport
+from app.exchange.grvt_market_stream import GrvtMarketStream
+from app.exchange.instrumented import track_endpoint
+from app.models import (
+    AccountFundsSnapshot,
+    CancelReplaceResult,
+    MarketSnapshot,
+    OrderRequest,
+    OrderSnapshot,
+    PositionSnapshot,
+    TradeSnapshot,
+)
 
 
 @dataclass(frozen=True, slots=True)
@@ -27,11 +39,14 @@ class InstrumentConstraints:
 class InstrumentConstraintsError(RuntimeError):
     """交易对约束缺失或不完整。"""
 
+    error_class = "instrument"
+
 
 class GrvtLiveAdapter(ExchangeAdapter):
     """基于 grvt-pysdk 的实盘交易适配器。"""
 
     FIXED_SCALE = 1_000_000_000
+    TRADE_METHODS = frozenset({"create_order", "cancel_order", "cancel_all_orders"})
 
     def __init__(
         self,
@@ -51,9 +66,13 @@ class GrvtLiveAdapter(ExchangeAdapter):
             settings.grvt_trading_account_id if grvt_trading_account_id is None else grvt_trading_account_id
         )
         self._instrument_constraints_cache: dict[str, InstrumentConstraints] = {}
+        self._market_stream: GrvtMarketStream | None = None
+        self._async_transport: GrvtAsyncTransport | None = None
+        # 下单/撤单与读请求分通道，慢查询不会占住下单线程。
+        self._trade_lane = ExecutorLane("grvt-trade", settings.grvt_trade_workers)
+        self._read_lane = ExecutorLane("grvt-read", settings.grvt_read_workers)
 
-    @cached_property
-    def _client(self) -> GrvtCcxt:
+    def _resolve_env(self) -> GrvtEnv:
         env_raw = str(self._grvt_env).lower()
         env_map = {
             "prod": GrvtEnv.PROD,
@@ -62,7 +81,11 @@ class GrvtLiveAdapter(ExchangeAdapter):
             "staging": GrvtEnv.STAGING,
             "dev": GrvtEnv.DEV,
         }
-        env = env_map.get(env_raw, GrvtEnv.TESTNET)
+        return env_map.get(env_raw, GrvtEnv.TESTNET)
+
+    @cached_property
+    def _client(self) -> GrvtCcxt:
+        env = self._resolve_env()
         params = {
             "api_key": self._grvt_api_key,
             "private_key": self._grvt_api_secret,
@@ -70,32 +93,61 @@ class GrvtLiveAdapter(ExchangeAdapter):
         }
         return GrvtCcxt(env=env, parameters=params, order_book_ccxt_format=True)
 
+    async def _rest(self, method: str, *args: Any) -> Any:
+        """REST 调用统一入口：开启异步通道时走 httpx 连接池，否则 SDK 同步调用按交易/读取分通道执行。"""
+        with track_endpoint(method):
+            if self._settings.grvt_async_http_enabled:
+                transport = await self._ensure_async_transport()
+                return await getattr(transport, method)(*args)
+            lane = self._trade_lane if method in self.TRADE_METHODS else self._read_lane
+            return await lane.run(lambda: getattr(self._client, method)(*args))
+
+    async def _ensure_async_transport(self) -> GrvtAsyncTransport:
+        if self._async_transport is None:
+            # SDK 构造时会同步拉取 markets，放到线程里避免阻塞事件循环。
+            client = self.__dict__.get("_client") or await self._read_lane.run(lambda: self._client)
+            if self._async_transport is None:
+                self._async_transport = GrvtAsyncTransport(
+                    client,
+                    timeout_sec=self._settings.grvt_http_timeout_sec,
+                    max_connections=self._settings.grvt_http_max_connections,
+                    sign_runner=self._trade_lane.run,
+                )
+        return self._async_transport
+
     async def ping(self) -> bool:
         try:
             symbol = "BTC_USDT_Perp"
-            await asyncio.to_thread(self._client.fetch_ticker, symbol)
+            await self._rest("fetch_ticker", symbol)
             return True
         except Exception:
             return False
 
     async def fetch_market_snapshot(self, symbol: str) -> MarketSnapshot:
         ex_symbol = self._normalize_symbol(symbol)
+        if self._settings.grvt_market_stream_enabled:
+            streamed = self._ensure_market_stream(ex_symbol).latest(self._settings.grvt_market_stream_stale_sec)
+            if streamed is not None:
+                return streamed
+
         ticker_result, ob_result = await asyncio.gather(
-            asyncio.to_thread(self._client.fetch_ticker, ex_symbol),
-            asyncio.to_thread(self._client.fetch_order_book, ex_symbol, 10),
+            self._rest("fetch_ticker", ex_symbol),
+            self._rest("fetch_order_book", ex_symbol, 10),
             return_exceptions=True,
         )
 
         if isinstance(ticker_result, Exception):
             raise ticker_result
 
-        ticker = ticker_result
         order_book: dict[str, Any] = {}
         if isinstance(ob_result, Exception):
             self._logger.warning("璇诲彇 order_book 澶辫触锛岄檷绾т负 ticker-only: %s", ob_result)
         elif isinstance(ob_result, dict):
             order_book = ob_result
 
+        return self._build_market_snapshot(ex_symbol, ticker_result, order_book)
+
+    def _build_market_snapshot(self, ex_symbol: str, ticker: dict[str, Any], order_book: dict[str, Any]) -> MarketSnapshot:
         bids = order_book.get("bids", []) if isinstance(order_book, dict) else []
         asks = order_book.get("asks", []) if isinstance(order_book, dict) else []
 
@@ -127,8 +179,59 @@ class GrvtLiveAdapter(ExchangeAdapter):
             timestamp=datetime.now(timezone.utc),
         )
 
+    def _ensure_market_stream(self, ex_symbol: str) -> GrvtMarketStream:
+        stream = self._market_stream
+        if stream is not None and self._symbol_equal(stream.instrument, ex_symbol):
+            stream.start()
+            return stream
+        if stream is not None:
+            # 切换交易对时旧订阅直接作废，后台任务异步回收。
+            asyncio.create_task(stream.close())
+        stream = GrvtMarketStream(
+            self._market_ws_url(),
+            ex_symbol,
+            partial(self._build_market_snapshot, ex_symbol),
+            rate_ms=self._settings.grvt_market_stream_rate_ms,
+        )
+        stream.start()
+        self._market_stream = stream
+        return stream
+
+    def market_stream_active(self, symbol: str) -> bool:
+        stream = self._market_stream
+        if not self._settings.grvt_market_stream_enabled or stream is None or not stream.connected:
+            return False
+        if not self._symbol_equal(stream.instrument, symbol):
+            return False
+        return stream.latest(self._settings.grvt_market_stream_stale_sec) is not None
+
+    async def wait_market_update(self, symbol: str, timeout: float) -> MarketSnapshot | None:
+        if not self.market_stream_active(symbol):
+            return await super().wait_market_update(symbol, timeout)
+        return await self._market_stream.wait_update(timeout)
+
+    def _market_ws_url(self) -> str:
+        if self._settings.grvt_market_ws_url:
+            return self._settings.grvt_market_ws_url
+        return get_grvt_ws_endpoint(self._resolve_env().value, GrvtWSEndpointType.MARKET_DATA)
+
+    async def close(self) -> None:
+        stream = self._market_stream
+        self._market_stream = None
+        if stream is not None:
+            await stream.close()
+        transport = self._async_transport
+        self._async_transport = None
+        if transport is not None:
+            await transport.aclose()
+        self._trade_lane.shutdown()
+        self._read_lane.shutdown()
+
+    def executor_stats(self) -> dict[str, dict]:
+        return {lane.name: lane.stats() for lane in (self._trade_lane, self._read_lane)}
+
     async def fetch_account_funds(self) -> AccountFundsSnapshot:
-        balance = await asyncio.to_thread(self._client.fetch_balance, "aggregated")
+        balance = await self._rest("fetch_balance", "aggregated")
         if not isinstance(balance, dict):
             return AccountFundsSnapshot(equity_usdt=0.0, free_usdt=0.0, used_usdt=0.0, source="invalid-balance")
 
@@ -196,7 +299,7 @@ class GrvtLiveAdapter(ExchangeAdapter):
 
     async def fetch_position(self, symbol: str) -> PositionSnapshot:
         ex_symbol = self._normalize_symbol(symbol)
-        positions = await asyncio.to_thread(self._client.fetch_positions, [ex_symbol])
+        positions = await self._rest("fetch_positions", [ex_symbol])
         base_position = 0.0
         notional = 0.0
         for item in positions or []:
@@ -213,7 +316,7 @@ class GrvtLiveAdapter(ExchangeAdapter):
 
     async def fetch_open_orders(self, symbol: str) -> list[OrderSnapshot]:
         ex_symbol = self._normalize_symbol(symbol)
-        orders = await asyncio.to_thread(self._client.fetch_open_orders, ex_symbol)
+        orders = await self._rest("fetch_open_orders", ex_symbol)
         results: list[OrderSnapshot] = []
         for order in orders or []:
             if not isinstance(order, dict):
@@ -221,10 +324,11 @@ class GrvtLiveAdapter(ExchangeAdapter):
             side = self._parse_side(order)
             leg = self._first_leg(order)
             price = self._decode_fixed(leg.get("limit_price", 0.0))
-            size = self._decode_fixed(leg.get("size", 0.0))
+            size = self._remaining_size(order, leg)
             order_id = self._extract_order_id(order)
             created_at = self._parse_dt(order.get("create_time_ns") or order.get("created_at"))
-            status = str(order.get("state", "open")).lower()
+            state = order.get("state", "open")
+            status = str(state.get("status", "open") if isinstance(state, dict) else state).lower()
             if not order_id:
                 continue
             results.append(
@@ -235,13 +339,14 @@ class GrvtLiveAdapter(ExchangeAdapter):
                     size=size,
                     status=status,
                     created_at=created_at,
+                    client_order_id=self._extract_client_order_id(order) or None,
                 )
             )
         return results
 
     async def fetch_recent_trades(self, symbol: str, limit: int = 50) -> list[TradeSnapshot]:
         ex_symbol = self._normalize_symbol(symbol)
-        data = await asyncio.to_thread(self._client.fetch_my_trades, ex_symbol, None, limit, {})
+        data = await self._rest("fetch_my_trades", ex_symbol, None, limit, {})
         rows = data.get("result", []) if isinstance(data, dict) else []
         trades: list[TradeSnapshot] = []
         for row in rows[-limit:]:
@@ -257,6 +362,7 @@ class GrvtLiveAdapter(ExchangeAdapter):
                     fee=self._decode_fixed(row.get("fee", 0.0)),
                     created_at=self._parse_dt(row.get("event_time") or row.get("created_at")),
                     symbol=ex_symbol,
+                    order_id=str(row.get("order_id") or "") or None,
                 )
             )
         return trades
@@ -286,8 +392,8 @@ class GrvtLiveAdapter(ExchangeAdapter):
             "post_only": bool(post_only),
             "client_order_id": client_order_id,
         }
-        result = await asyncio.to_thread(
-            self._client.create_order,
+        result = await self._rest(
+            "create_order",
             ex_symbol,
             "limit",
             "buy" if side == "buy" else "sell",
@@ -303,15 +409,22 @@ class GrvtLiveAdapter(ExchangeAdapter):
             size=quantized_size,
             status="open",
             created_at=datetime.now(timezone.utc),
+            client_order_id=str(client_order_id),
         )
 
     async def cancel_order(self, symbol: str, order_id: str) -> None:
         ex_symbol = self._normalize_symbol(symbol)
-        await asyncio.to_thread(self._client.cancel_order, order_id, ex_symbol, {})
+        await self._rest("cancel_order", order_id, ex_symbol, {})
+
+    # GRVT v1 仅提供单笔下单/撤单与全撤接口，批量下单沿用基类的并发逐笔实现。
+
+    async def cancel_replace_order(self, symbol: str, cancel_order_id: str, request: OrderRequest) -> CancelReplaceResult:
+        """无原子改单接口：撤单与下单并发提交，改价只花一个往返，且不会同侧双倍挂单。"""
+        return await self._cancel_replace_concurrently(symbol, cancel_order_id, request)
 
     async def cancel_all_orders(self, symbol: str) -> None:
         ex_symbol = self._normalize_symbol(symbol)
-        await asyncio.to_thread(self._client.cancel_all_orders, {"symbol": ex_symbol})
+        await self._rest("cancel_all_orders", {"symbol": ex_symbol})
 
     async def close_position_taker(
         self,
@@ -330,8 +443,8 @@ class GrvtLiveAdapter(ExchangeAdapter):
             "time_in_force": "IOC",
             "timeInForce": "IOC",
         }
-        result = await asyncio.to_thread(
-            self._client.create_order,
+        result = await self._rest(
+            "create_order",
             ex_symbol,
             "market",
             "buy" if side == "buy" else "sell",
@@ -373,7 +486,7 @@ class GrvtLiveAdapter(ExchangeAdapter):
         if cached is not None:
             return cached
 
-        constraints = await asyncio.to_thread(self._load_instrument_constraints, ex_symbol)
+        constraints = await self._read_lane.run(self._load_instrument_constraints, ex_symbol)
         self._instrument_constraints_cache[cache_key] = constraints
         return constraints
 
@@ -694,6 +807,26 @@ class GrvtLiveAdapter(ExchangeAdapter):
                 return text
         return ""
 
+    @staticmethod
+    def _extract_client_order_id(payload: dict[str, Any]) -> str:
+        metadata = payload.get("metadata")
+        value = metadata.get("client_order_id") if isinstance(metadata, dict) else payload.get("client_order_id")
+        return str(value).strip() if value is not None else ""
+
+    def _remaining_size(self, order: dict, leg: dict) -> float:
+        """挂单剩余量：优先取 state.book_size，否则为下单量减 state.traded_size。"""
+        size = self._decode_fixed(leg.get("size", 0.0))
+        state = order.get("state")
+        if not isinstance(state, dict):
+            return size
+        book_size = state.get("book_size")
+        if isinstance(book_size, list) and book_size:
+            return self._decode_fixed(book_size[0])
+        traded_size = state.get("traded_size")
+        if isinstance(traded_size, list) and traded_size:
+            return max(0.0, size - self._decode_fixed(traded_size[0]))
+        return size
+
     def _first_leg(self, order: dict) -> dict:
         legs = order.get("legs") if isinstance(order, dict) else None
         if isinstance(legs, list) and legs:
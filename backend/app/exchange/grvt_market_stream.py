@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import Callable
+from typing import Any
+
+import orjson
+import websockets
+
+from app.models import MarketSnapshot
+
+SnapshotBuilder = Callable[[dict[str, Any], dict[str, Any]], MarketSnapshot]
+
+
+class BookSequenceGap(RuntimeError):
+    """盘口增量序号不连续，需要重新订阅以获取新的全量快照。"""
+
+
+class GrvtMarketStream:
+    """GRVT 行情 WS 订阅，内存中常驻最新盘口与 ticker。
+
+    订阅增量频道（book.d / ticker.d）：快照频道 book.s 最快 500ms 一帧，
+    事件驱动报价会比固定间隔更慢；增量频道可到 100ms 及以下，盘口在本地按增量维护。
+    """
+
+    BOOK_STREAM = "v1.book.d"
+    TICKER_STREAM = "v1.ticker.d"
+
+    def __init__(
+        self,
+        url: str,
+        instrument: str,
+        builder: SnapshotBuilder,
+        *,
+        depth: int = 10,
+        rate_ms: int = 100,
+        reconnect_base_delay_sec: float = 0.5,
+        reconnect_max_delay_sec: float = 10.0,
+    ) -> None:
+        self._url = url
+        self._instrument = instrument
+        self._builder = builder
+        self._depth = depth
+        self._rate_ms = rate_ms
+        self._reconnect_base_delay_sec = reconnect_base_delay_sec
+        self._reconnect_max_delay_sec = reconnect_max_delay_sec
+        self._logger = logging.getLogger("grvt.stream")
+
+        self._ticker: dict[str, Any] = {}
+        # 价格 -> 档位；size 为 0 的增量表示删除该档。
+        self._bids: dict[float, dict[str, Any]] = {}
+        self._asks: dict[float, dict[str, Any]] = {}
+        self._book_sequence: int | None = None
+        # (monotonic 时间戳, 快照) 整体替换，读侧无需加锁。
+        self._latest: tuple[float, MarketSnapshot] | None = None
+        self._connected = False
+        self._task: asyncio.Task | None = None
+        self._request_id = 0
+        self._update_event = asyncio.Event()
+
+    @property
+    def instrument(self) -> str:
+        return self._instrument
+
+    @property
+    def connected(self) -> bool:
+        return self._connected
+
+    def start(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._run(), name=f"grvt-market-stream-{self._instrument}")
+
+    async def close(self) -> None:
+        task = self._task
+        self._task = None
+        self._connected = False
+        if task is None or task.done():
+            return
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+    def latest(self, max_age_sec: float) -> MarketSnapshot | None:
+        """返回未过期的最新快照，过期或尚无数据时返回 None。"""
+        latest = self._latest
+        if latest is None:
+            return None
+        updated_at, snapshot = latest
+        if time.monotonic() - updated_at > max_age_sec:
+            return None
+        return snapshot
+
+    async def wait_update(self, timeout: float) -> MarketSnapshot | None:
+        """等待下一次快照更新，超时返回 None。"""
+        event = self._update_event
+        try:
+            await asyncio.wait_for(event.wait(), timeout=max(0.0, timeout))
+        except asyncio.TimeoutError:
+            return None
+        latest = self._latest
+        return latest[1] if latest is not None else None
+
+    async def _run(self) -> None:
+        delay = self._reconnect_base_delay_sec
+        while True:
+            try:
+                async with websockets.connect(self._url, open_timeout=5, max_size=None) as ws:
+                    self._reset_book()
+                    await self._subscribe(ws)
+                    self._connected = True
+                    delay = self._reconnect_base_delay_sec
+                    self._logger.info("行情 WS 已连接 url=%s instrument=%s", self._url, self._instrument)
+                    async for raw in ws:
+                        self._on_message(raw)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                self._logger.warning("行情 WS 断开，%.2fs 后重连: %s", delay, exc)
+            finally:
+                self._connected = False
+
+            await asyncio.sleep(delay)
+            delay = min(self._reconnect_max_delay_sec, delay * 2)
+
+    async def _subscribe(self, ws: Any) -> None:
+        selectors = (
+            (self.BOOK_STREAM, f"{self._instrument}@{self._rate_ms}"),
+            (self.TICKER_STREAM, f"{self._instrument}@{self._rate_ms}"),
+        )
+        for stream, selector in selectors:
+            self._request_id += 1
+            await ws.send(
+                orjson.dumps(
+                    {
+                        "request_id": self._request_id,
+                        "stream": stream,
+                        "feed": [selector],
+                        "method": "subscribe",
+                        "is_full": True,
+                    }
+                ).decode()
+            )
+
+    def _on_message(self, raw: str | bytes) -> None:
+        try:
+            message = orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            self._logger.warning("行情 WS 消息解析失败: %s", raw[:200])
+            return
+        if not isinstance(message, dict):
+            return
+        feed = message.get("feed")
+        if not isinstance(feed, dict):
+            return
+
+        stream = str(message.get("stream", ""))
+        if stream.endswith("book.d"):
+            self._apply_book_delta(feed)
+        elif stream.endswith("ticker.d"):
+            # ticker 增量只携带变化字段，合并进当前视图。
+            self._ticker = {**self._ticker, **feed}
+        else:
+            return
+
+        try:
+            snapshot = self._builder(self._ticker, self._order_book())
+        except Exception as exc:
+            self._logger.warning("行情 WS 快照构建失败: %s", exc)
+            return
+        if snapshot.bid <= 0 or snapshot.ask <= 0:
+            return
+        self._latest = (time.monotonic(), snapshot)
+        # 每次更新换新 Event，唤醒所有等待者后不残留置位状态。
+        event = self._update_event
+        self._update_event = asyncio.Event()
+        event.set()
+
+    def _reset_book(self) -> None:
+        self._bids.clear()
+        self._asks.clear()
+        self._book_sequence = None
+
+    def _apply_book_delta(self, feed: dict[str, Any]) -> None:
+        sequence = _as_int(feed.get("sequence_number"))
+        previous = _as_int(feed.get("prev_sequence_number"))
+        if sequence == 0:
+            # 序号 0 为订阅后的全量快照。
+            self._reset_book()
+        elif previous is not None and self._book_sequence is not None and previous != self._book_sequence:
+            raise BookSequenceGap(f"盘口增量序号不连续: {self._book_sequence} -> {previous}")
+        for levels, side in ((feed.get("bids") or [], self._bids), (feed.get("asks") or [], self._asks)):
+            for level in levels:
+                price = _as_float(level.get("price"))
+                if price <= 0:
+                    continue
+                if _as_float(level.get("size")) <= 0:
+                    side.pop(price, None)
+                else:
+                    side[price] = level
+        if sequence is not None:
+            self._book_sequence = sequence
+
+    def _order_book(self) -> dict[str, Any]:
+        bids = [self._bids[price] for price in sorted(self._bids, reverse=True)[: self._depth]]
+        asks = [self._asks[price] for price in sorted(self._asks)[: self._depth]]
+        return {"instrument": self._instrument, "bids": bids, "asks": asks}
+
+
+def _as_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _as_int(value: Any) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
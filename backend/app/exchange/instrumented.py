@@ -0,0 +1,330 @@
+from __future__ import annotations
+
+import contextvars
+import time
+from collections.abc import Callable
+from typing import Any
+
+from app.exchange.base import ExchangeAdapter
+from app.exchange.errors import classify_error
+from app.models import (
+    AccountFundsSnapshot,
+    CancelReplaceResult,
+    MarketSnapshot,
+    OrderRequest,
+    OrderSnapshot,
+    PositionSnapshot,
+    TradeSnapshot,
+)
+from app.services.prometheus import ADAPTER_CALL_SECONDS, ADAPTER_ERRORS_TOTAL, ADAPTER_METHOD_SECONDS
+from app.services.quantiles import WindowedSketch
+from app.services.rolling_window import BucketedCounter, RollingSum
+
+_CURRENT: contextvars.ContextVar[CallScope | None] = contextvars.ContextVar("adapter_call_scope", default=None)
+
+
+class _CallStats:
+    """单个适配器方法或 REST 端点的累计与 1 分钟滚动统计。"""
+
+    __slots__ = (
+        "kind",
+        "name",
+        "calls",
+        "errors",
+        "retries",
+        "bytes_sent",
+        "bytes_received",
+        "errors_by_class",
+        "last_error",
+        "last_error_class",
+        "last_failed",
+        "last_at",
+        "_latency_1m",
+        "_time_1m",
+        "_calls_1m",
+        "_errors_1m",
+    )
+
+    def __init__(self, kind: str, name: str) -> None:
+        self.kind = kind
+        self.name = name
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.errors_by_class: dict[str, int] = {}
+        self.last_error: str | None = None
+        self.last_error_class: str | None = None
+        self.last_failed = False
+        self.last_at = 0.0
+        self._latency_1m = WindowedSketch(60.0, 6)
+        self._time_1m = RollingSum(60.0, maxlen=100_000)
+        self._calls_1m = BucketedCounter(60.0)
+        self._errors_1m = BucketedCounter(60.0)
+
+    def record(self, now: float, elapsed_ms: float, sent: int, received: int, exc: BaseException | None) -> None:
+        # 上一次同名调用失败后的再次调用记为重试（引擎按 tick 重试读取、平仓循环重试）。
+        if self.last_failed:
+            self.retries += 1
+        self.calls += 1
+        self.bytes_sent += sent
+        self.bytes_received += received
+        self.last_at = now
+        self._latency_1m.add(now, elapsed_ms)
+        self._time_1m.add(now, elapsed_ms)
+        self._calls_1m.add(now)
+        self.last_failed = exc is not None
+        if exc is not None:
+            category = classify_error(exc)
+            self.errors += 1
+            self.errors_by_class[category] = self.errors_by_class.get(category, 0) + 1
+            self.last_error = str(exc)[:200]
+            self.last_error_class = category
+            self._errors_1m.add(now)
+
+    def snapshot(self, now: float) -> dict[str, Any]:
+        latency = self._latency_1m.snapshot(now).summary()
+        return {
+            "kind": self.kind,
+            "name": self.name,
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "calls_1m": self._calls_1m.count(now),
+            "errors_1m": self._errors_1m.count(now),
+            "time_1m_ms": round(self._time_1m.total(now), 3),
+            "p50_ms": round(latency["p50"], 3),
+            "p99_ms": round(latency["p99"], 3),
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "errors_by_class": dict(self.errors_by_class),
+            "last_error_class": self.last_error_class,
+            "last_error": self.last_error,
+        }
+
+
+class AdapterTelemetry:
+    """适配器调用看板：按方法与 REST 端点聚合，按最近 1 分钟累计耗时排序，定位吃掉 tick 预算的调用。"""
+
+    def __init__(self, clock: Callable[[], float] = time.time) -> None:
+        self._clock = clock
+        self._stats: dict[tuple[str, str], _CallStats] = {}
+
+    def record(
+        self,
+        kind: str,
+        name: str,
+        elapsed_ms: float,
+        *,
+        sent: int = 0,
+        received: int = 0,
+        exc: BaseException | None = None,
+    ) -> None:
+        key = (kind, name)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = _CallStats(kind, name)
+        stats.record(self._clock(), elapsed_ms, sent, received, exc)
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        now = self._clock()
+        rows = [stats.snapshot(now) for stats in self._stats.values()]
+        rows.sort(key=lambda row: (-row["time_1m_ms"], row["kind"], row["name"]))
+        return rows
+
+    def reset(self) -> None:
+        self._stats.clear()
+
+
+class CallScope:
+    """一次被计时的调用；嵌套的 REST 端点调用把收发字节数同时累加到外层方法上。"""
+
+    __slots__ = ("kind", "name", "telemetry", "sent", "received", "item_error", "_parent", "_token", "_started")
+
+    def __init__(self, kind: str, name: str, telemetry: AdapterTelemetry | None = None) -> None:
+        self.kind = kind
+        self.name = name
+        self.telemetry = telemetry
+        self.sent = 0
+        self.received = 0
+        # 批量接口以返回值携带的单笔错误；调用本身未抛异常时仍按失败记录。
+        self.item_error: Exception | None = None
+        self._parent: CallScope | None = None
+        self._token: contextvars.Token | None = None
+        self._started = 0.0
+
+    def __enter__(self) -> CallScope:
+        self._parent = _CURRENT.get()
+        if self.telemetry is None and self._parent is not None:
+            self.telemetry = self._parent.telemetry
+        self._token = _CURRENT.set(self)
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        elapsed = time.perf_counter() - self._started
+        _CURRENT.reset(self._token)
+        failed = exc if isinstance(exc, Exception) else (self.item_error if exc is None else None)
+        outcome = "ok" if exc is None and failed is None else "error"
+        if self.kind == "endpoint":
+            ADAPTER_CALL_SECONDS.labels(self.name, outcome).observe(elapsed)
+        else:
+            ADAPTER_METHOD_SECONDS.labels(self.name, outcome).observe(elapsed)
+            if failed is not None:
+                ADAPTER_ERRORS_TOTAL.labels(self.name, classify_error(failed)).inc()
+        if self.telemetry is not None and (exc is None or failed is not None):
+            self.telemetry.record(
+                self.kind, self.name, elapsed * 1000.0, sent=self.sent, received=self.received, exc=failed
+            )
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._started) * 1000.0
+
+    def add_payload(self, sent: int, received: int) -> None:
+        scope: CallScope | None = self
+        while scope is not None:
+            scope.sent += sent
+            scope.received += received
+            scope = scope._parent
+
+
+def track_endpoint(name: str) -> CallScope:
+    """REST 端点计时；处于被包装的适配器方法内时，同时计入调用看板。"""
+    return CallScope("endpoint", name)
+
+
+def note_payload(sent: int, received: int) -> None:
+    """传输层上报一次请求的收发字节数，累加到当前调用链。"""
+    scope = _CURRENT.get()
+    if scope is not None:
+        scope.add_payload(sent, received)
+
+
+class InstrumentedAdapter(ExchangeAdapter):
+    """透明包装任意 ExchangeAdapter：逐方法记录耗时、载荷字节、重试与结构化错误分类。"""
+
+    def __init__(self, inner: ExchangeAdapter, telemetry: AdapterTelemetry | None = None) -> None:
+        self._inner = inner
+        self.telemetry = telemetry or AdapterTelemetry()
+
+    @property
+    def inner(self) -> ExchangeAdapter:
+        return self._inner
+
+    def _scope(self, name: str) -> CallScope:
+        return CallScope("method", name, self.telemetry)
+
+    async def ping(self) -> bool:
+        with self._scope("ping"):
+            return await self._inner.ping()
+
+    async def fetch_market_snapshot(self, symbol: str) -> MarketSnapshot:
+        with self._scope("fetch_market_snapshot"):
+            return await self._inner.fetch_market_snapshot(symbol)
+
+    async def fetch_equity(self) -> float:
+        with self._scope("fetch_equity"):
+            return await self._inner.fetch_equity()
+
+    async def fetch_account_funds(self) -> AccountFundsSnapshot:
+        with self._scope("fetch_account_funds"):
+            return await self._inner.fetch_account_funds()
+
+    async def fetch_position(self, symbol: str) -> PositionSnapshot:
+        with self._scope("fetch_position"):
+            return await self._inner.fetch_position(symbol)
+
+    async def fetch_open_orders(self, symbol: str) -> list[OrderSnapshot]:
+        with self._scope("fetch_open_orders"):
+            return await self._inner.fetch_open_orders(symbol)
+
+    async def fetch_recent_trades(self, symbol: str, limit: int = 50) -> list[TradeSnapshot]:
+        with self._scope("fetch_recent_trades"):
+            return await self._inner.fetch_recent_trades(symbol, limit)
+
+    async def place_limit_order(
+        self,
+        symbol: str,
+        side: str,
+        price: float,
+        size: float,
+        post_only: bool,
+        client_order_id: str,
+    ) -> OrderSnapshot:
+        with self._scope("place_limit_order"):
+            return await self._inner.place_limit_order(
+                symbol=symbol,
+                side=side,
+                price=price,
+                size=size,
+                post_only=post_only,
+                client_order_id=client_order_id,
+            )
+
+    async def cancel_order(self, symbol: str, order_id: str) -> None:
+        with self._scope("cancel_order"):
+            await self._inner.cancel_order(symbol, order_id)
+
+    async def cancel_all_orders(self, symbol: str) -> None:
+        with self._scope("cancel_all_orders"):
+            await self._inner.cancel_all_orders(symbol)
+
+    async def place_limit_orders(self, symbol: str, requests: list[OrderRequest]) -> list[OrderSnapshot | Exception]:
+        with self._scope("place_limit_orders") as scope:
+            results = await self._inner.place_limit_orders(symbol, requests)
+            self._record_items(
+                scope, "place_limit_order", [result if isinstance(result, Exception) else None for result in results]
+            )
+            return results
+
+    async def cancel_orders(self, symbol: str, order_ids: list[str]) -> list[Exception | None]:
+        with self._scope("cancel_orders") as scope:
+            results = await self._inner.cancel_orders(symbol, order_ids)
+            self._record_items(scope, "cancel_order", results)
+            return results
+
+    async def cancel_replace_order(self, symbol: str, cancel_order_id: str, request: OrderRequest) -> CancelReplaceResult:
+        with self._scope("cancel_replace_order") as scope:
+            result = await self._inner.cancel_replace_order(symbol, cancel_order_id, request)
+            self._record_items(scope, "place_limit_order", [result.place_error])
+            if not result.cancel_skipped:
+                self._record_items(scope, "cancel_order", [result.cancel_error])
+            return result
+
+    def _record_items(self, scope: CallScope, name: str, errors: list[Exception | None]) -> None:
+        """批量与撤改接口的逐笔结果以返回值携带，按单笔方法名补记，耗时取整次调用耗时。"""
+        elapsed_ms = scope.elapsed_ms()
+        for error in errors:
+            if error is not None:
+                ADAPTER_ERRORS_TOTAL.labels(name, classify_error(error)).inc()
+                if scope.item_error is None:
+                    scope.item_error = error
+            self.telemetry.record("method", name, elapsed_ms, exc=error)
+
+    async def close_position_taker(
+        self,
+        symbol: str,
+        side: str,
+        size: float,
+        reduce_only: bool = True,
+    ) -> OrderSnapshot:
+        with self._scope("close_position_taker"):
+            return await self._inner.close_position_taker(symbol, side, size, reduce_only)
+
+    async def flatten_position_taker(self, symbol: str) -> None:
+        with self._scope("flatten_position_taker"):
+            await self._inner.flatten_position_taker(symbol)
+
+    def market_stream_active(self, symbol: str) -> bool:
+        return self._inner.market_stream_active(symbol)
+
+    async def wait_market_update(self, symbol: str, timeout: float) -> MarketSnapshot | None:
+        # 等待推送是空闲时间而非调用耗时，不计入看板。
+        return await self._inner.wait_market_update(symbol, timeout)
+
+    def executor_stats(self) -> dict[str, dict]:
+        return self._inner.executor_stats()
+
+    async def close(self) -> None:
+        await self._inner.close()
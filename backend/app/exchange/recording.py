@@ -0,0 +1,414 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import gzip
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, Any
+
+import orjson
+
+from app.exchange.base import ExchangeAdapter, PositionDustError
+from app.exchange.errors import classify_error
+from app.models import (
+    AccountFundsSnapshot,
+    CancelReplaceResult,
+    MarketSnapshot,
+    OrderRequest,
+    OrderSnapshot,
+    PositionSnapshot,
+    TradeSnapshot,
+)
+
+RECORDING_VERSION = 1
+
+_MODELS: dict[str, type] = {
+    cls.__name__: cls
+    for cls in (
+        AccountFundsSnapshot,
+        CancelReplaceResult,
+        MarketSnapshot,
+        OrderRequest,
+        OrderSnapshot,
+        PositionSnapshot,
+        TradeSnapshot,
+    )
+}
+
+
+class ReplayedError(RuntimeError):
+    """录制时的异常在回放中重新抛出；保留原异常类名与错误分类。"""
+
+    def __init__(self, message: str, original_type: str, error_class: str) -> None:
+        super().__init__(message)
+        self.original_type = original_type
+        self.error_class = error_class
+
+
+class ReplayExhaustedError(RuntimeError):
+    """录制中已无该方法的后续响应。"""
+
+    error_class = "unknown"
+
+
+def encode_value(value: Any) -> Any:
+    """把适配器返回值编码为可 JSON 序列化的结构，数据类与异常带类型标记以便原样还原。"""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, datetime):
+        return {"$dt": value.timestamp()}
+    if isinstance(value, BaseException):
+        attrs = {k: v for k, v in vars(value).items() if isinstance(v, (bool, int, float, str))}
+        return {"$exc": type(value).__name__, "msg": str(value), "class": classify_error(value), "attrs": attrs}
+    if dataclasses.is_dataclass(value):
+        out = {"$": type(value).__name__}
+        for field in dataclasses.fields(value):
+            out[field.name] = encode_value(getattr(value, field.name))
+        return out
+    if isinstance(value, (list, tuple)):
+        return [encode_value(item) for item in value]
+    if isinstance(value, dict):
+        return {str(k): encode_value(v) for k, v in value.items()}
+    return str(value)
+
+
+def decode_value(value: Any) -> Any:
+    if isinstance(value, list):
+        return [decode_value(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if "$dt" in value:
+        return datetime.fromtimestamp(value["$dt"], tz=timezone.utc)
+    if "$exc" in value:
+        return _decode_exception(value)
+    model = _MODELS.get(value.get("$", ""))
+    if model is not None:
+        return model(**{k: decode_value(v) for k, v in value.items() if k != "$"})
+    return {k: decode_value(v) for k, v in value.items()}
+
+
+def _decode_exception(value: dict[str, Any]) -> Exception:
+    name, message, attrs = value["$exc"], value.get("msg", ""), value.get("attrs") or {}
+    if name == PositionDustError.__name__ and {"symbol", "remaining_size", "min_close_size"} <= attrs.keys():
+        # 引擎按类型识别残仓异常，需还原为原类型。
+        return PositionDustError(attrs["symbol"], attrs["remaining_size"], attrs["min_close_size"])
+    if name in {"TimeoutError", "CancelledError"}:
+        return TimeoutError(message)
+    return ReplayedError(message, name, value.get("class", "unknown"))
+
+
+def _open_log(path: Path, mode: str) -> IO[bytes]:
+    if path.suffix == ".gz":
+        return gzip.open(path, mode + "b", compresslevel=1)
+    return open(path, mode + "b")
+
+
+class RecordingAdapter(ExchangeAdapter):
+    """录制包装：逐次记录调用参数、响应或异常、起始偏移与耗时，写入按行的 JSON 日志（.gz 后缀时压缩）。"""
+
+    def __init__(self, inner: ExchangeAdapter, path: str | Path, *, flush_every: int = 256) -> None:
+        self._inner = inner
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = _open_log(self.path, "w")
+        self._flush_every = max(1, flush_every)
+        self._pending = 0
+        self._origin = time.monotonic()
+        self.records = 0
+        self._write({"v": RECORDING_VERSION, "started_at": time.time()})
+
+    @property
+    def inner(self) -> ExchangeAdapter:
+        return self._inner
+
+    def _write(self, record: dict[str, Any]) -> None:
+        if self._file.closed:
+            return
+        self._file.write(orjson.dumps(record) + b"\n")
+        self._pending += 1
+        if self._pending >= self._flush_every:
+            self._file.flush()
+            self._pending = 0
+
+    async def _call(self, method: str, args: dict[str, Any], call: Callable[[], Awaitable[Any]]) -> Any:
+        started = time.monotonic()
+        record: dict[str, Any] = {"m": method, "t": round(started - self._origin, 6), "a": encode_value(args)}
+        try:
+            result = await call()
+        except Exception as exc:
+            record["e"] = encode_value(exc)
+            raise
+        else:
+            record["r"] = encode_value(result)
+            return result
+        finally:
+            record["d"] = round(time.monotonic() - started, 6)
+            self._write(record)
+            self.records += 1
+
+    async def ping(self) -> bool:
+        return await self._call("ping", {}, self._inner.ping)
+
+    async def fetch_market_snapshot(self, symbol: str) -> MarketSnapshot:
+        return await self._call("fetch_market_snapshot", {"symbol": symbol}, lambda: self._inner.fetch_market_snapshot(symbol))
+
+    async def fetch_equity(self) -> float:
+        return await self._call("fetch_equity", {}, self._inner.fetch_equity)
+
+    async def fetch_account_funds(self) -> AccountFundsSnapshot:
+        return await self._call("fetch_account_funds", {}, self._inner.fetch_account_funds)
+
+    async def fetch_position(self, symbol: str) -> PositionSnapshot:
+        return await self._call("fetch_position", {"symbol": symbol}, lambda: self._inner.fetch_position(symbol))
+
+    async def fetch_open_orders(self, symbol: str) -> list[OrderSnapshot]:
+        return await self._call("fetch_open_orders", {"symbol": symbol}, lambda: self._inner.fetch_open_orders(symbol))
+
+    async def fetch_recent_trades(self, symbol: str, limit: int = 50) -> list[TradeSnapshot]:
+        return await self._call(
+            "fetch_recent_trades",
+            {"symbol": symbol, "limit": limit},
+            lambda: self._inner.fetch_recent_trades(symbol, limit),
+        )
+
+    async def place_limit_order(
+        self,
+        symbol: str,
+        side: str,
+        price: float,
+        size: float,
+        post_only: bool,
+        client_order_id: str,
+    ) -> OrderSnapshot:
+        args = {
+            "symbol": symbol,
+            "side": side,
+            "price": price,
+            "size": size,
+            "post_only": post_only,
+            "client_order_id": client_order_id,
+        }
+        return await self._call("place_limit_order", args, lambda: self._inner.place_limit_order(**args))
+
+    async def cancel_order(self, symbol: str, order_id: str) -> None:
+        await self._call(
+            "cancel_order", {"symbol": symbol, "order_id": order_id}, lambda: self._inner.cancel_order(symbol, order_id)
+        )
+
+    async def cancel_all_orders(self, symbol: str) -> None:
+        await self._call("cancel_all_orders", {"symbol": symbol}, lambda: self._inner.cancel_all_orders(symbol))
+
+    async def place_limit_orders(self, symbol: str, requests: list[OrderRequest]) -> list[OrderSnapshot | Exception]:
+        return await self._call(
+            "place_limit_orders",
+            {"symbol": symbol, "requests": requests},
+            lambda: self._inner.place_limit_orders(symbol, requests),
+        )
+
+    async def cancel_orders(self, symbol: str, order_ids: list[str]) -> list[Exception | None]:
+        return await self._call(
+            "cancel_orders",
+            {"symbol": symbol, "order_ids": order_ids},
+            lambda: self._inner.cancel_orders(symbol, order_ids),
+        )
+
+    async def cancel_replace_order(self, symbol: str, cancel_order_id: str, request: OrderRequest) -> CancelReplaceResult:
+        return await self._call(
+            "cancel_replace_order",
+            {"symbol": symbol, "cancel_order_id": cancel_order_id, "request": request},
+            lambda: self._inner.cancel_replace_order(symbol, cancel_order_id, request),
+        )
+
+    async def close_position_taker(
+        self,
+        symbol: str,
+        side: str,
+        size: float,
+        reduce_only: bool = True,
+    ) -> OrderSnapshot:
+        return await self._call(
+            "close_position_taker",
+            {"symbol": symbol, "side": side, "size": size, "reduce_only": reduce_only},
+            lambda: self._inner.close_position_taker(symbol, side, size, reduce_only),
+        )
+
+    async def flatten_position_taker(self, symbol: str) -> None:
+        await self._call("flatten_position_taker", {"symbol": symbol}, lambda: self._inner.flatten_position_taker(symbol))
+
+    def market_stream_active(self, symbol: str) -> bool:
+        active = self._inner.market_stream_active(symbol)
+        self._write({"m": "market_stream_active", "t": round(time.monotonic() - self._origin, 6), "r": active, "d": 0.0})
+        return active
+
+    async def wait_market_update(self, symbol: str, timeout: float) -> MarketSnapshot | None:
+        return await self._call(
+            "wait_market_update",
+            {"symbol": symbol, "timeout": timeout},
+            lambda: self._inner.wait_market_update(symbol, timeout),
+        )
+
+    def executor_stats(self) -> dict[str, dict]:
+        return self._inner.executor_stats()
+
+    async def close(self) -> None:
+        try:
+            await self._inner.close()
+        finally:
+            if not self._file.closed:
+                self._file.close()
+
+
+class ReplayAdapter(ExchangeAdapter):
+    """回放录制日志：每个方法按录制顺序依次返回原响应；speed>0 时按原始时间轴（可加速）等待，0 为不等待。"""
+
+    _CLEANUP_METHODS = frozenset({"cancel_order", "cancel_all_orders", "cancel_orders", "flatten_position_taker"})
+
+    def __init__(self, path: str | Path, *, speed: float = 1.0) -> None:
+        self.path = Path(path)
+        self._speed = max(0.0, float(speed))
+        self._queues: dict[str, deque[dict[str, Any]]] = {}
+        self._logger = logging.getLogger("exchange.replay")
+        total = 0
+        with _open_log(self.path, "r") as fh:
+            header = orjson.loads(fh.readline() or b"{}")
+            if header.get("v") != RECORDING_VERSION:
+                raise ValueError(f"不支持的录制版本: {header.get('v')}")
+            for line in fh:
+                if not line.strip():
+                    continue
+                record = orjson.loads(line)
+                self._queues.setdefault(record["m"], deque()).append(record)
+                total += 1
+        self.total_records = total
+        self.replayed = 0
+        self.finished = asyncio.Event()
+        self._origin: float | None = None
+
+    @property
+    def remaining(self) -> int:
+        return self.total_records - self.replayed
+
+    def _next(self, method: str) -> dict[str, Any] | None:
+        queue = self._queues.get(method)
+        if not queue:
+            # 引擎请求了录制中已用尽的方法，后续无法再忠实回放。
+            self.finished.set()
+            return None
+        record = queue.popleft()
+        self.replayed += 1
+        if self.remaining <= 0:
+            self.finished.set()
+        return record
+
+    async def _replay(self, method: str, request: OrderRequest | str | None = None) -> Any:
+        record = self._next(method)
+        if record is None:
+            if method in self._CLEANUP_METHODS:
+                # 录制结束后交易所视为已撤单，便于引擎正常停机。
+                return None
+            raise ReplayExhaustedError(f"录制中已无 {method} 的响应")
+        if self._speed > 0:
+            loop = asyncio.get_running_loop()
+            if self._origin is None:
+                self._origin = loop.time() - record["t"] / self._speed
+            due = self._origin + (record["t"] + record.get("d", 0.0)) / self._speed
+            delay = due - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        if "e" in record:
+            raise decode_value(record["e"])
+        result = decode_value(record.get("r"))
+        return self._with_client_order_id(result, request)
+
+    @staticmethod
+    def _with_client_order_id(result: Any, request: Any) -> Any:
+        # 引擎每次生成新的 client_order_id，回放结果沿用本次请求的值，保证挂单跟踪的双索引一致。
+        if isinstance(result, OrderSnapshot) and isinstance(request, str):
+            result.client_order_id = request
+        elif isinstance(result, CancelReplaceResult) and isinstance(request, OrderRequest) and result.order is not None:
+            result.order.client_order_id = request.client_order_id
+        elif isinstance(result, list) and isinstance(request, list):
+            for item, req in zip(result, request):
+                if isinstance(item, OrderSnapshot):
+                    item.client_order_id = req.client_order_id
+        return result
+
+    async def ping(self) -> bool:
+        return await self._replay("ping")
+
+    async def fetch_market_snapshot(self, symbol: str) -> MarketSnapshot:
+        return await self._replay("fetch_market_snapshot")
+
+    async def fetch_equity(self) -> float:
+        return await self._replay("fetch_equity")
+
+    async def fetch_account_funds(self) -> AccountFundsSnapshot:
+        return await self._replay("fetch_account_funds")
+
+    async def fetch_position(self, symbol: str) -> PositionSnapshot:
+        try:
+            return await self._replay("fetch_position")
+        except ReplayExhaustedError:
+            if not self.finished.is_set():
+                raise
+            return PositionSnapshot(symbol=symbol, base_position=0.0, notional=0.0)
+
+    async def fetch_open_orders(self, symbol: str) -> list[OrderSnapshot]:
+        return await self._replay("fetch_open_orders")
+
+    async def fetch_recent_trades(self, symbol: str, limit: int = 50) -> list[TradeSnapshot]:
+        return await self._replay("fetch_recent_trades")
+
+    async def place_limit_order(
+        self,
+        symbol: str,
+        side: str,
+        price: float,
+        size: float,
+        post_only: bool,
+        client_order_id: str,
+    ) -> OrderSnapshot:
+        return await self._replay("place_limit_order", client_order_id)
+
+    async def cancel_order(self, symbol: str, order_id: str) -> None:
+        await self._replay("cancel_order")
+
+    async def cancel_all_orders(self, symbol: str) -> None:
+        await self._replay("cancel_all_orders")
+
+    async def place_limit_orders(self, symbol: str, requests: list[OrderRequest]) -> list[OrderSnapshot | Exception]:
+        return await self._replay("place_limit_orders", requests)
+
+    async def cancel_orders(self, symbol: str, order_ids: list[str]) -> list[Exception | None]:
+        result = await self._replay("cancel_orders")
+        return result if result is not None else [None] * len(order_ids)
+
+    async def cancel_replace_order(self, symbol: str, cancel_order_id: str, request: OrderRequest) -> CancelReplaceResult:
+        return await self._replay("cancel_replace_order", request)
+
+    async def close_position_taker(
+        self,
+        symbol: str,
+        side: str,
+        size: float,
+        reduce_only: bool = True,
+    ) -> OrderSnapshot:
+        return await self._replay("close_position_taker")
+
+    async def flatten_position_taker(self, symbol: str) -> None:
+        await self._replay("flatten_position_taker")
+
+    def market_stream_active(self, symbol: str) -> bool:
+        record = self._next("market_stream_active")
+        return bool(record and record.get("r"))
+
+    async def wait_market_update(self, symbol: str, timeout: float) -> MarketSnapshot | None:
+        try:
+            return await self._replay("wait_market_update")
+        except ReplayExhaustedError:
+            return None
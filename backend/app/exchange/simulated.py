@@ -0,0 +1,480 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import math
+import random
+import time
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Protocol
+
+from app.backtest.engine import PricePoint, load_price_points
+from app.core.settings import Settings
+from app.exchange.base import ExchangeAdapter, PositionDustError
+from app.models import AccountFundsSnapshot, MarketSnapshot, OrderSnapshot, PositionSnapshot, TradeSnapshot
+
+
+class OrderRejectedError(RuntimeError):
+    """模拟撮合拒单（post-only 会吃单、reduce-only 无可减仓位等）。"""
+
+    error_class = "rejected"
+
+
+class PriceProcess(Protocol):
+    """按时间给出中间价的价格过程。"""
+
+    def mid_at(self, ts: float) -> float: ...
+
+
+class SyntheticPriceProcess:
+    """几何布朗运动价格过程：按真实经过的时间步进，种子固定时路径可复现。"""
+
+    def __init__(self, start_price: float, volatility_per_sqrt_sec: float, seed: int | None = None) -> None:
+        self._mid = float(start_price)
+        self._sigma = max(0.0, float(volatility_per_sqrt_sec))
+        self._rng = random.Random(seed)
+        self._last_ts: float | None = None
+
+    def mid_at(self, ts: float) -> float:
+        if self._last_ts is not None and ts > self._last_ts and self._sigma > 0:
+            dt = ts - self._last_ts
+            shock = self._rng.gauss(0.0, self._sigma * math.sqrt(dt))
+            self._mid *= math.exp(shock - 0.5 * self._sigma * self._sigma * dt)
+        if self._last_ts is None or ts > self._last_ts:
+            self._last_ts = ts
+        return self._mid
+
+
+class RecordedPriceProcess:
+    """回放历史中间价（与回测共用 CSV 格式），可加速，播完后从头循环。"""
+
+    def __init__(self, points: list[PricePoint], speed: float = 1.0) -> None:
+        if len(points) < 2:
+            raise ValueError("回放价格至少需要 2 条记录")
+        base = points[0].timestamp.timestamp()
+        self._offsets = [p.timestamp.timestamp() - base for p in points]
+        self._mids = [p.mid for p in points]
+        self._span = max(self._offsets[-1], 1e-9)
+        self._speed = max(1e-9, float(speed))
+        self._origin: float | None = None
+
+    @classmethod
+    def from_csv(cls, path: str | Path, speed: float = 1.0) -> RecordedPriceProcess:
+        return cls(load_price_points(Path(path)), speed)
+
+    def mid_at(self, ts: float) -> float:
+        if self._origin is None:
+            self._origin = ts
+        offset = ((ts - self._origin) * self._speed) % self._span
+        idx = bisect_right(self._offsets, offset) - 1
+        return self._mids[max(0, idx)]
+
+
+@dataclass(slots=True)
+class SimulatedVenueConfig:
+    start_price: float = 600.0
+    volatility_per_sqrt_sec: float = 0.0002
+    spread_bps: float = 2.0
+    tick_size: float = 0.01
+    min_size: float = 0.001
+    taker_rate_per_sec: float = 2.0
+    taker_size_base: float = 0.05
+    maker_fee_bps: float = -0.5
+    taker_fee_bps: float = 4.5
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    initial_usdt: float = 10_000.0
+    leverage: float = 10.0
+    seed: int | None = None
+    price_file: str = ""
+    price_speed: float = 1.0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> SimulatedVenueConfig:
+        return cls(
+            start_price=settings.sim_start_price,
+            volatility_per_sqrt_sec=settings.sim_volatility_per_sqrt_sec,
+            spread_bps=settings.sim_spread_bps,
+            tick_size=settings.sim_tick_size,
+            min_size=settings.sim_min_size,
+            taker_rate_per_sec=settings.sim_taker_rate_per_sec,
+            taker_size_base=settings.sim_taker_size_base,
+            maker_fee_bps=settings.sim_maker_fee_bps,
+            taker_fee_bps=settings.sim_taker_fee_bps,
+            latency_ms=settings.sim_latency_ms,
+            jitter_ms=settings.sim_jitter_ms,
+            initial_usdt=settings.sim_initial_usdt,
+            seed=settings.sim_seed if settings.sim_seed >= 0 else None,
+            price_file=settings.sim_price_file,
+            price_speed=settings.sim_price_speed,
+        )
+
+
+@dataclass(slots=True)
+class _RestingOrder:
+    order_id: str
+    client_order_id: str
+    side: str
+    price: float
+    remaining: float
+    created_at: datetime
+
+
+@dataclass(slots=True)
+class _Fill:
+    order: _RestingOrder
+    price: float
+    size: float
+
+
+class MatchingBook:
+    """本方挂单簿：价格优先、同价按时间先后（FIFO）成交。"""
+
+    def __init__(self) -> None:
+        # 价位升序；买方最优价在末尾，卖方最优价在开头。
+        self._prices: dict[str, list[float]] = {"buy": [], "sell": []}
+        self._levels: dict[str, dict[float, deque[_RestingOrder]]] = {"buy": {}, "sell": {}}
+        self._orders: dict[str, _RestingOrder] = {}
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def orders(self) -> list[_RestingOrder]:
+        return list(self._orders.values())
+
+    def best(self, side: str) -> float | None:
+        prices = self._prices[side]
+        if not prices:
+            return None
+        return prices[-1] if side == "buy" else prices[0]
+
+    def add(self, order: _RestingOrder) -> None:
+        levels = self._levels[order.side]
+        level = levels.get(order.price)
+        if level is None:
+            level = levels[order.price] = deque()
+            insort(self._prices[order.side], order.price)
+        level.append(order)
+        self._orders[order.order_id] = order
+
+    def cancel(self, order_id: str) -> _RestingOrder | None:
+        order = self._orders.pop(order_id, None)
+        if order is not None:
+            level = self._levels[order.side][order.price]
+            level.remove(order)
+            if not level:
+                self._drop_level(order.side, order.price)
+        return order
+
+    def match(self, resting_side: str, limit_price: float, size: float) -> list[_Fill]:
+        """对手方吃 resting_side 一侧的挂单，至多成交 size（inf 表示扫到 limit_price 为止）。"""
+        fills: list[_Fill] = []
+        prices = self._prices[resting_side]
+        levels = self._levels[resting_side]
+        while size > 1e-12 and prices:
+            price = prices[-1] if resting_side == "buy" else prices[0]
+            if (resting_side == "buy" and price < limit_price) or (resting_side == "sell" and price > limit_price):
+                break
+            level = levels[price]
+            while size > 1e-12 and level:
+                order = level[0]
+                qty = min(order.remaining, size)
+                order.remaining -= qty
+                size -= qty
+                fills.append(_Fill(order=order, price=price, size=qty))
+                if order.remaining <= 1e-12:
+                    level.popleft()
+                    self._orders.pop(order.order_id, None)
+            if not level:
+                self._drop_level(resting_side, price)
+        return fills
+
+    def _drop_level(self, side: str, price: float) -> None:
+        del self._levels[side][price]
+        prices = self._prices[side]
+        del prices[bisect_left(prices, price)]
+
+
+class SimulatedExchangeAdapter(ExchangeAdapter):
+    """进程内模拟交易所：价格过程驱动外部盘口与随机主动成交，本方挂单按价格-时间优先撮合。"""
+
+    def __init__(
+        self,
+        config: SimulatedVenueConfig | None = None,
+        *,
+        price_process: PriceProcess | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.config = config or SimulatedVenueConfig()
+        cfg = self.config
+        if price_process is None:
+            price_process = (
+                RecordedPriceProcess.from_csv(cfg.price_file, cfg.price_speed)
+                if cfg.price_file
+                else SyntheticPriceProcess(cfg.start_price, cfg.volatility_per_sqrt_sec, cfg.seed)
+            )
+        self._prices = price_process
+        self._clock = clock
+        self._rng = random.Random(cfg.seed)
+        self._book = MatchingBook()
+        self._ids = itertools.count(1)
+        self._trades: deque[TradeSnapshot] = deque(maxlen=1000)
+        self._cash = float(cfg.initial_usdt)
+        self._position = 0.0
+        self._fees = 0.0
+        self._now = clock()
+        self._mid = self._prices.mid_at(self._now)
+        self._recent_taker_volume: deque[tuple[float, float]] = deque()
+
+    # ---- 撮合与行情推进 ----
+
+    def _advance(self) -> None:
+        now = self._clock()
+        dt = now - self._now
+        if dt <= 0:
+            return
+        self._now = now
+        self._mid = self._prices.mid_at(now)
+        bid, ask = self._touch()
+        # 外部盘口穿过本方挂单：按挂单价成交（被动成交）。
+        self._settle(self._book.match("buy", ask, math.inf))
+        self._settle(self._book.match("sell", bid, math.inf))
+        # 随机主动单先吃位于或优于外部最优价的本方挂单，剩余部分视为与外部流动性成交。
+        cfg = self.config
+        for _ in range(self._poisson(cfg.taker_rate_per_sec * dt)):
+            size = self._rng.expovariate(1.0 / max(cfg.taker_size_base, 1e-12))
+            self._recent_taker_volume.append((now, size))
+            if self._rng.random() < 0.5:
+                self._settle(self._book.match("sell", ask, size))
+            else:
+                self._settle(self._book.match("buy", bid, size))
+        cutoff = now - 60.0
+        while self._recent_taker_volume and self._recent_taker_volume[0][0] < cutoff:
+            self._recent_taker_volume.popleft()
+
+    def _touch(self) -> tuple[float, float]:
+        half = self._mid * self.config.spread_bps / 20000.0
+        tick = self.config.tick_size
+        bid = math.floor((self._mid - half) / tick) * tick
+        ask = math.ceil((self._mid + half) / tick) * tick
+        if ask <= bid:
+            ask = bid + tick
+        return round(bid, 10), round(ask, 10)
+
+    def _poisson(self, lam: float) -> int:
+        if lam <= 0:
+            return 0
+        # Knuth 算法；lam 很大时退化为正态近似。
+        if lam > 30:
+            return max(0, int(round(self._rng.gauss(lam, math.sqrt(lam)))))
+        threshold = math.exp(-lam)
+        k, p = 0, 1.0
+        while True:
+            p *= self._rng.random()
+            if p <= threshold:
+                return k
+            k += 1
+
+    def _settle(self, fills: list[_Fill]) -> None:
+        for fill in fills:
+            self._book_trade(fill.order.side, fill.price, fill.size, self.config.maker_fee_bps, fill.order.order_id)
+
+    def _book_trade(self, side: str, price: float, size: float, fee_bps: float, order_id: str) -> TradeSnapshot:
+        notional = price * size
+        fee = notional * fee_bps / 10000.0
+        signed = size if side == "buy" else -size
+        self._position += signed
+        self._cash -= signed * price + fee
+        self._fees += fee
+        trade = TradeSnapshot(
+            trade_id=f"sim-t{next(self._ids)}",
+            side="buy" if side == "buy" else "sell",
+            price=price,
+            size=size,
+            fee=fee,
+            created_at=self._ts(),
+            order_id=order_id,
+        )
+        self._trades.append(trade)
+        return trade
+
+    async def _latency(self) -> None:
+        cfg = self.config
+        delay_ms = cfg.latency_ms + (self._rng.uniform(-cfg.jitter_ms, cfg.jitter_ms) if cfg.jitter_ms > 0 else 0.0)
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000.0)
+
+    def _ts(self) -> datetime:
+        return datetime.fromtimestamp(self._now, tz=timezone.utc)
+
+    def _round_price(self, price: float) -> float:
+        tick = self.config.tick_size
+        return round(round(price / tick) * tick, 10)
+
+    def _snapshot(self, order: _RestingOrder, status: str = "open") -> OrderSnapshot:
+        return OrderSnapshot(
+            order_id=order.order_id,
+            side="buy" if order.side == "buy" else "sell",
+            price=order.price,
+            size=order.remaining,
+            status=status,
+            created_at=order.created_at,
+            client_order_id=order.client_order_id,
+        )
+
+    # ---- ExchangeAdapter ----
+
+    async def ping(self) -> bool:
+        await self._latency()
+        return True
+
+    async def fetch_market_snapshot(self, symbol: str) -> MarketSnapshot:
+        await self._latency()
+        self._advance()
+        bid, ask = self._touch()
+        volume = sum(size for _, size in self._recent_taker_volume)
+        return MarketSnapshot(
+            symbol=symbol,
+            bid=bid,
+            ask=ask,
+            mid=(bid + ask) / 2,
+            depth_score=1.0,
+            trade_intensity=max(0.2, min(3.5, volume / max(self.config.taker_size_base * 60.0, 1e-9))),
+            timestamp=self._ts(),
+        )
+
+    async def fetch_equity(self) -> float:
+        return (await self.fetch_account_funds()).equity_usdt
+
+    async def fetch_account_funds(self) -> AccountFundsSnapshot:
+        await self._latency()
+        self._advance()
+        equity = self._cash + self._position * self._mid
+        resting = sum(o.price * o.remaining for o in self._book.orders())
+        used = (abs(self._position) * self._mid + resting) / max(self.config.leverage, 1.0)
+        return AccountFundsSnapshot(
+            equity_usdt=equity,
+            free_usdt=max(0.0, equity - used),
+            used_usdt=used,
+            source="simulated",
+        )
+
+    async def fetch_position(self, symbol: str) -> PositionSnapshot:
+        await self._latency()
+        self._advance()
+        return PositionSnapshot(symbol=symbol, base_position=self._position, notional=self._position * self._mid)
+
+    async def fetch_open_orders(self, symbol: str) -> list[OrderSnapshot]:
+        await self._latency()
+        self._advance()
+        return [self._snapshot(order) for order in self._book.orders()]
+
+    async def fetch_recent_trades(self, symbol: str, limit: int = 50) -> list[TradeSnapshot]:
+        await self._latency()
+        self._advance()
+        return list(self._trades)[-limit:]
+
+    async def place_limit_order(
+        self,
+        symbol: str,
+        side: str,
+        price: float,
+        size: float,
+        post_only: bool,
+        client_order_id: str,
+    ) -> OrderSnapshot:
+        await self._latency()
+        self._advance()
+        if side not in {"buy", "sell"}:
+            raise ValueError(f"未知方向: {side}")
+        price = self._round_price(price)
+        if price <= 0:
+            raise ValueError(f"价格无效: {price}")
+        if size + 1e-12 < self.config.min_size:
+            raise ValueError(f"下单数量 {size} 小于最小下单量 {self.config.min_size}")
+        bid, ask = self._touch()
+        crosses = price >= ask if side == "buy" else price <= bid
+        if crosses and post_only:
+            raise OrderRejectedError(f"post_only_would_take side={side} price={price} touch={bid}/{ask}")
+        order = _RestingOrder(
+            order_id=f"sim-o{next(self._ids)}",
+            client_order_id=client_order_id,
+            side=side,
+            price=price,
+            remaining=float(size),
+            created_at=self._ts(),
+        )
+        if crosses:
+            # 非 post-only 且可成交：模拟盘口不建模深度，按外部最优价一次吃满全部数量，不留挂单。
+            fill_price = ask if side == "buy" else bid
+            self._book_trade(side, fill_price, order.remaining, self.config.taker_fee_bps, order.order_id)
+            return self._snapshot(order, status="filled")
+        self._book.add(order)
+        return self._snapshot(order)
+
+    async def cancel_order(self, symbol: str, order_id: str) -> None:
+        await self._latency()
+        self._advance()
+        # 已成交或不存在的订单与交易所行为一致：撤单不确认但不报错。
+        self._book.cancel(order_id)
+
+    async def cancel_all_orders(self, symbol: str) -> None:
+        await self._latency()
+        self._advance()
+        for order in self._book.orders():
+            self._book.cancel(order.order_id)
+
+    async def close_position_taker(
+        self,
+        symbol: str,
+        side: str,
+        size: float,
+        reduce_only: bool = True,
+    ) -> OrderSnapshot:
+        """IOC 市价单：按外部最优价一次成交；reduce_only 时截断到当前可减仓位。"""
+        await self._latency()
+        self._advance()
+        amount = float(size)
+        if reduce_only:
+            reducible = self._position if side == "sell" else -self._position
+            if reducible <= 1e-12:
+                raise OrderRejectedError(f"reduce_only_no_position side={side} position={self._position}")
+            amount = min(amount, reducible)
+        bid, ask = self._touch()
+        order_id = f"sim-o{next(self._ids)}"
+        price = ask if side == "buy" else bid
+        self._book_trade(side, price, amount, self.config.taker_fee_bps, order_id)
+        return OrderSnapshot(
+            order_id=order_id,
+            side="buy" if side == "buy" else "sell",
+            price=price,
+            size=amount,
+            status="filled",
+            created_at=self._ts(),
+        )
+
+    async def flatten_position_taker(self, symbol: str) -> None:
+        pos = await self.fetch_position(symbol)
+        size = abs(pos.base_position)
+        if size <= 1e-12:
+            return
+        if size + 1e-12 < self.config.min_size:
+            raise PositionDustError(symbol=symbol, remaining_size=size, min_close_size=self.config.min_size)
+        side = "sell" if pos.base_position > 0 else "buy"
+        await self.close_position_taker(symbol=symbol, side=side, size=size, reduce_only=True)
+
+    def venue_stats(self) -> dict[str, float]:
+        """模拟账户累计状态，便于压测后核对成交与费用。"""
+        return {
+            "mid": self._mid,
+            "position": self._position,
+            "cash": self._cash,
+            "fees": self._fees,
+            "open_orders": len(self._book),
+            "trades": len(self._trades),
+        }
@@ -1,5 +1,6 @@
 ﻿from __future__ import annotations
 
+import asyncio
 import logging
 from pathlib import Path
 
@@ -8,16 +9,16 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 
-from app.api import auth, backtest, config, engine, monitor, ws
+from app.api import auth, backtest, config, engine, monitor, prometheus, ws
 from app.backtest.service import BacktestService
-from app.core.container import AppContainer
+from app.core.container import AppContainer, build_engine_stack
 from app.core.settings import get_settings
-from app.engine.strategy_engine import StrategyEngine
-from app.exchange.factory import build_exchange_adapter
+from app.engine.process import EngineProcessClient
 from app.services.alerting import AlertService
 from app.services.event_bus import EventBus
 from app.services.exchange_config import ExchangeConfigStore
-from app.services.monitoring import MonitoringService
+from app.services.metrics_history import MetricsHistory
+from app.services.prometheus import register_alert_metrics, register_stream_metrics
 from app.services.runtime_config import RuntimeConfigStore
 from app.services.telegram_config import TelegramConfigStore
 
@@ -42,39 +43,45 @@ def create_app() -> FastAPI:
     config_store = RuntimeConfigStore(settings.runtime_config_file)
     exchange_config_store = ExchangeConfigStore(settings.exchange_config_file, settings)
     telegram_config_store = TelegramConfigStore(settings.telegram_config_file, settings)
-    exchange_cfg = exchange_config_store.get()
-    monitor_service = MonitoringService(max_points=1200)
-    event_bus = EventBus(queue_size=settings.stream_queue_size)
-    alert_service = AlertService(telegram_config_store)
     backtest_service = BacktestService(settings)
-    adapter = build_exchange_adapter(
-        settings,
-        grvt_env=exchange_cfg.grvt_env,
-        grvt_api_key=exchange_cfg.grvt_api_key,
-        grvt_api_secret=exchange_cfg.grvt_api_secret,
-        grvt_trading_account_id=exchange_cfg.grvt_trading_account_id,
-    )
-
-    strategy_engine = StrategyEngine(
-        adapter=adapter,
-        config_store=config_store,
-        monitor=monitor_service,
-        event_bus=event_bus,
-        alert_service=alert_service,
-    )
-
-    app.state.container = AppContainer(
-        settings=settings,
-        adapter=adapter,
-        config_store=config_store,
-        exchange_config_store=exchange_config_store,
-        telegram_config_store=telegram_config_store,
-        monitor=monitor_service,
-        event_bus=event_bus,
-        alert_service=alert_service,
-        backtest_service=backtest_service,
-        engine=strategy_engine,
-    )
+    if settings.engine_process_enabled:
+        # 引擎运行在独立进程：API 进程只保留配置存储、WS 事件总线与监控镜像。
+        event_bus = EventBus(queue_size=settings.stream_queue_size)
+        engine_process = EngineProcessClient(settings, event_bus)
+        app.state.container = AppContainer(
+            settings=settings,
+            adapter=None,
+            config_store=config_store,
+            exchange_config_store=exchange_config_store,
+            telegram_config_store=telegram_config_store,
+            monitor=engine_process.monitor,
+            event_bus=event_bus,
+            alert_service=AlertService(telegram_config_store),
+            backtest_service=backtest_service,
+            engine=engine_process,
+            history=MetricsHistory(settings.tick_journal_dir) if settings.tick_journal_enabled else None,
+            engine_process=engine_process,
+        )
+    else:
+        stack = build_engine_stack(settings, config_store, exchange_config_store, telegram_config_store)
+        app.state.container = AppContainer(
+            settings=settings,
+            adapter=stack.adapter,
+            config_store=config_store,
+            exchange_config_store=exchange_config_store,
+            telegram_config_store=telegram_config_store,
+            monitor=stack.monitor,
+            event_bus=stack.event_bus,
+            alert_service=stack.alert_service,
+            backtest_service=backtest_service,
+            engine=stack.engine,
+            journal=stack.journal,
+            history=stack.history,
+            adapter_telemetry=stack.adapter_telemetry,
+            loop_monitor=stack.loop_monitor,
+        )
+        register_alert_metrics(stack.alert_service)
+    register_stream_metrics(app.state.container.event_bus)
 
     app.include_router(auth.router)
     app.include_router(engine.router)
@@ -82,6 +89,7 @@ def create_app() -> FastAPI:
     app.include_router(config.router)
     app.include_router(backtest.router)
     app.include_router(ws.router)
+    app.include_router(prometheus.router)
 
     frontend_dist = Path(__file__).resolve().parents[2] / "frontend" / "dist"
     if frontend_dist.exists():
@@ -95,10 +103,28 @@ def create_app() -> FastAPI:
     async def healthz() -> dict:
         return {"ok": True}
 
+    @app.on_event("startup")
+    async def on_startup() -> None:
+        container = app.state.container
+        if container.engine_process is not None:
+            await container.engine_process.launch()
+        elif container.loop_monitor is not None:
+            container.loop_monitor.start()
+
     @app.on_event("shutdown")
     async def on_shutdown() -> None:
-        if app.state.container.engine.mode != "idle":
-            await app.state.container.engine.stop(reason="shutdown")
+        container = app.state.container
+        if container.engine_process is not None:
+            await container.engine_process.close()
+        else:
+            if container.engine.mode != "idle":
+                await container.engine.stop(reason="shutdown")
+            await container.adapter.close()
+        await container.alert_service.aclose()
+        if container.journal is not None:
+            await asyncio.to_thread(container.journal.close)
+        if container.loop_monitor is not None:
+            await container.loop_monitor.stop()
 
     return app
 
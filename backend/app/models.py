@@ -39,6 +39,25 @@ class OrderSnapshot:
     size: float
     status: str
     created_at: datetime
+    client_order_id: str | None = None
+
+
+@dataclass(slots=True)
+class OrderRequest:
+    side: Literal["buy", "sell"]
+    price: float
+    size: float
+    client_order_id: str
+    post_only: bool = True
+
+
+@dataclass(slots=True)
+class CancelReplaceResult:
+    order: OrderSnapshot | None
+    place_error: Exception | None = None
+    cancel_error: Exception | None = None
+    # 新单失败时未发出撤单，旧单仍在交易所挂着。
+    cancel_skipped: bool = False
 
 
 @dataclass(slots=True)
@@ -50,6 +69,7 @@ class TradeSnapshot:
     fee: float
     created_at: datetime
     symbol: str | None = None
+    order_id: str | None = None
 
 
 @dataclass(slots=True)
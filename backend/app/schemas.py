@@ -63,8 +63,14 @@ class RuntimeConfig(BaseModel):
     order_ttl_sec: int = Field(default=20, ge=1, le=300)
     quote_interval_sec: float = Field(default=0.25, ge=0.2, le=10)
     min_order_age_before_requote_sec: float = Field(default=0.25, ge=0.0, le=60.0)
+    order_reconcile_interval_sec: float = Field(default=2.0, ge=0.2, le=300.0)
     min_order_size_base: float = Field(default=0.01, ge=0.000001)
 
+    quote_schedule_mode: Literal["fixed", "event"] = "fixed"
+    event_requote_threshold_bps: float = Field(default=0.5, ge=0.0, le=100.0)
+    event_min_interval_sec: float = Field(default=0.02, ge=0.0, le=5.0)
+    event_max_idle_sec: float = Field(default=2.0, ge=0.2, le=60.0)
+
     sigma_window_sec: int = Field(default=60, ge=10, le=600)
     depth_window_sec: int = Field(default=30, ge=5, le=300)
     trade_intensity_window_sec: int = Field(default=30, ge=5, le=300)
@@ -230,6 +236,14 @@ class TradeView(BaseModel):
     created_at: datetime
 
 
+class QuantileStats(BaseModel):
+    count: int = 0
+    p50: float = 0.0
+    p90: float = 0.0
+    p99: float = 0.0
+    p999: float = 0.0
+
+
 class MetricsSummary(BaseModel):
     timestamp: datetime
     mid_price: float
@@ -277,16 +291,123 @@ class TimeSeriesPoint(BaseModel):
     value: float
 
 
+class MetricsHistoryPoint(BaseModel):
+    t: datetime
+    value: float
+    min: float
+    max: float
+
+
+class MetricsHistoryResponse(BaseModel):
+    series: str
+    start: datetime
+    end: datetime
+    resolution: Literal["raw", "1s", "1m", "1h"]
+    method: Literal["minmax", "lttb"]
+    points: list[MetricsHistoryPoint]
+
+
 class MetricsResponse(BaseModel):
     summary: MetricsSummary
     series: dict[str, list[TimeSeriesPoint]]
 
 
+class ExecutorLaneStats(BaseModel):
+    max_workers: int
+    queue_depth: int
+    running: int
+    submitted: int
+    completed: int
+    wait_ms_last: float
+    wait_ms_max: float
+    wait_ms_avg: float
+
+
+class AlertQueueStats(BaseModel):
+    queue_depth: int
+    queue_capacity: int
+    enqueued: int
+    dropped: int
+    sent_alerts: int
+    sent_batches: int
+    failed_batches: int
+    last_error: str | None = None
+
+
+class StreamSubscriberStats(BaseModel):
+    id: int
+    label: str
+    pending: int
+    lag_ms: float
+    delivery_lag_ms_last: float
+    delivery_lag_ms_max: float
+    delivered: int
+    conflated: int
+    dropped: int
+
+
+class AdapterCallStats(BaseModel):
+    kind: Literal["method", "endpoint"]
+    name: str
+    calls: int
+    errors: int
+    retries: int
+    calls_1m: int
+    errors_1m: int
+    time_1m_ms: float
+    p50_ms: float
+    p99_ms: float
+    bytes_sent: int
+    bytes_received: int
+    errors_by_class: dict[str, int] = Field(default_factory=dict)
+    last_error_class: str | None = None
+    last_error: str | None = None
+
+
+class LoopLagStats(BaseModel):
+    interval_sec: float
+    samples: int
+    last_ms: float
+    max_ms: float
+
+
+class GcGenerationStats(BaseModel):
+    generation: int
+    collections: int
+    pause_ms: float
+    max_ms: float
+
+
+class LoopHealthStats(BaseModel):
+    enabled: bool
+    alert_ratio: float = 0.0
+    loop_lag: LoopLagStats | None = None
+    gc: list[GcGenerationStats] = Field(default_factory=list)
+
+
+class TickJournalStats(BaseModel):
+    enabled: bool
+    queue_depth: int = 0
+    written: int = 0
+    dropped: int = 0
+    segments_rotated: int = 0
+    segments_pruned: int = 0
+    active_segment: str | None = None
+    last_error: str | None = None
+
+
 class EngineCommandResponse(BaseModel):
     message: str
     mode: str
 
 
+class EngineProcessInfo(BaseModel):
+    dedicated: bool
+    pid: int
+    event_loop: str
+    cpu_affinity: list[int] = Field(default_factory=list)
+
+
 class StreamEnvelope(BaseModel):
     type: str
     ts: datetime
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import logging
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any
 
@@ -9,13 +12,43 @@ import httpx
 from app.services.telegram_config import TelegramConfigStore
 
 
+@dataclass(slots=True)
+class _PendingAlert:
+    bot_token: str
+    chat_id: str
+    text: str
+
+
 class AlertService:
-    """告警分发服务。"""
+    """告警分发服务：调用方只入队，后台 worker 合并突发告警并经共享连接池发送。"""
 
-    def __init__(self, telegram_config_store: TelegramConfigStore) -> None:
+    TELEGRAM_TEXT_LIMIT = 4000
+
+    def __init__(
+        self,
+        telegram_config_store: TelegramConfigStore,
+        *,
+        queue_size: int = 256,
+        batch_window_sec: float = 0.5,
+        max_batch: int = 20,
+        http_client: httpx.AsyncClient | None = None,
+    ) -> None:
         self._telegram_config_store = telegram_config_store
         self._logger = logging.getLogger("alert")
         self._last_sent_at: dict[str, datetime] = {}
+        self._queue: asyncio.Queue[_PendingAlert] = asyncio.Queue(maxsize=max(1, queue_size))
+        self._batch_window_sec = max(0.0, batch_window_sec)
+        self._max_batch = max(1, max_batch)
+        self._client = http_client
+        self._owns_client = http_client is None
+        self._worker: asyncio.Task | None = None
+        self._worker_loop: asyncio.AbstractEventLoop | None = None
+        self._enqueued = 0
+        self._dropped = 0
+        self._sent_batches = 0
+        self._sent_alerts = 0
+        self._failed_batches = 0
+        self._last_error: str | None = None
 
     async def send(self, title: str, message: str) -> None:
         """兼容旧调用。"""
@@ -31,6 +64,7 @@ class AlertService:
         dedupe_key: str | None = None,
         min_interval_sec: float = 0.0,
     ) -> None:
+        """仅格式化并入队，不做任何网络 IO；队列满时丢弃最旧的一条。"""
         telegram_cfg = self._telegram_config_store.get()
         if not telegram_cfg.telegram_bot_token or not telegram_cfg.telegram_chat_id:
             self._logger.warning("Telegram 未配置，跳过告警: [%s][%s] %s", level, event, message)
@@ -50,16 +84,138 @@ class AlertService:
             for k, v in details.items():
                 lines.append(f"{k}: {v}")
 
-        url = f"https://api.telegram.org/bot{telegram_cfg.telegram_bot_token}/sendMessage"
-        payload = {
-            "chat_id": telegram_cfg.telegram_chat_id,
-            "text": "\n".join(lines),
+        alert = _PendingAlert(
+            bot_token=telegram_cfg.telegram_bot_token,
+            chat_id=telegram_cfg.telegram_chat_id,
+            text="\n".join(lines),
+        )
+        self._ensure_worker()
+        if self._queue.full():
+            self._queue.get_nowait()
+            self._queue.task_done()
+            self._dropped += 1
+            self._logger.warning("告警队列已满，丢弃最旧告警 dropped=%s", self._dropped)
+        self._queue.put_nowait(alert)
+        self._enqueued += 1
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "enqueued": self._enqueued,
+            "dropped": self._dropped,
+            "sent_alerts": self._sent_alerts,
+            "sent_batches": self._sent_batches,
+            "failed_batches": self._failed_batches,
+            "last_error": self._last_error,
         }
+
+    async def aclose(self, flush_timeout_sec: float = 5.0) -> None:
+        """尽量发完队列中的告警后停止 worker 并关闭连接池。"""
+        worker = self._worker
+        if worker is not None and not worker.done():
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._queue.join(), timeout=flush_timeout_sec)
+            worker.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await worker
+        self._worker = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        stale_client: httpx.AsyncClient | None = None
+        if self._worker_loop is not loop:
+            # 事件循环更替（如测试或重启）时旧 worker 已失效，待发告警迁移到新队列。
+            pending: list[_PendingAlert] = []
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+            self._queue = asyncio.Queue(maxsize=self._queue.maxsize)
+            for alert in pending:
+                self._queue.put_nowait(alert)
+            self._worker = None
+            if self._worker_loop is not None and self._owns_client:
+                # 自建连接池绑定旧循环，交给新 worker 先关闭再重建，避免连接泄漏。
+                stale_client, self._client = self._client, None
+            self._worker_loop = loop
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run_worker(stale_client), name="alert-dispatch")
+
+    async def _run_worker(self, stale_client: httpx.AsyncClient | None = None) -> None:
+        if stale_client is not None:
+            try:
+                await stale_client.aclose()
+            except Exception as exc:
+                # 旧循环可能已关闭，连接无法优雅断开，不影响后续发送。
+                self._logger.debug("关闭旧告警连接池失败: %s", type(exc).__name__)
+        while True:
+            batch = [await self._queue.get()]
+            try:
+                # 短暂聚合窗口内到达的告警合并发送，突发时减少 Telegram 请求数。
+                deadline = asyncio.get_running_loop().time() + self._batch_window_sec
+                while len(batch) < self._max_batch:
+                    remaining = deadline - asyncio.get_running_loop().time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                    except asyncio.TimeoutError:
+                        break
+                await self._dispatch(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _dispatch(self, batch: list[_PendingAlert]) -> None:
+        groups: dict[tuple[str, str], list[str]] = {}
+        for alert in batch:
+            groups.setdefault((alert.bot_token, alert.chat_id), []).append(alert.text)
+        for (bot_token, chat_id), texts in groups.items():
+            delivered = True
+            for chunk in self._combine(texts):
+                delivered = await self._post(bot_token, chat_id, chunk) and delivered
+            if delivered:
+                self._sent_alerts += len(texts)
+
+    @classmethod
+    def _combine(cls, texts: list[str]) -> list[str]:
+        """按 Telegram 单条长度上限拼接多条告警。"""
+        chunks: list[str] = []
+        current = ""
+        for text in texts:
+            text = text[: cls.TELEGRAM_TEXT_LIMIT]
+            candidate = f"{current}\n\n{text}" if current else text
+            if len(candidate) > cls.TELEGRAM_TEXT_LIMIT:
+                chunks.append(current)
+                candidate = text
+            current = candidate
+        if current:
+            chunks.append(current)
+        return chunks
+
+    async def _post(self, bot_token: str, chat_id: str, text: str) -> bool:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=8.0)
+        url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
         try:
-            async with httpx.AsyncClient(timeout=8.0) as client:
-                await client.post(url, json=payload)
+            resp = await self._client.post(url, json={"chat_id": chat_id, "text": text})
+            resp.raise_for_status()
+            self._sent_batches += 1
+            return True
         except Exception as exc:
-            self._logger.exception("发送 Telegram 告警失败: %s", exc)
+            self._failed_batches += 1
+            # 异常文本与堆栈中的请求 URL 含 bot token，只记录异常类型与状态码。
+            self._last_error = self._describe_error(exc)
+            self._logger.warning("发送 Telegram 告警失败: %s", self._last_error)
+            return False
+
+    @staticmethod
+    def _describe_error(exc: Exception) -> str:
+        if isinstance(exc, httpx.HTTPStatusError):
+            return f"{type(exc).__name__}: HTTP {exc.response.status_code}"
+        return type(exc).__name__
 
     def _should_skip(self, key: str, min_interval_sec: float) -> bool:
         now = datetime.now(timezone.utc)
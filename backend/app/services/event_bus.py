@@ -1,39 +1,190 @@
 ﻿from __future__ import annotations
 
 import asyncio
-from collections import defaultdict
+import time
+from collections import deque
+from collections.abc import Iterable
 from datetime import datetime, timezone
 from typing import Any
 
+import orjson
+
+
+class EncodedEvent:
+    """已序列化的事件，字节只编码一次并在所有订阅者间共享。"""
+
+    __slots__ = ("type", "ts", "created", "payload", "data", "_text")
+
+    def __init__(self, event_type: str, payload: dict[str, Any]) -> None:
+        self.type = event_type
+        self.ts = datetime.now(timezone.utc).isoformat()
+        self.created = time.monotonic()
+        self.payload = payload
+        self.data: bytes = orjson.dumps(
+            {"type": event_type, "ts": self.ts, "payload": payload},
+            option=orjson.OPT_NON_STR_KEYS,
+            default=str,
+        )
+        self._text: str | None = None
+
+    @property
+    def text(self) -> str:
+        # WS 文本帧需要 str，解码同样只做一次。
+        if self._text is None:
+            self._text = self.data.decode()
+        return self._text
+
+
+class Subscription:
+    """单个订阅者：按主题过滤；合并主题只保留最新一条，其余事件按序无损排队。"""
+
+    def __init__(
+        self,
+        sub_id: int,
+        topics: Iterable[str] | None,
+        queue_size: int,
+        *,
+        conflate_topics: Iterable[str] = (),
+        label: str = "",
+    ) -> None:
+        exact: set[str] = set()
+        prefixes: list[str] = []
+        for topic in topics or ():
+            topic = topic.strip()
+            if not topic:
+                continue
+            if topic.endswith("*"):
+                prefixes.append(topic[:-1])
+            else:
+                exact.add(topic)
+        self.id = sub_id
+        self.label = label
+        self._all = not exact and not prefixes
+        self._exact = frozenset(exact)
+        self._prefixes = tuple(prefixes)
+        self._conflate = frozenset(conflate_topics)
+        self._queue_size = max(1, queue_size)
+        # 队列元素为离散事件，或合并主题的占位名（实际内容在 _latest 中，随新事件原地替换）。
+        self._items: deque[EncodedEvent | str] = deque()
+        self._latest: dict[str, EncodedEvent] = {}
+        self._discrete = 0
+        self._ready = asyncio.Event()
+        self.delivered = 0
+        self.conflated = 0
+        self.dropped = 0
+        self._delivery_lag_ms_last = 0.0
+        self._delivery_lag_ms_max = 0.0
+
+    def accepts(self, event_type: str) -> bool:
+        if self._all or event_type in self._exact:
+            return True
+        return any(event_type.startswith(prefix) for prefix in self._prefixes)
+
+    def offer(self, event: EncodedEvent) -> None:
+        if event.type in self._conflate:
+            if event.type in self._latest:
+                self.conflated += 1
+            else:
+                self._items.append(event.type)
+            self._latest[event.type] = event
+        else:
+            if self._discrete >= self._queue_size:
+                self._drop_oldest_discrete()
+            self._items.append(event)
+            self._discrete += 1
+        self._ready.set()
+
+    async def get(self) -> EncodedEvent:
+        while not self._items:
+            self._ready.clear()
+            await self._ready.wait()
+        return self.get_nowait()
+
+    def get_nowait(self) -> EncodedEvent:
+        item = self._items.popleft()
+        if isinstance(item, str):
+            event = self._latest.pop(item)
+        else:
+            event = item
+            self._discrete -= 1
+        self.delivered += 1
+        lag_ms = (time.monotonic() - event.created) * 1000.0
+        self._delivery_lag_ms_last = lag_ms
+        self._delivery_lag_ms_max = max(self._delivery_lag_ms_max, lag_ms)
+        return event
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def lag_ms(self) -> float:
+        """最早一条未读事件已等待的时长。"""
+        if not self._items:
+            return 0.0
+        head = self._items[0]
+        event = self._latest[head] if isinstance(head, str) else head
+        return max(0.0, (time.monotonic() - event.created) * 1000.0)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "label": self.label,
+            "pending": len(self._items),
+            "lag_ms": round(self.lag_ms(), 3),
+            "delivery_lag_ms_last": round(self._delivery_lag_ms_last, 3),
+            "delivery_lag_ms_max": round(self._delivery_lag_ms_max, 3),
+            "delivered": self.delivered,
+            "conflated": self.conflated,
+            "dropped": self.dropped,
+        }
+
+    def _drop_oldest_discrete(self) -> None:
+        # 离散事件仍设上限防止内存无界，超限时丢弃最旧一条并计数。
+        for index, item in enumerate(self._items):
+            if not isinstance(item, str):
+                del self._items[index]
+                self._discrete -= 1
+                self.dropped += 1
+                return
+
 
 class EventBus:
     """进程内事件分发。"""
 
-    def __init__(self, queue_size: int = 1024) -> None:
-        self._subscribers: set[asyncio.Queue] = set()
+    def __init__(self, queue_size: int = 1024, conflate_topics: Iterable[str] = ("tick",)) -> None:
+        self._subscribers: set[Subscription] = set()
         self._queue_size = queue_size
+        self._conflate_topics = frozenset(conflate_topics)
+        self._next_id = 0
 
-    def subscribe(self) -> asyncio.Queue:
-        q: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size)
-        self._subscribers.add(q)
-        return q
+    def subscribe(self, topics: Iterable[str] | None = None, *, conflate: bool = True, label: str = "") -> Subscription:
+        """订阅指定主题（支持 close_* 前缀通配），为空时订阅全部；conflate 时 tick 只保留最新一条。"""
+        self._next_id += 1
+        sub = Subscription(
+            self._next_id,
+            topics,
+            self._queue_size,
+            conflate_topics=self._conflate_topics if conflate else (),
+            label=label,
+        )
+        self._subscribers.add(sub)
+        return sub
 
-    def unsubscribe(self, q: asyncio.Queue) -> None:
-        self._subscribers.discard(q)
+    def stats(self) -> list[dict[str, Any]]:
+        return [sub.stats() for sub in sorted(self._subscribers, key=lambda item: item.id)]
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        self._subscribers.discard(sub)
 
     async def publish(self, event_type: str, payload: dict[str, Any]) -> None:
-        message = {
-            "type": event_type,
-            "ts": datetime.now(timezone.utc).isoformat(),
-            "payload": payload,
-        }
-        stale: list[asyncio.Queue] = []
-        for queue in list(self._subscribers):
+        targets = [sub for sub in self._subscribers if sub.accepts(event_type)]
+        if not targets:
+            return
+        event = EncodedEvent(event_type, payload)
+        stale: list[Subscription] = []
+        for sub in targets:
             try:
-                if queue.full():
-                    queue.get_nowait()
-                queue.put_nowait(message)
+                sub.offer(event)
             except Exception:
-                stale.append(queue)
-        for queue in stale:
-            self._subscribers.discard(queue)
+                stale.append(sub)
+        for sub in stale:
+            self._subscribers.discard(sub)
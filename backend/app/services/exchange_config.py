@@ -98,6 +98,11 @@ class ExchangeConfigStore:
     def get(self) -> ExchangeConfigRecord:
         return self._config
 
+    def reload(self) -> ExchangeConfigRecord:
+        """重新读取文件；独立引擎进程在 API 进程改写配置后调用。"""
+        self._config = self._load_or_default()
+        return self._config
+
     def _resolve_secret_value(self, current: str, incoming: str | None, clear: bool) -> str:
         if clear:
             return ""
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import asyncio
+import gc
+import logging
+import time
+from bisect import bisect_left
+from collections.abc import Callable
+from typing import Any
+
+from app.services.monitoring import MonitoringService
+from app.services.prometheus import EVENT_LOOP_LAG_SECONDS, GC_PAUSE_SECONDS
+
+
+class GcPauseMonitor:
+    """通过 gc.callbacks 记录各代垃圾回收的停顿时长。"""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        self._clock = clock
+        self._started: float | None = None
+        self._installed = False
+        self._histograms = [GC_PAUSE_SECONDS.labels(str(generation)) for generation in range(3)]
+        self._bounds = self._histograms[0].bounds
+        # 回调内只累加预分配的桶计数，由事件循环上的 flush 合并进直方图。
+        self._unflushed_counts = [[0] * (len(self._bounds) + 1) for _ in range(3)]
+        self._unflushed_sum = [0.0, 0.0, 0.0]
+        self._totals = [{"collections": 0, "pause_ms": 0.0, "max_ms": 0.0} for _ in range(3)]
+        self._pending_ms = 0.0
+        self._pending_max_ms = 0.0
+        self._pending_count = 0
+
+    def install(self) -> None:
+        if not self._installed:
+            gc.callbacks.append(self._on_gc)
+            self._installed = True
+
+    def uninstall(self) -> None:
+        if self._installed:
+            gc.callbacks.remove(self._on_gc)
+            self._installed = False
+            self._started = None
+
+    def _on_gc(self, phase: str, info: dict[str, Any]) -> None:
+        # 回调可能在任意线程、任意分配点（包括持有直方图锁的渲染过程中）触发：
+        # 不取任何锁、不创建容器对象，只做数值累加。
+        if phase == "start":
+            self._started = self._clock()
+            return
+        started, self._started = self._started, None
+        if started is None:
+            return
+        pause_ms = (self._clock() - started) * 1000.0
+        generation = min(max(int(info.get("generation", 0)), 0), 2)
+        self._unflushed_counts[generation][bisect_left(self._bounds, pause_ms / 1000.0)] += 1
+        self._unflushed_sum[generation] += pause_ms / 1000.0
+        totals = self._totals[generation]
+        totals["collections"] += 1
+        totals["pause_ms"] += pause_ms
+        totals["max_ms"] = max(totals["max_ms"], pause_ms)
+        self._pending_count += 1
+        self._pending_ms += pause_ms
+        self._pending_max_ms = max(self._pending_max_ms, pause_ms)
+
+    def flush(self) -> None:
+        """把回调累加的桶计数合并进 Prometheus 直方图；须在回调之外（事件循环上）调用。"""
+        for generation, counts in enumerate(self._unflushed_counts):
+            if not any(counts):
+                continue
+            batch = counts[:]
+            total = self._unflushed_sum[generation]
+            for idx, n in enumerate(batch):
+                counts[idx] -= n
+            self._unflushed_sum[generation] -= total
+            self._histograms[generation].merge(batch, total)
+
+    def drain(self) -> dict[str, float]:
+        """返回自上次调用以来的 GC 次数、停顿总和与最大值，并清零。"""
+        self.flush()
+        count, total, peak = self._pending_count, self._pending_ms, self._pending_max_ms
+        self._pending_count, self._pending_ms, self._pending_max_ms = 0, 0.0, 0.0
+        return {"gc_collections": count, "gc_pause_ms": round(total, 3), "gc_pause_max_ms": round(peak, 3)}
+
+    def snapshot(self) -> list[dict[str, float]]:
+        self.flush()
+        return [
+            {
+                "generation": generation,
+                "collections": totals["collections"],
+                "pause_ms": round(totals["pause_ms"], 3),
+                "max_ms": round(totals["max_ms"], 3),
+            }
+            for generation, totals in enumerate(self._totals)
+        ]
+
+
+class LoopLagProbe:
+    """常驻协程按固定间隔休眠，以实际唤醒时间与预期时间之差衡量事件循环调度延迟。"""
+
+    def __init__(
+        self,
+        interval_sec: float = 0.05,
+        monitor: MonitoringService | None = None,
+        on_sample: Callable[[], None] | None = None,
+    ) -> None:
+        self._interval = max(0.001, float(interval_sec))
+        self._monitor = monitor
+        self._on_sample = on_sample
+        self._task: asyncio.Task | None = None
+        self._logger = logging.getLogger("loop_monitor")
+        self._last_ms = 0.0
+        self._max_ms = 0.0
+        self._pending_max_ms = 0.0
+        self._samples = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name="loop-lag-probe")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self._interval
+            await asyncio.sleep(self._interval)
+            self.observe(max(0.0, loop.time() - expected) * 1000.0)
+            if self._on_sample is not None:
+                self._on_sample()
+
+    def observe(self, lag_ms: float) -> None:
+        self._samples += 1
+        self._last_ms = lag_ms
+        self._max_ms = max(self._max_ms, lag_ms)
+        self._pending_max_ms = max(self._pending_max_ms, lag_ms)
+        EVENT_LOOP_LAG_SECONDS.observe(lag_ms / 1000.0)
+        if self._monitor is not None:
+            self._monitor.record_latency("event_loop_lag_ms", lag_ms)
+
+    def drain(self) -> dict[str, float]:
+        """返回最近一次延迟与自上次调用以来的最大延迟，并清零区间最大值。"""
+        peak, self._pending_max_ms = self._pending_max_ms, 0.0
+        return {"loop_lag_ms": round(self._last_ms, 3), "loop_lag_max_ms": round(peak, 3)}
+
+    def snapshot(self) -> dict[str, float]:
+        return {
+            "interval_sec": self._interval,
+            "samples": self._samples,
+            "last_ms": round(self._last_ms, 3),
+            "max_ms": round(self._max_ms, 3),
+        }
+
+
+class LoopMonitor:
+    """事件循环延迟探针与 GC 停顿监控的组合，供引擎每 tick 读取并判断是否告警。"""
+
+    def __init__(
+        self,
+        *,
+        probe_interval_sec: float = 0.05,
+        alert_ratio: float = 0.5,
+        monitor: MonitoringService | None = None,
+    ) -> None:
+        self.alert_ratio = max(0.0, float(alert_ratio))
+        self.gc = GcPauseMonitor()
+        # 探针每次唤醒顺带把 GC 停顿合并进直方图，引擎空闲时 /metrics 也保持最新。
+        self.probe = LoopLagProbe(probe_interval_sec, monitor, on_sample=self.gc.flush)
+
+    def start(self) -> None:
+        self.gc.install()
+        self.probe.start()
+
+    async def stop(self) -> None:
+        await self.probe.stop()
+        self.gc.uninstall()
+
+    def drain(self) -> dict[str, float]:
+        return {**self.probe.drain(), **self.gc.drain()}
+
+    def lag_threshold_ms(self, quote_interval_sec: float) -> float | None:
+        """延迟告警阈值为报价间隔的 alert_ratio 倍；比例为 0 时关闭告警。"""
+        if self.alert_ratio <= 0:
+            return None
+        return quote_interval_sec * self.alert_ratio * 1000.0
+
+    def snapshot(self) -> dict[str, Any]:
+        return {"alert_ratio": self.alert_ratio, "loop_lag": self.probe.snapshot(), "gc": self.gc.snapshot()}
@@ -0,0 +1,341 @@
+from __future__ import annotations
+
+import math
+import mmap
+import os
+import struct
+import threading
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.services.tick_journal import RECORD_FIELDS, TickJournalReader
+
+# MonitoringService 序列名 -> tick 日志字段。
+SERIES_FIELDS: dict[str, str] = {
+    "sigma": "sigma",
+    "spread_bps": "spread_bps",
+    "distance_bid_bps": "distance_bid_bps",
+    "distance_ask_bps": "distance_ask_bps",
+    "inventory_notional": "inventory_notional",
+    "mid_price": "mid",
+    "quote_size_notional": "quote_size_notional",
+    "pnl_total": "pnl_total",
+}
+SERIES_NAMES: tuple[str, ...] = tuple(SERIES_FIELDS)
+ROLLUP_RESOLUTIONS: dict[str, int] = {"1s": 1, "1m": 60, "1h": 3600}
+
+ROLLUP_VERSION = 1
+ROLLUP_MAGIC = b"ASRU"
+# 汇总记录：桶起点、tick 数，之后每个序列依次为 min/max/last/sum，全部 float64。
+ROLLUP_RECORD = struct.Struct("<" + "d" * (2 + 4 * len(SERIES_NAMES)))
+ROLLUP_HEADER = struct.Struct("<4sHHII")
+ROLLUP_HEADER_SIZE = 32
+# 汇总文件超出保留上限的余量比例，超出后一次性截回上限以内。
+_PRUNE_SLACK = 0.1
+_BUCKET_START = struct.Struct("<d" + "x" * (ROLLUP_RECORD.size - 8))
+_ROW_INDEX = tuple(RECORD_FIELDS.index(SERIES_FIELDS[name]) for name in SERIES_NAMES)
+
+
+@dataclass(slots=True)
+class HistoryPoint:
+    t: float
+    value: float
+    min: float
+    max: float
+
+
+class RollupWriter:
+    """在 tick 日志写线程中增量维护单一粒度的汇总桶，桶结束时追加到汇总文件。"""
+
+    def __init__(
+        self,
+        directory: str | Path,
+        resolution_sec: int,
+        *,
+        retention_sec: float = 0.0,
+        retention_max_bytes: int = 0,
+    ) -> None:
+        self.resolution_sec = int(resolution_sec)
+        self.path = rollup_path(directory, self.resolution_sec)
+        self._retention_sec = max(0.0, retention_sec)
+        self._retention_max_bytes = max(0, int(retention_max_bytes))
+        self._lock = threading.Lock()
+        self._bucket: list[float] | None = None
+        # 文件首桶起点与记录数，首次落盘时从文件读取，用于判断是否需要截断。
+        self._file_state: tuple[float, int] | None = None
+        self.buckets_written = 0
+        self.buckets_pruned = 0
+
+    def add(self, row: tuple[float, ...]) -> None:
+        ts = row[0]
+        start = math.floor(ts / self.resolution_sec) * self.resolution_sec
+        with self._lock:
+            bucket = self._bucket
+            if bucket is not None and bucket[0] != start:
+                self._emit(bucket)
+                bucket = None
+            if bucket is None:
+                bucket = [float(start), 0.0]
+                for idx in _ROW_INDEX:
+                    value = row[idx]
+                    bucket.extend((value, value, value, 0.0))
+                self._bucket = bucket
+            bucket[1] += 1
+            for n, idx in enumerate(_ROW_INDEX):
+                value = row[idx]
+                base = 2 + n * 4
+                if value < bucket[base]:
+                    bucket[base] = value
+                if value > bucket[base + 1]:
+                    bucket[base + 1] = value
+                bucket[base + 2] = value
+                bucket[base + 3] += value
+
+    def open_bucket(self) -> tuple[float, ...] | None:
+        """当前未结束的桶快照，供查询补齐最新区间。"""
+        with self._lock:
+            return tuple(self._bucket) if self._bucket is not None else None
+
+    def close(self) -> None:
+        # 未满的桶也落盘；重启后同一桶可能再次出现，由读端合并。
+        with self._lock:
+            if self._bucket is not None:
+                self._emit(self._bucket)
+                self._bucket = None
+
+    def _emit(self, bucket: list[float]) -> None:
+        new_file = not self.path.exists()
+        if new_file:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "ab") as fh:
+            if new_file:
+                header = ROLLUP_HEADER.pack(
+                    ROLLUP_MAGIC, ROLLUP_VERSION, len(SERIES_NAMES), ROLLUP_RECORD.size, self.resolution_sec
+                )
+                fh.write(header.ljust(ROLLUP_HEADER_SIZE, b"\0"))
+            fh.write(ROLLUP_RECORD.pack(*bucket))
+        self.buckets_written += 1
+        oldest, count = self._file_state or self._read_file_state()
+        self._file_state = (oldest, count + 1) if count else (bucket[0], 1)
+        self._maybe_prune(bucket[0])
+
+    def _read_file_state(self) -> tuple[float, int]:
+        # 已含本次追加的记录，返回值中扣除。
+        size = self.path.stat().st_size
+        count = max(0, (size - ROLLUP_HEADER_SIZE) // ROLLUP_RECORD.size - 1)
+        if count == 0:
+            return 0.0, 0
+        with open(self.path, "rb") as fh:
+            fh.seek(ROLLUP_HEADER_SIZE)
+            return struct.unpack("<d", fh.read(8))[0], count
+
+    def _maybe_prune(self, newest: float) -> None:
+        """按保留期与字节上限截掉最旧的桶；超出余量才重写，避免每个桶都重写整个文件。"""
+        oldest, count = self._file_state or (newest, 0)
+        keep_from = 0.0
+        max_records = 0
+        if self._retention_sec > 0 and newest - oldest > self._retention_sec * (1 + _PRUNE_SLACK):
+            keep_from = newest - self._retention_sec
+        size = ROLLUP_HEADER_SIZE + count * ROLLUP_RECORD.size
+        if self._retention_max_bytes > 0 and size > self._retention_max_bytes:
+            budget = int(self._retention_max_bytes * (1 - _PRUNE_SLACK)) - ROLLUP_HEADER_SIZE
+            max_records = max(1, budget // ROLLUP_RECORD.size)
+        if not keep_from and not max_records:
+            return
+        with open(self.path, "rb") as fh:
+            header = fh.read(ROLLUP_HEADER_SIZE)
+            body = fh.read()
+        rows = body[: len(body) - len(body) % ROLLUP_RECORD.size]
+        starts = [row[0] for row in _BUCKET_START.iter_unpack(rows)]
+        first = bisect_left(starts, keep_from) if keep_from else 0
+        if max_records:
+            first = max(first, len(starts) - max_records)
+        if first <= 0:
+            return
+        # 先写临时文件再原子替换，读端已打开的旧文件不受影响。
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "wb") as fh:
+            fh.write(header)
+            fh.write(rows[first * ROLLUP_RECORD.size :])
+        os.replace(tmp, self.path)
+        self.buckets_pruned += first
+        self._file_state = (starts[first], len(starts) - first)
+
+
+def rollup_path(directory: str | Path, resolution_sec: int) -> Path:
+    return Path(directory) / f"rollup-{int(resolution_sec)}s.bin"
+
+
+def read_rollup(path: Path, start: float, end: float) -> list[tuple[float, ...]]:
+    """读取 [start, end] 内的汇总桶，相同起点的重复桶（跨重启）合并为一条。"""
+    if not path.exists():
+        return []
+    with open(path, "rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        if size < ROLLUP_HEADER_SIZE + ROLLUP_RECORD.size:
+            return []
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            magic, version, _, record_size, _ = ROLLUP_HEADER.unpack_from(view, 0)
+            if magic != ROLLUP_MAGIC or version != ROLLUP_VERSION or record_size != ROLLUP_RECORD.size:
+                return []
+            count = (size - ROLLUP_HEADER_SIZE) // ROLLUP_RECORD.size
+            starts = _BucketStartView(view, count)
+            first = bisect_left(starts, start)
+            last = bisect_right(starts, end)
+            body = view[ROLLUP_HEADER_SIZE + first * ROLLUP_RECORD.size : ROLLUP_HEADER_SIZE + last * ROLLUP_RECORD.size]
+    rows: list[tuple[float, ...]] = []
+    for row in ROLLUP_RECORD.iter_unpack(body):
+        if rows and rows[-1][0] == row[0]:
+            rows[-1] = _merge_buckets(rows[-1], row)
+        else:
+            rows.append(row)
+    return rows
+
+
+def _merge_buckets(a: tuple[float, ...], b: tuple[float, ...]) -> tuple[float, ...]:
+    merged = [a[0], a[1] + b[1]]
+    for n in range(len(SERIES_NAMES)):
+        base = 2 + n * 4
+        merged.extend((min(a[base], b[base]), max(a[base + 1], b[base + 1]), b[base + 2], a[base + 3] + b[base + 3]))
+    return tuple(merged)
+
+
+class _BucketStartView:
+    _TS = struct.Struct("<d")
+
+    def __init__(self, view: mmap.mmap, count: int) -> None:
+        self._view = view
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> float:
+        return self._TS.unpack_from(self._view, ROLLUP_HEADER_SIZE + index * ROLLUP_RECORD.size)[0]
+
+
+def downsample_minmax(points: list[HistoryPoint], target: int) -> list[HistoryPoint]:
+    """按等量分组聚合：每组保留 min/max 与末值，尖峰不会被抽样丢掉。"""
+    if target <= 0 or len(points) <= target:
+        return points
+    out: list[HistoryPoint] = []
+    step = len(points) / target
+    for i in range(target):
+        group = points[int(i * step) : int((i + 1) * step)]
+        if not group:
+            continue
+        out.append(
+            HistoryPoint(
+                t=group[-1].t,
+                value=group[-1].value,
+                min=min(p.min for p in group),
+                max=max(p.max for p in group),
+            )
+        )
+    return out
+
+
+def downsample_lttb(points: list[HistoryPoint], target: int) -> list[HistoryPoint]:
+    """Largest-Triangle-Three-Buckets：保留视觉形状，首尾点固定保留。"""
+    n = len(points)
+    if target <= 0 or n <= target:
+        return points
+    if target < 3:
+        return [points[0], points[-1]]
+    out = [points[0]]
+    step = (n - 2) / (target - 2)
+    a = 0
+    for i in range(target - 2):
+        lo = int(i * step) + 1
+        hi = int((i + 1) * step) + 1
+        nxt_lo, nxt_hi = hi, min(int((i + 2) * step) + 1, n)
+        if nxt_lo >= nxt_hi:
+            nxt_lo, nxt_hi = n - 1, n
+        avg_t = sum(p.t for p in points[nxt_lo:nxt_hi]) / (nxt_hi - nxt_lo)
+        avg_v = sum(p.value for p in points[nxt_lo:nxt_hi]) / (nxt_hi - nxt_lo)
+        pa = points[a]
+        best, best_area = lo, -1.0
+        for j in range(lo, hi):
+            pj = points[j]
+            area = abs((pa.t - avg_t) * (pj.value - pa.value) - (pa.t - pj.t) * (avg_v - pa.value))
+            if area > best_area:
+                best, best_area = j, area
+        out.append(points[best])
+        a = best
+    out.append(points[-1])
+    return out
+
+
+class MetricsHistory:
+    """历史序列查询：按区间跨度选取原始 tick 或 1s/1m/1h 汇总，再在服务端降采样。"""
+
+    def __init__(self, directory: str | Path, writers: Sequence[RollupWriter] = ()) -> None:
+        self._dir = Path(directory)
+        self._reader = TickJournalReader(self._dir)
+        self._writers = {writer.resolution_sec: writer for writer in writers}
+
+    @staticmethod
+    def build_writers(
+        directory: str | Path,
+        *,
+        retention_sec: float = 0.0,
+        retention_max_bytes: int = 0,
+    ) -> list[RollupWriter]:
+        return [
+            RollupWriter(directory, seconds, retention_sec=retention_sec, retention_max_bytes=retention_max_bytes)
+            for seconds in ROLLUP_RESOLUTIONS.values()
+        ]
+
+    def query(
+        self,
+        series: str,
+        start: float,
+        end: float,
+        points: int = 500,
+        method: str = "minmax",
+    ) -> tuple[str, list[HistoryPoint]]:
+        if series not in SERIES_FIELDS:
+            raise ValueError(f"未知序列: {series}")
+        if method not in {"minmax", "lttb"}:
+            raise ValueError(f"未知降采样方法: {method}")
+        points = max(2, points)
+        resolution = self.pick_resolution(end - start, points)
+        if resolution == "raw":
+            rows = self._raw_points(series, start, end)
+        else:
+            rows = self._rollup_points(series, ROLLUP_RESOLUTIONS[resolution], start, end)
+        sampled = downsample_lttb(rows, points) if method == "lttb" else downsample_minmax(rows, points)
+        return resolution, sampled
+
+    @staticmethod
+    def pick_resolution(span_sec: float, points: int) -> str:
+        """选取仍能提供不少于 points 个桶的最粗粒度；区间过短时读原始 tick。"""
+        for name, seconds in sorted(ROLLUP_RESOLUTIONS.items(), key=lambda item: -item[1]):
+            if span_sec / seconds >= points:
+                return name
+        return "raw"
+
+    def _raw_points(self, series: str, start: float, end: float) -> list[HistoryPoint]:
+        field = SERIES_FIELDS[series]
+        cols = self._reader.read_range(start, end, fields=["ts", field])
+        return [HistoryPoint(t=t, value=v, min=v, max=v) for t, v in zip(cols["ts"], cols[field])]
+
+    def _rollup_points(self, series: str, seconds: int, start: float, end: float) -> list[HistoryPoint]:
+        # 桶起点落在 start 之前但覆盖 start 的桶同样计入。
+        lo = math.floor(start / seconds) * seconds
+        rows = read_rollup(rollup_path(self._dir, seconds), lo, end)
+        writer = self._writers.get(seconds)
+        live = writer.open_bucket() if writer is not None else None
+        if live is not None and lo <= live[0] <= end:
+            if rows and rows[-1][0] == live[0]:
+                rows[-1] = _merge_buckets(rows[-1], live)
+            else:
+                rows.append(live)
+        base = 2 + SERIES_NAMES.index(series) * 4
+        return [
+            HistoryPoint(t=row[0], value=row[base + 2], min=row[base], max=row[base + 1])
+            for row in rows
+            if row[1] > 0
+        ]
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+from bisect import bisect_right
 from collections import deque
 from datetime import datetime, timezone
 from math import ceil
 
 from app.models import EngineTick, OrderSnapshot, TradeSnapshot
 from app.schemas import MetricsSummary, TimeSeriesPoint
+from app.services.quantiles import QuantileRegistry
+from app.services.rolling_window import BucketedCounter, RollingSum
 
 
 class MonitoringService:
@@ -22,7 +25,16 @@ class MonitoringService:
         self._total_fee = 0.0
         self._total_fee_rebate = 0.0
         self._total_fee_cost = 0.0
-        self._trade_notional_events: deque[tuple[datetime, float]] = deque(maxlen=max_points * 200)
+        # 滑动窗口指标全部增量维护，update_tick 的耗时与成交量无关。
+        self._trade_notional_1h = RollingSum(window_sec=3600.0, maxlen=max_points * 200)
+        self._fill_count_1m = BucketedCounter(window_sec=60.0)
+        self._cancel_count_1m = BucketedCounter(window_sec=60.0)
+        self._open_order_created_ts: list[float] = []
+        self._open_order_oldest_ts: dict[str, float] = {}
+        self._quantiles = QuantileRegistry()
+        self._order_created_ts: dict[str, float] = {}
+        self._order_created_limit = max_points * 4
+        self._last_fill_ts: float | None = None
         self._summary = MetricsSummary(
             timestamp=datetime.now(timezone.utc),
             mid_price=0.0,
@@ -76,7 +88,6 @@ class MonitoringService:
         }
         self._open_orders: list[OrderSnapshot] = []
         self._recent_trades: list[TradeSnapshot] = []
-        self._cancel_events: deque[datetime] = deque(maxlen=max_points * 4)
 
     def reset_session(self, started_at: datetime | None = None) -> None:
         self._session_started_at = started_at or datetime.now(timezone.utc)
@@ -85,10 +96,13 @@ class MonitoringService:
         self._total_fee = 0.0
         self._total_fee_rebate = 0.0
         self._total_fee_cost = 0.0
-        self._trade_notional_events.clear()
+        self._trade_notional_1h.clear()
+        self._fill_count_1m.clear()
         self._seen_trade_keys.clear()
         self._seen_trade_queue.clear()
-        self._cancel_events.clear()
+        self._cancel_count_1m.clear()
+        self._quantiles.reset_session()
+        self._last_fill_ts = None
 
     def update_tick(
         self,
@@ -99,13 +113,9 @@ class MonitoringService:
         requote_reason: str = "none",
     ) -> None:
         now = tick.timestamp
-        self._trim_window(self._cancel_events, now, window_sec=60.0)
-        maker_fill_count_1m = sum(
-            1
-            for trade in self._recent_trades
-            if 0.0 <= (now - trade.created_at).total_seconds() <= 60.0
-        )
-        cancel_count_1m = len(self._cancel_events)
+        now_ts = now.timestamp()
+        maker_fill_count_1m = self._fill_count_1m.count(now_ts)
+        cancel_count_1m = self._cancel_count_1m.count(now_ts)
         fill_to_cancel_ratio = (
             maker_fill_count_1m / cancel_count_1m
             if cancel_count_1m > 0
@@ -131,11 +141,10 @@ class MonitoringService:
                 * 10000.0
             )
 
-        ages = self._open_order_ages(now)
-        time_in_book_p50 = self._percentile(ages, 0.5)
-        time_in_book_p90 = self._percentile(ages, 0.9)
-        buy_age = self._side_open_order_age(now, "buy")
-        sell_age = self._side_open_order_age(now, "sell")
+        time_in_book_p50 = self._open_order_age_percentile(now_ts, 0.5)
+        time_in_book_p90 = self._open_order_age_percentile(now_ts, 0.9)
+        buy_age = self._side_open_order_age(now_ts, "buy")
+        sell_age = self._side_open_order_age(now_ts, "sell")
 
         self._summary = MetricsSummary(
             timestamp=tick.timestamp,
@@ -189,10 +198,34 @@ class MonitoringService:
         self._series["pnl_total"].append(TimeSeriesPoint(t=tick.timestamp, value=tick.pnl_total))
 
     def record_cancel(self, at: datetime | None = None) -> None:
-        self._cancel_events.append(at or datetime.now(timezone.utc))
+        at_ts = (at or datetime.now(timezone.utc)).timestamp()
+        self._cancel_count_1m.add(at_ts)
+        if self._last_fill_ts is not None and at_ts >= self._last_fill_ts:
+            self._quantiles.record("fill_to_cancel_sec", at_ts - self._last_fill_ts, at_ts)
+
+    def record_latency(self, metric: str, value: float, at: datetime | None = None) -> None:
+        at_ts = (at or datetime.now(timezone.utc)).timestamp()
+        self._quantiles.record(metric, value, at_ts)
+
+    def record_stage_timings(self, timings: dict[str, float], at: datetime | None = None) -> None:
+        at_ts = (at or datetime.now(timezone.utc)).timestamp()
+        for stage, value in timings.items():
+            self._quantiles.record(stage, value, at_ts)
+
+    def quantile_summary(self, now: datetime | None = None) -> dict[str, dict[str, dict]]:
+        return self._quantiles.summary((now or datetime.now(timezone.utc)).timestamp())
 
     def update_orders(self, orders: list[OrderSnapshot]) -> None:
         self._open_orders = orders
+        # 挂单变化时排序一次，每 tick 的挂单时长分位与单边最老挂单只需按下标取值。
+        self._open_order_created_ts = sorted(order.created_at.timestamp() for order in orders)
+        oldest: dict[str, float] = {}
+        for order in orders:
+            created = order.created_at.timestamp()
+            self._remember_order(order.order_id, created)
+            if order.side not in oldest or created < oldest[order.side]:
+                oldest[order.side] = created
+        self._open_order_oldest_ts = oldest
 
     def update_trades(self, trades: list[TradeSnapshot]) -> None:
         ordered = sorted(trades, key=lambda t: t.created_at)
@@ -205,6 +238,13 @@ class MonitoringService:
             if len(self._seen_trade_queue) > self._seen_trade_limit:
                 old = self._seen_trade_queue.popleft()
                 self._seen_trade_keys.discard(old)
+            fill_ts = trade.created_at.timestamp()
+            self._fill_count_1m.add(fill_ts)
+            created = self._order_created_ts.get(trade.order_id) if trade.order_id else None
+            if created is not None and fill_ts >= created:
+                self._quantiles.record("time_in_book_filled_sec", fill_ts - created, fill_ts)
+            if self._last_fill_ts is None or fill_ts > self._last_fill_ts:
+                self._last_fill_ts = fill_ts
 
             if trade.created_at < self._session_started_at:
                 continue
@@ -212,7 +252,7 @@ class MonitoringService:
             self._total_trade_count += 1
             notional = abs(float(trade.price) * float(trade.size))
             self._total_trade_volume_notional += notional
-            self._trade_notional_events.append((trade.created_at, notional))
+            self._trade_notional_1h.add(trade.created_at.timestamp(), notional)
             self._total_fee += float(trade.fee)
             if trade.fee < 0:
                 self._total_fee_rebate += abs(float(trade.fee))
@@ -226,8 +266,7 @@ class MonitoringService:
 
     def trade_volume_notional_last_1h(self, now: datetime | None = None) -> float:
         point = now or datetime.now(timezone.utc)
-        self._trim_trade_notional_events(point, window_sec=3600.0)
-        return sum(notional for _, notional in self._trade_notional_events)
+        return self._trade_notional_1h.total(point.timestamp())
 
     @property
     def summary(self) -> MetricsSummary:
@@ -244,34 +283,25 @@ class MonitoringService:
     def recent_trades(self) -> list[TradeSnapshot]:
         return list(self._recent_trades)
 
-    @staticmethod
-    def _trim_window(rows: deque[datetime], now: datetime, window_sec: float) -> None:
-        while rows and (now - rows[0]).total_seconds() > window_sec:
-            rows.popleft()
+    def _remember_order(self, order_id: str, created_ts: float) -> None:
+        # 记录挂单创建时间，成交回报到达时计算成交单的在簿时长；超出上限按插入顺序淘汰。
+        if order_id in self._order_created_ts:
+            return
+        self._order_created_ts[order_id] = created_ts
+        if len(self._order_created_ts) > self._order_created_limit:
+            self._order_created_ts.pop(next(iter(self._order_created_ts)))
 
-    def _trim_trade_notional_events(self, now: datetime, window_sec: float) -> None:
-        while self._trade_notional_events and (now - self._trade_notional_events[0][0]).total_seconds() > window_sec:
-            self._trade_notional_events.popleft()
-
-    def _open_order_ages(self, now: datetime) -> list[float]:
-        ages: list[float] = []
-        for order in self._open_orders:
-            delta = (now - order.created_at).total_seconds()
-            if delta >= 0:
-                ages.append(delta)
-        return sorted(ages)
-
-    def _side_open_order_age(self, now: datetime, side: str) -> float:
-        side_ages = [
-            (now - order.created_at).total_seconds()
-            for order in self._open_orders
-            if order.side == side and (now - order.created_at).total_seconds() >= 0
-        ]
-        return max(side_ages) if side_ages else 0.0
+    def _open_order_age_percentile(self, now_ts: float, ratio: float) -> float:
+        # 创建时间升序即挂单时长降序，按比例映射到对应下标，语义与对时长排序取分位一致。
+        created = self._open_order_created_ts
+        ages_count = bisect_right(created, now_ts)
+        if ages_count == 0:
+            return 0.0
+        idx = ceil((ages_count - 1) * max(0.0, min(1.0, ratio)))
+        return now_ts - created[ages_count - 1 - idx]
 
-    @staticmethod
-    def _percentile(values: list[float], ratio: float) -> float:
-        if not values:
+    def _side_open_order_age(self, now_ts: float, side: str) -> float:
+        oldest = self._open_order_oldest_ts.get(side)
+        if oldest is None or oldest > now_ts:
             return 0.0
-        idx = ceil((len(values) - 1) * max(0.0, min(1.0, ratio)))
-        return values[idx]
+        return now_ts - oldest
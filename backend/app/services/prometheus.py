@@ -0,0 +1,398 @@
+from __future__ import annotations
+
+import math
+import threading
+from bisect import bisect_left
+from collections.abc import Callable, Collection, Iterable, Sequence
+from typing import Any
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_LATENCY_BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+LabelValues = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _label_text(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Child:
+    """单个标签组合的样本；仅在数值变化后重新渲染文本，其余抓取直接复用缓存。"""
+
+    __slots__ = ("_lock", "_text", "_dirty")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._text = ""
+        self._dirty = True
+
+    def render(self) -> str:
+        if self._dirty:
+            with self._lock:
+                self._text = self._render()
+                self._dirty = False
+        return self._text
+
+    def _render(self) -> str:
+        raise NotImplementedError
+
+
+class _CounterChild(_Child):
+    __slots__ = ("_prefix", "_value")
+
+    def __init__(self, prefix: str) -> None:
+        super().__init__()
+        self._prefix = prefix
+        self._value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+            self._dirty = True
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def _render(self) -> str:
+        return f"{self._prefix} {_format_value(self._value)}\n"
+
+
+class _GaugeChild(_CounterChild):
+    __slots__ = ()
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self._value = float(value)
+            self._dirty = True
+
+
+class _HistogramChild(_Child):
+    __slots__ = ("_bounds", "_bucket_prefixes", "_sum_prefix", "_count_prefix", "_counts", "_sum", "_count")
+
+    def __init__(self, name: str, labelnames: Sequence[str], values: Sequence[str], bounds: Sequence[float]) -> None:
+        super().__init__()
+        self._bounds = tuple(bounds)
+        # 每个桶的行前缀只拼接一次。
+        self._bucket_prefixes = []
+        for bound in (*bounds, math.inf):
+            le = 'le="' + _format_value(bound) + '"'
+            self._bucket_prefixes.append(f"{name}_bucket{_label_text(labelnames, values, le)}")
+        self._sum_prefix = f"{name}_sum{_label_text(labelnames, values)}"
+        self._count_prefix = f"{name}_count{_label_text(labelnames, values)}"
+        self._counts = [0] * (len(bounds) + 1)
+        self._sum = 0.0
+        self._count = 0
+
+    def observe(self, value: float) -> None:
+        idx = bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[idx] += 1
+            self._sum += value
+            self._count += 1
+            self._dirty = True
+
+    def merge(self, counts: Sequence[int], total: float) -> None:
+        """合并一批已按桶计数的观测值（桶边界须与本直方图一致）。"""
+        with self._lock:
+            for idx, n in enumerate(counts):
+                self._counts[idx] += n
+            self._sum += total
+            self._count += sum(counts)
+            self._dirty = True
+
+    @property
+    def bounds(self) -> tuple[float, ...]:
+        return self._bounds
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def _render(self) -> str:
+        lines: list[str] = []
+        cumulative = 0
+        for prefix, n in zip(self._bucket_prefixes, self._counts):
+            cumulative += n
+            lines.append(f"{prefix} {cumulative}\n")
+        lines.append(f"{self._sum_prefix} {_format_value(self._sum)}\n")
+        lines.append(f"{self._count_prefix} {self._count}\n")
+        return "".join(lines)
+
+
+class _Family:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.labelnames = tuple(labelnames)
+        self._header = f"# HELP {name} {documentation}\n# TYPE {name} {self.kind}\n"
+        self._children: dict[LabelValues, _Child] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str):
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} 需要标签 {self.labelnames}")
+            with self._lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = self._new_child(key)
+                    self._children[key] = child
+        return child
+
+    def render(self) -> str:
+        return self._header + "".join(child.render() for child in list(self._children.values()))
+
+    def _new_child(self, values: LabelValues) -> _Child:
+        raise NotImplementedError
+
+
+class Counter(_Family):
+    kind = "counter"
+
+    def _new_child(self, values: LabelValues) -> _CounterChild:
+        return _CounterChild(f"{self.name}{_label_text(self.labelnames, values)}")
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+
+class Gauge(_Family):
+    kind = "gauge"
+
+    def _new_child(self, values: LabelValues) -> _GaugeChild:
+        return _GaugeChild(f"{self.name}{_label_text(self.labelnames, values)}")
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+
+class Histogram(_Family):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._bounds = tuple(sorted(buckets))
+
+    def _new_child(self, values: LabelValues) -> _HistogramChild:
+        return _HistogramChild(self.name, self.labelnames, values, self._bounds)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+
+class CallbackFamily:
+    """抓取时从已有统计源拉取的指标（如订阅者延迟、告警队列深度），不在热路径上维护状态。"""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        kind: str,
+        labelnames: Sequence[str],
+        collect: Callable[[], Iterable[tuple[Sequence[str], float]]],
+    ) -> None:
+        self.name = name
+        self.labelnames = tuple(labelnames)
+        self._header = f"# HELP {name} {documentation}\n# TYPE {name} {kind}\n"
+        self._collect = collect
+
+    def render(self) -> str:
+        lines = [self._header]
+        for values, value in self._collect():
+            lines.append(f"{self.name}{_label_text(self.labelnames, values)} {_format_value(float(value))}\n")
+        return "".join(lines)
+
+
+class MetricsRegistry:
+    """指标注册表：按注册顺序拼接各指标族已缓存的文本。"""
+
+    def __init__(self) -> None:
+        self._families: dict[str, _Family | CallbackFamily] = {}
+        self._lock = threading.Lock()
+
+    def register(self, family):
+        with self._lock:
+            if family.name in self._families:
+                raise ValueError(f"指标重复注册: {family.name}")
+            self._families[family.name] = family
+        return family
+
+    def unregister(self, name: str) -> None:
+        with self._lock:
+            self._families.pop(name, None)
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def callback(
+        self,
+        name: str,
+        documentation: str,
+        kind: str,
+        labelnames: Sequence[str],
+        collect: Callable[[], Iterable[tuple[Sequence[str], float]]],
+    ) -> CallbackFamily:
+        """注册抓取时拉取的指标；同名时替换，便于应用重建时重新绑定数据源。"""
+        family = CallbackFamily(name, documentation, kind, labelnames, collect)
+        with self._lock:
+            self._families[name] = family
+        return family
+
+    def render(self, skip: Collection[str] = ()) -> str:
+        """按注册顺序输出；skip 中的指标族不输出，用于与引擎进程的文本合并时去重。"""
+        with self._lock:
+            families = [family for family in self._families.values() if family.name not in skip]
+        return "".join(family.render() for family in families)
+
+
+def family_names(text: str) -> set[str]:
+    """从文本格式输出中提取已声明的指标族名。"""
+    return {line.split(" ", 3)[2] for line in text.splitlines() if line.startswith("# TYPE ")}
+
+
+REGISTRY = MetricsRegistry()
+
+TICK_STAGE_SECONDS = REGISTRY.histogram(
+    "mm_tick_stage_seconds",
+    "Engine tick stage duration in seconds.",
+    ("stage",),
+)
+TICKS_TOTAL = REGISTRY.counter("mm_ticks_total", "Engine ticks completed.")
+TICK_ERRORS_TOTAL = REGISTRY.counter("mm_tick_errors_total", "Engine tick failures by category.", ("category",))
+ADAPTER_CALL_SECONDS = REGISTRY.histogram(
+    "mm_adapter_call_seconds",
+    "Exchange REST call latency in seconds by endpoint and outcome.",
+    ("endpoint", "outcome"),
+)
+ADAPTER_METHOD_SECONDS = REGISTRY.histogram(
+    "mm_adapter_method_seconds",
+    "Exchange adapter method latency in seconds by method and outcome.",
+    ("method", "outcome"),
+)
+ADAPTER_ERRORS_TOTAL = REGISTRY.counter(
+    "mm_adapter_errors_total",
+    "Exchange adapter method failures by method and error class.",
+    ("method", "error_class"),
+)
+ORDER_ACTIONS_TOTAL = REGISTRY.counter(
+    "mm_order_actions_total",
+    "Orders placed or canceled by the engine, by requote reason.",
+    ("action", "reason"),
+)
+# 事件循环延迟与 GC 停顿通常在亚毫秒级，桶下限比请求耗时更细。
+PAUSE_BUCKETS: tuple[float, ...] = (0.0001, 0.00025, 0.0005, *DEFAULT_LATENCY_BUCKETS)
+EVENT_LOOP_LAG_SECONDS = REGISTRY.histogram(
+    "mm_event_loop_lag_seconds",
+    "Event loop scheduling delay measured by the lag probe in seconds.",
+    buckets=PAUSE_BUCKETS,
+)
+GC_PAUSE_SECONDS = REGISTRY.histogram(
+    "mm_gc_pause_seconds",
+    "Garbage collection pause duration in seconds by generation.",
+    ("generation",),
+    buckets=PAUSE_BUCKETS,
+)
+
+
+def register_stream_metrics(bus: Any) -> None:
+    """WS 订阅者的延迟与积压，抓取时从事件总线读取；重复创建应用时按名称覆盖。"""
+    REGISTRY.callback(
+        "mm_stream_subscriber_lag_seconds",
+        "Age of the oldest undelivered event per WS subscriber.",
+        "gauge",
+        ("subscriber",),
+        lambda: [((str(s["id"]),), s["lag_ms"] / 1000.0) for s in bus.stats()],
+    )
+    REGISTRY.callback(
+        "mm_stream_subscriber_pending",
+        "Undelivered events per WS subscriber.",
+        "gauge",
+        ("subscriber",),
+        lambda: [((str(s["id"]),), s["pending"]) for s in bus.stats()],
+    )
+    REGISTRY.callback(
+        "mm_stream_subscriber_conflated_total",
+        "Tick events replaced before delivery per WS subscriber.",
+        "counter",
+        ("subscriber",),
+        lambda: [((str(s["id"]),), s["conflated"]) for s in bus.stats()],
+    )
+    REGISTRY.callback(
+        "mm_stream_subscriber_dropped_total",
+        "Discrete events dropped on queue overflow per WS subscriber.",
+        "counter",
+        ("subscriber",),
+        lambda: [((str(s["id"]),), s["dropped"]) for s in bus.stats()],
+    )
+
+
+def register_alert_metrics(alerts: Any) -> None:
+    """告警队列深度与丢弃数，注册在实际发送告警的进程中。"""
+    REGISTRY.callback(
+        "mm_alert_queue_depth",
+        "Alerts waiting to be dispatched.",
+        "gauge",
+        (),
+        lambda: [((), alerts.stats()["queue_depth"])],
+    )
+    REGISTRY.callback(
+        "mm_alert_dropped_total",
+        "Alerts dropped because the queue was full.",
+        "counter",
+        (),
+        lambda: [((), alerts.stats()["dropped"])],
+    )
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Any
+
+QUANTILES: tuple[tuple[str, float], ...] = (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("p999", 0.999))
+
+
+class QuantileSketch:
+    """对数分桶的流式分位数草图（DDSketch 思路）：相对误差有界，可合并、可相减。"""
+
+    __slots__ = ("_gamma_log", "_bins", "_zero", "count")
+
+    def __init__(self, relative_accuracy: float = 0.01) -> None:
+        gamma = (1.0 + relative_accuracy) / (1.0 - relative_accuracy)
+        self._gamma_log = math.log(gamma)
+        self._bins: dict[int, int] = {}
+        self._zero = 0
+        self.count = 0
+
+    def add(self, value: float, n: int = 1) -> None:
+        if value <= 0.0:
+            self._zero += n
+        else:
+            key = math.ceil(math.log(value) / self._gamma_log)
+            self._bins[key] = self._bins.get(key, 0) + n
+        self.count += n
+
+    def merge(self, other: QuantileSketch) -> None:
+        bins = self._bins
+        for key, n in other._bins.items():
+            bins[key] = bins.get(key, 0) + n
+        self._zero += other._zero
+        self.count += other.count
+
+    def subtract(self, other: QuantileSketch) -> None:
+        """扣除此前合并进来的子草图，用于滑动窗口过期。"""
+        bins = self._bins
+        for key, n in other._bins.items():
+            left = bins.get(key, 0) - n
+            if left > 0:
+                bins[key] = left
+            else:
+                bins.pop(key, None)
+        self._zero -= other._zero
+        self.count -= other.count
+
+    def quantile(self, q: float) -> float:
+        if self.count <= 0:
+            return 0.0
+        rank = q * (self.count - 1)
+        if rank < self._zero:
+            return 0.0
+        seen = self._zero
+        for key in sorted(self._bins):
+            seen += self._bins[key]
+            if seen > rank:
+                # 取桶的对数中点，保证相对误差不超过 relative_accuracy。
+                return 2.0 * math.exp(key * self._gamma_log) / (1.0 + math.exp(self._gamma_log))
+        return 2.0 * math.exp(max(self._bins) * self._gamma_log) / (1.0 + math.exp(self._gamma_log))
+
+    def summary(self) -> dict[str, float]:
+        out: dict[str, float] = {"count": self.count}
+        if self.count <= 0:
+            return {**out, **{name: 0.0 for name, _ in QUANTILES}}
+        # 一次排序同时取出全部分位点。
+        targets = [(name, q * (self.count - 1)) for name, q in QUANTILES]
+        seen = self._zero
+        idx = 0
+        while idx < len(targets) and targets[idx][1] < seen:
+            out[targets[idx][0]] = 0.0
+            idx += 1
+        scale = 2.0 / (1.0 + math.exp(self._gamma_log))
+        for key in sorted(self._bins):
+            seen += self._bins[key]
+            while idx < len(targets) and targets[idx][1] < seen:
+                out[targets[idx][0]] = scale * math.exp(key * self._gamma_log)
+                idx += 1
+            if idx == len(targets):
+                break
+        return out
+
+    def clear(self) -> None:
+        self._bins.clear()
+        self._zero = 0
+        self.count = 0
+
+
+class WindowedSketch:
+    """滑动窗口分位数：窗口切成固定时间片，片过期时从汇总草图中减去，内存与片数成正比。"""
+
+    def __init__(self, window_sec: float, slots: int, relative_accuracy: float = 0.01) -> None:
+        self._slot_sec = float(window_sec) / max(1, slots)
+        self._slots = max(1, slots)
+        self._accuracy = relative_accuracy
+        self._ring: deque[tuple[int, QuantileSketch]] = deque()
+        self._total = QuantileSketch(relative_accuracy)
+
+    def add(self, ts: float, value: float) -> None:
+        idx = math.floor(ts / self._slot_sec)
+        if not self._ring or self._ring[-1][0] < idx:
+            self._ring.append((idx, QuantileSketch(self._accuracy)))
+            self._expire(idx)
+            slot = self._ring[-1][1]
+        else:
+            # 乱序样本并入最新时间片，误差不超过一个时间片。
+            slot = self._ring[-1][1]
+        slot.add(value)
+        self._total.add(value)
+
+    def snapshot(self, now: float) -> QuantileSketch:
+        self._expire(math.floor(now / self._slot_sec))
+        return self._total
+
+    def clear(self) -> None:
+        self._ring.clear()
+        self._total.clear()
+
+    def _expire(self, current_idx: int) -> None:
+        oldest = current_idx - self._slots + 1
+        while self._ring and self._ring[0][0] < oldest:
+            self._total.subtract(self._ring.popleft()[1])
+
+
+class QuantileRegistry:
+    """按指标维护 1m / 1h / 本次会话三个窗口的分位数草图。"""
+
+    WINDOWS: tuple[str, ...] = ("1m", "1h", "session")
+
+    def __init__(self, relative_accuracy: float = 0.01) -> None:
+        self._accuracy = relative_accuracy
+        self._metrics: dict[str, tuple[WindowedSketch, WindowedSketch, QuantileSketch]] = {}
+
+    def record(self, metric: str, value: float, ts: float) -> None:
+        sketches = self._metrics.get(metric)
+        if sketches is None:
+            sketches = (
+                WindowedSketch(60.0, 6, self._accuracy),
+                WindowedSketch(3600.0, 60, self._accuracy),
+                QuantileSketch(self._accuracy),
+            )
+            self._metrics[metric] = sketches
+        minute, hour, session = sketches
+        minute.add(ts, value)
+        hour.add(ts, value)
+        session.add(value)
+
+    def summary(self, now: float) -> dict[str, dict[str, dict[str, Any]]]:
+        out: dict[str, dict[str, dict[str, Any]]] = {}
+        for metric, (minute, hour, session) in sorted(self._metrics.items()):
+            out[metric] = {
+                "1m": minute.snapshot(now).summary(),
+                "1h": hour.snapshot(now).summary(),
+                "session": session.summary(),
+            }
+        return out
+
+    def reset_session(self) -> None:
+        for _, _, session in self._metrics.values():
+            session.clear()
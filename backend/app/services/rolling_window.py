@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import math
+from collections import deque
+
+
+class RollingSum:
+    """精确滑动窗口求和：事件按时间入队，过期时从运行和中扣除，单次更新摊还 O(1)。"""
+
+    def __init__(self, window_sec: float, maxlen: int | None = None) -> None:
+        self._window_sec = float(window_sec)
+        self._maxlen = maxlen
+        self._events: deque[tuple[float, float]] = deque()
+        self._total = 0.0
+
+    def add(self, ts: float, value: float) -> None:
+        if self._maxlen is not None and len(self._events) >= self._maxlen:
+            self._pop()
+        self._events.append((ts, value))
+        self._total += value
+
+    def total(self, now: float) -> float:
+        self._expire(now)
+        return self._total
+
+    def count(self, now: float) -> int:
+        self._expire(now)
+        return len(self._events)
+
+    def clear(self) -> None:
+        self._events.clear()
+        self._total = 0.0
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self._window_sec
+        events = self._events
+        while events and events[0][0] < cutoff:
+            self._pop()
+
+    def _pop(self) -> None:
+        _, value = self._events.popleft()
+        self._total -= value
+        if not self._events:
+            # 窗口清空时归零，避免长期加减累积浮点误差。
+            self._total = 0.0
+
+
+class BucketedCounter:
+    """分桶滑动计数：按 bucket_sec 聚合，内存与窗口内桶数成正比，与事件量无关。"""
+
+    def __init__(self, window_sec: float, bucket_sec: float = 1.0) -> None:
+        self._window_sec = float(window_sec)
+        self._bucket_sec = float(bucket_sec)
+        self._buckets: deque[list[int]] = deque()
+        self._total = 0
+
+    def add(self, ts: float, n: int = 1) -> None:
+        idx = math.floor(ts / self._bucket_sec)
+        buckets = self._buckets
+        if buckets and buckets[-1][0] == idx:
+            buckets[-1][1] += n
+        elif not buckets or buckets[-1][0] < idx:
+            buckets.append([idx, n])
+        else:
+            # 乱序到达（如成交回报晚于后续事件）时插入对应桶，保持桶有序。
+            for bucket in reversed(buckets):
+                if bucket[0] == idx:
+                    bucket[1] += n
+                    break
+                if bucket[0] < idx:
+                    pos = buckets.index(bucket) + 1
+                    buckets.insert(pos, [idx, n])
+                    break
+            else:
+                buckets.appendleft([idx, n])
+        self._total += n
+
+    def count(self, now: float) -> int:
+        """统计 (now - window, now] 内的事件数，精度为一个桶宽。"""
+        cutoff = math.floor((now - self._window_sec) / self._bucket_sec)
+        buckets = self._buckets
+        while buckets and buckets[0][0] < cutoff:
+            self._total -= buckets.popleft()[1]
+        return self._total
+
+    def clear(self) -> None:
+        self._buckets.clear()
+        self._total = 0
@@ -65,6 +65,11 @@ class RuntimeConfigStore:
     def get(self) -> RuntimeConfig:
         return self._config
 
+    def reload(self) -> RuntimeConfig:
+        """重新读取文件；独立引擎进程在 API 进程改写配置后调用。"""
+        self._config, self._strategy = self._load_or_default()
+        return self._config
+
     def get_strategy(self) -> StrategyConfig:
         return self._strategy
 
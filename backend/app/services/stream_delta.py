@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import time
+from typing import Any
+
+import orjson
+
+from app.services.event_bus import EncodedEvent
+
+PROTOCOL_VERSION = 1
+
+
+class TickDeltaEncoder:
+    """单连接的 tick 增量编码：首帧发全量快照，之后只发变化字段与挂单增删，定期重发快照。"""
+
+    def __init__(self, resync_interval_sec: float = 30.0, key_field: str = "order_id") -> None:
+        self._resync_interval_sec = max(0.0, resync_interval_sec)
+        self._key_field = key_field
+        self._state: dict[str, Any] | None = None
+        self._last_snapshot_at = 0.0
+        self._seq = 0
+        self.snapshots = 0
+        self.deltas = 0
+
+    def encode(self, event: EncodedEvent) -> str:
+        now = time.monotonic()
+        payload = event.payload
+        self._seq += 1
+        if self._state is None or now - self._last_snapshot_at >= self._resync_interval_sec:
+            body: dict[str, Any] = {"v": PROTOCOL_VERSION, "seq": self._seq, "state": payload}
+            message_type = "tick_snapshot"
+            self._last_snapshot_at = now
+            self.snapshots += 1
+        else:
+            body = {"v": PROTOCOL_VERSION, "seq": self._seq, **self._diff(self._state, payload)}
+            message_type = "tick_delta"
+            self.deltas += 1
+        # 发布方每 tick 构造新的 payload，不会原地修改，直接持有引用作为下一帧基线。
+        self._state = payload
+        return orjson.dumps(
+            {"type": message_type, "ts": event.ts, "payload": body},
+            option=orjson.OPT_NON_STR_KEYS,
+            default=str,
+        ).decode()
+
+    def _diff(self, prev: dict[str, Any], cur: dict[str, Any]) -> dict[str, Any]:
+        fields: dict[str, dict[str, Any]] = {}
+        unset: dict[str, list[str]] = {}
+        lists: dict[str, dict[str, list[Any]]] = {}
+        replace: dict[str, Any] = {}
+        for key, value in cur.items():
+            old = prev.get(key)
+            if isinstance(value, dict) and isinstance(old, dict):
+                changed = {k: v for k, v in value.items() if k not in old or old[k] != v}
+                removed = [k for k in old if k not in value]
+                if changed:
+                    fields[key] = changed
+                if removed:
+                    unset[key] = removed
+            elif self._keyed(value) and self._keyed(old):
+                list_diff = self._diff_keyed(old, value)
+                if list_diff:
+                    lists[key] = list_diff
+            elif key not in prev or old != value:
+                replace[key] = value
+        body: dict[str, Any] = {}
+        if fields:
+            body["fields"] = fields
+        if unset:
+            body["unset"] = unset
+        if lists:
+            body["lists"] = lists
+        if replace:
+            body["replace"] = replace
+        dropped = [key for key in prev if key not in cur]
+        if dropped:
+            body["drop"] = dropped
+        return body
+
+    def _keyed(self, value: Any) -> bool:
+        return isinstance(value, list) and all(isinstance(item, dict) and self._key_field in item for item in value)
+
+    def _diff_keyed(self, old: list[dict[str, Any]], new: list[dict[str, Any]]) -> dict[str, list[Any]]:
+        before = {item[self._key_field]: item for item in old}
+        after_keys = set()
+        upsert: list[dict[str, Any]] = []
+        for item in new:
+            key = item[self._key_field]
+            after_keys.add(key)
+            if before.get(key) != item:
+                upsert.append(item)
+        remove = [key for key in before if key not in after_keys]
+        result: dict[str, list[Any]] = {}
+        if upsert:
+            result["upsert"] = upsert
+        if remove:
+            result["remove"] = remove
+        return result
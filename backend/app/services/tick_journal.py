@@ -0,0 +1,416 @@
+from __future__ import annotations
+
+import logging
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterator, Sequence
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Protocol
+
+from app.models import EngineTick
+
+JOURNAL_VERSION = 1
+MAGIC = b"ASTJ"
+
+# 固定宽度记录：全部为 float64，字段顺序即磁盘布局，变更需同步提升 JOURNAL_VERSION。
+RECORD_FIELDS: tuple[str, ...] = (
+    "ts",
+    "bid",
+    "ask",
+    "mid",
+    "depth_score",
+    "trade_intensity",
+    "bid_price",
+    "ask_price",
+    "quote_size_base",
+    "quote_size_notional",
+    "spread_bps",
+    "gamma",
+    "reservation_price",
+    "base_position",
+    "inventory_notional",
+    "equity",
+    "pnl",
+    "pnl_total",
+    "pnl_daily",
+    "sigma",
+    "sigma_zscore",
+    "free_usdt",
+    "effective_capacity_notional",
+    "inventory_usage_ratio",
+    "effective_liquidity_k",
+    "distance_bid_bps",
+    "distance_ask_bps",
+    "loop_elapsed_ms",
+    "fetch_market_ms",
+    "fetch_account_ms",
+    "sync_orders_ms",
+    "fetch_orders_ms",
+    "fetch_trades_ms",
+    "quote_ready_ms",
+)
+STAGE_FIELDS: tuple[str, ...] = RECORD_FIELDS[RECORD_FIELDS.index("loop_elapsed_ms") :]
+RECORD = struct.Struct("<" + "d" * len(RECORD_FIELDS))
+# 段头：magic, version, 字段数, 记录长度, 记录数, 首条 ts, 末条 ts, 创建时间；补齐到 64 字节。
+HEADER = struct.Struct("<4sHHIQddd")
+HEADER_SIZE = 64
+_FIELD_INDEX = {name: idx for idx, name in enumerate(RECORD_FIELDS)}
+
+
+def encode_tick(tick: EngineTick, stages: dict[str, float] | None = None) -> bytes:
+    """把 EngineTick 与阶段耗时打包成一条定长记录。"""
+    stages = stages or {}
+    market, decision, position = tick.market, tick.decision, tick.position
+    return RECORD.pack(
+        tick.timestamp.timestamp(),
+        market.bid,
+        market.ask,
+        market.mid,
+        market.depth_score,
+        market.trade_intensity,
+        decision.bid_price,
+        decision.ask_price,
+        decision.quote_size_base,
+        decision.quote_size_notional,
+        decision.spread_bps,
+        decision.gamma,
+        decision.reservation_price,
+        position.base_position,
+        position.notional,
+        tick.equity,
+        tick.pnl,
+        tick.pnl_total,
+        tick.pnl_daily,
+        tick.sigma,
+        tick.sigma_zscore,
+        tick.free_usdt,
+        tick.effective_capacity_notional,
+        tick.inventory_usage_ratio,
+        tick.effective_liquidity_k,
+        tick.distance_bid_bps,
+        tick.distance_ask_bps,
+        *(float(stages.get(name, 0.0)) for name in STAGE_FIELDS),
+    )
+
+
+class JournalSink(Protocol):
+    """在写线程中接收每条已落盘记录的下游（如增量汇总）。"""
+
+    def add(self, row: tuple[float, ...]) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class _Segment:
+    """单个预分配的内存映射段文件，记录按时间顺序追加。"""
+
+    def __init__(self, path: Path, capacity: int, created: float) -> None:
+        self.path = path
+        self.capacity = capacity
+        self.created = created
+        self.count = 0
+        self.first_ts = 0.0
+        self.last_ts = 0.0
+        size = HEADER_SIZE + capacity * RECORD.size
+        with open(path, "wb") as fh:
+            fh.truncate(size)
+        self._file = open(path, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), size)
+        self._write_header()
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.capacity
+
+    def append(self, record: bytes) -> None:
+        ts = RECORD.unpack_from(record)[0]
+        offset = HEADER_SIZE + self.count * RECORD.size
+        self._map[offset : offset + RECORD.size] = record
+        if self.count == 0:
+            self.first_ts = ts
+        self.last_ts = ts
+        self.count += 1
+        # 先写记录再更新头部计数，读端按计数读取，不会看到半条记录。
+        self._write_header()
+
+    def flush(self) -> None:
+        self._map.flush()
+
+    def close(self) -> None:
+        """封段：截掉未使用的预分配空间。"""
+        self._map.flush()
+        self._map.close()
+        self._file.truncate(HEADER_SIZE + self.count * RECORD.size)
+        self._file.close()
+
+    def _write_header(self) -> None:
+        HEADER.pack_into(
+            self._map,
+            0,
+            MAGIC,
+            JOURNAL_VERSION,
+            len(RECORD_FIELDS),
+            RECORD.size,
+            self.count,
+            self.first_ts,
+            self.last_ts,
+            self.created,
+        )
+
+
+class TickJournal:
+    """追加式 tick 日志：事件循环只做打包入队，落盘由后台线程写入按大小/时间轮转的 mmap 段文件。"""
+
+    def __init__(
+        self,
+        directory: str | Path,
+        *,
+        segment_records: int = 65536,
+        segment_max_age_sec: float = 3600.0,
+        retention_sec: float = 0.0,
+        retention_max_bytes: int = 0,
+        queue_size: int = 65536,
+        flush_interval_sec: float = 1.0,
+        sinks: Sequence[JournalSink] = (),
+    ) -> None:
+        self._dir = Path(directory)
+        self._sinks = tuple(sinks)
+        self._segment_records = max(1, int(segment_records))
+        self._segment_max_age_sec = max(0.0, segment_max_age_sec)
+        # 保留期与总字节上限，0 表示不限；封段时由写线程删除最旧的已封段。
+        self._retention_sec = max(0.0, retention_sec)
+        self._retention_max_bytes = max(0, int(retention_max_bytes))
+        self._flush_interval_sec = max(0.0, flush_interval_sec)
+        self._queue: queue.Queue[bytes | None] = queue.Queue(maxsize=max(1, queue_size))
+        self._logger = logging.getLogger("journal")
+        self._segment: _Segment | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._written = 0
+        self._dropped = 0
+        self._segments_rotated = 0
+        self._segments_pruned = 0
+        self._last_error: str | None = None
+
+    @property
+    def directory(self) -> Path:
+        return self._dir
+
+    def append(self, tick: EngineTick, stages: dict[str, float] | None = None) -> None:
+        """非阻塞追加；写线程跟不上时丢弃并计数，不反压交易主循环。"""
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait(encode_tick(tick, stages))
+        except queue.Full:
+            self._dropped += 1
+
+    def stats(self) -> dict[str, Any]:
+        segment = self._segment
+        return {
+            "queue_depth": self._queue.qsize(),
+            "written": self._written,
+            "dropped": self._dropped,
+            "segments_rotated": self._segments_rotated,
+            "segments_pruned": self._segments_pruned,
+            "active_segment": segment.path.name if segment else None,
+            "last_error": self._last_error,
+        }
+
+    def close(self, timeout_sec: float = 5.0) -> None:
+        """写完队列中的记录后封段并停止写线程。"""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None:
+            return
+        deadline = time.monotonic() + timeout_sec
+        try:
+            # 写线程已退出或卡住时队列可能一直满，阻塞 put 会让关停挂起。
+            self._queue.put(None, timeout=timeout_sec if thread.is_alive() else 0.0)
+        except queue.Full:
+            self._logger.warning("tick 日志写线程未响应，放弃等待封段")
+            return
+        thread.join(timeout=max(0.0, deadline - time.monotonic()))
+        if thread.is_alive():
+            self._logger.warning("tick 日志写线程在 %.1fs 内未退出", timeout_sec)
+
+    def reader(self) -> TickJournalReader:
+        return TickJournalReader(self._dir)
+
+    def _ensure_writer(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="tick-journal", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        last_flush = time.monotonic()
+        while True:
+            try:
+                record = self._queue.get(timeout=self._flush_interval_sec or None)
+            except queue.Empty:
+                record = b""
+            if record is None:
+                break
+            try:
+                if record:
+                    self._write(record)
+                now = time.monotonic()
+                if self._segment is not None and now - last_flush >= self._flush_interval_sec:
+                    self._segment.flush()
+                    last_flush = now
+            except Exception as exc:
+                self._last_error = str(exc)
+                self._logger.exception("tick 日志写入失败: %s", exc)
+        if self._segment is not None:
+            self._seal(self._segment)
+            self._segment = None
+        for sink in self._sinks:
+            try:
+                sink.close()
+            except Exception as exc:
+                self._logger.exception("tick 日志下游关闭失败: %s", exc)
+
+    def _write(self, record: bytes) -> None:
+        segment = self._segment
+        now = time.time()
+        if segment is not None and (segment.full or now - segment.created >= self._segment_max_age_sec):
+            self._seal(segment)
+            self._segments_rotated += 1
+            segment = None
+        if segment is None:
+            segment = self._open_segment(RECORD.unpack_from(record)[0], now)
+            self._segment = segment
+        segment.append(record)
+        self._written += 1
+        if self._sinks:
+            row = RECORD.unpack(record)
+            for sink in self._sinks:
+                sink.add(row)
+
+    def _seal(self, segment: _Segment) -> None:
+        segment.close()
+        try:
+            self._prune(keep=segment.path)
+        except OSError as exc:
+            self._last_error = str(exc)
+            self._logger.warning("tick 日志清理失败: %s", exc)
+
+    def _prune(self, keep: Path) -> None:
+        """按保留期与总字节上限删除最旧的已封段（段文件名按首条时间戳排序），刚封的段始终保留。"""
+        if self._retention_sec <= 0 and self._retention_max_bytes <= 0:
+            return
+        segments = [(path, path.stat()) for path in sorted(self._dir.glob("ticks-*.seg")) if path != keep]
+        now = time.time()
+        total = keep.stat().st_size + sum(stat.st_size for _, stat in segments)
+        for path, stat in segments:
+            expired = self._retention_sec > 0 and now - stat.st_mtime > self._retention_sec
+            oversize = self._retention_max_bytes > 0 and total > self._retention_max_bytes
+            if not expired and not oversize:
+                break
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
+            self._segments_pruned += 1
+
+    def _open_segment(self, first_ts: float, now: float) -> _Segment:
+        self._dir.mkdir(parents=True, exist_ok=True)
+        stem = f"ticks-{int(first_ts * 1000):013d}"
+        path = self._dir / f"{stem}.seg"
+        suffix = 1
+        while path.exists():
+            path = self._dir / f"{stem}-{suffix}.seg"
+            suffix += 1
+        return _Segment(path, self._segment_records, now)
+
+
+class TickJournalReader:
+    """按时间区间读取 tick 日志，跳过不相交的段，段内按时间戳二分定位。"""
+
+    def __init__(self, directory: str | Path) -> None:
+        self._dir = Path(directory)
+
+    def segments(self) -> list[Path]:
+        if not self._dir.exists():
+            return []
+        return sorted(self._dir.glob("ticks-*.seg"))
+
+    def read_range(
+        self,
+        start: datetime | float | None = None,
+        end: datetime | float | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> dict[str, array]:
+        """返回 [start, end] 内的列式数据（array('d')），字段缺省为全部。"""
+        names = tuple(fields) if fields else RECORD_FIELDS
+        unknown = [name for name in names if name not in _FIELD_INDEX]
+        if unknown:
+            raise ValueError(f"未知日志字段: {', '.join(unknown)}")
+        columns = {name: array("d") for name in names}
+        indexes = [(columns[name], _FIELD_INDEX[name]) for name in names]
+        for row in self.iter_records(start, end):
+            for column, idx in indexes:
+                column.append(row[idx])
+        return columns
+
+    def iter_records(
+        self,
+        start: datetime | float | None = None,
+        end: datetime | float | None = None,
+    ) -> Iterator[tuple[float, ...]]:
+        lo = self._to_ts(start, float("-inf"))
+        hi = self._to_ts(end, float("inf"))
+        for path in self.segments():
+            yield from self._iter_segment(path, lo, hi)
+
+    @staticmethod
+    def _to_ts(value: datetime | float | None, default: float) -> float:
+        if value is None:
+            return default
+        if isinstance(value, datetime):
+            return value.timestamp()
+        return float(value)
+
+    def _iter_segment(self, path: Path, lo: float, hi: float) -> Iterator[tuple[float, ...]]:
+        with open(path, "rb") as fh:
+            size = os.fstat(fh.fileno()).st_size
+            if size < HEADER_SIZE:
+                return
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                magic, version, nfields, record_size, count, first_ts, last_ts, _ = HEADER.unpack_from(view, 0)
+                if magic != MAGIC or version != JOURNAL_VERSION or record_size != RECORD.size:
+                    return
+                count = min(count, (size - HEADER_SIZE) // RECORD.size)
+                if count == 0 or last_ts < lo or first_ts > hi:
+                    return
+                ts_view = _TimestampView(view, count)
+                first = bisect_left(ts_view, lo)
+                last = bisect_right(ts_view, hi)
+                if first >= last:
+                    return
+                body = view[HEADER_SIZE + first * RECORD.size : HEADER_SIZE + last * RECORD.size]
+        yield from RECORD.iter_unpack(body)
+
+
+class _TimestampView:
+    """只解码 ts 列的序列视图，供二分查找使用。"""
+
+    _TS = struct.Struct("<d")
+
+    def __init__(self, view: mmap.mmap, count: int) -> None:
+        self._view = view
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> float:
+        return self._TS.unpack_from(self._view, HEADER_SIZE + index * RECORD.size)[0]
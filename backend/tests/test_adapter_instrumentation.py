@@ -0,0 +1,127 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import httpx
+from fastapi.testclient import TestClient
+
+from app.core.auth import create_access_token
+from app.core.settings import get_settings
+from app.exchange.base import PositionDustError
+from app.exchange.errors import classify_error
+from app.exchange.instrumented import AdapterTelemetry, InstrumentedAdapter, note_payload, track_endpoint
+from app.exchange.simulated import OrderRejectedError
+from app.main import create_app
+from app.models import CancelReplaceResult, OrderRequest, OrderSnapshot, utcnow
+from app.services.prometheus import ADAPTER_ERRORS_TOTAL
+
+
+def test_classify_error_prefers_types_over_message_text():
+    request = httpx.Request("POST", "https://example.invalid")
+    throttled = httpx.HTTPStatusError("x", request=request, response=httpx.Response(429, request=request))
+
+    assert classify_error(asyncio.TimeoutError()) == "timeout"
+    assert classify_error(httpx.ConnectError("refused", request=request)) == "network"
+    assert classify_error(throttled) == "rate_limit"
+    assert classify_error(PositionDustError("BNB_USDT_Perp", 0.001, 0.01)) == "position_dust"
+    assert classify_error(RuntimeError("missing event_time in ticker")) == "market_data"
+    assert classify_error(RuntimeError("Unauthorized")) == "auth"
+    assert classify_error(ValueError("size below step")) == "validation"
+    assert classify_error(RuntimeError("boom")) == "unknown"
+
+
+def test_wrapper_records_latency_payload_retries_and_error_class():
+    clock = Mock(return_value=1000.0)
+    telemetry = AdapterTelemetry(clock=clock)
+    inner = Mock()
+
+    async def fetch_open_orders(symbol):
+        with track_endpoint("fetch_open_orders"):
+            note_payload(40, 900)
+        return []
+
+    inner.fetch_open_orders = fetch_open_orders
+    inner.cancel_order = AsyncMock(side_effect=[asyncio.TimeoutError(), asyncio.TimeoutError(), None])
+    adapter = InstrumentedAdapter(inner, telemetry)
+    errors_before = ADAPTER_ERRORS_TOTAL.labels("cancel_order", "timeout").value
+
+    async def scenario():
+        await adapter.fetch_open_orders("BNB_USDT_Perp")
+        for _ in range(3):
+            try:
+                await adapter.cancel_order("BNB_USDT_Perp", "oid-1")
+            except asyncio.TimeoutError:
+                pass
+
+    asyncio.run(scenario())
+
+    rows = {(row["kind"], row["name"]): row for row in telemetry.snapshot()}
+    orders = rows[("method", "fetch_open_orders")]
+    assert (orders["calls"], orders["bytes_sent"], orders["bytes_received"]) == (1, 40, 900)
+    assert rows[("endpoint", "fetch_open_orders")]["bytes_received"] == 900
+    cancel = rows[("method", "cancel_order")]
+    assert (cancel["calls"], cancel["errors"], cancel["retries"]) == (3, 2, 2)
+    assert cancel["errors_by_class"] == {"timeout": 2}
+    assert cancel["calls_1m"] == 3 and cancel["time_1m_ms"] >= 0.0
+    assert ADAPTER_ERRORS_TOTAL.labels("cancel_order", "timeout").value == errors_before + 2
+
+    clock.return_value = 1000.0 + 120.0
+    assert {row["name"]: row["calls_1m"] for row in telemetry.snapshot() if row["kind"] == "method"} == {
+        "fetch_open_orders": 0,
+        "cancel_order": 0,
+    }
+
+
+
+def test_wrapper_records_per_item_errors_from_batch_and_replace_results():
+    telemetry = AdapterTelemetry()
+    inner = Mock()
+    order = OrderSnapshot(order_id="o1", side="buy", price=100.0, size=0.1, status="open", created_at=utcnow())
+    inner.place_limit_orders = AsyncMock(return_value=[order, OrderRejectedError("post_only_would_take")])
+    inner.cancel_orders = AsyncMock(return_value=[None, asyncio.TimeoutError()])
+    inner.cancel_replace_order = AsyncMock(
+        return_value=CancelReplaceResult(order=None, place_error=ValueError("size below step"), cancel_skipped=True)
+    )
+    adapter = InstrumentedAdapter(inner, telemetry)
+    request = OrderRequest(side="buy", price=100.0, size=0.1, client_order_id="1")
+    rejected_before = ADAPTER_ERRORS_TOTAL.labels("place_limit_order", "rejected").value
+
+    async def scenario():
+        await adapter.place_limit_orders("BNB_USDT_Perp", [request, request])
+        await adapter.cancel_orders("BNB_USDT_Perp", ["o1", "o2"])
+        await adapter.cancel_replace_order("BNB_USDT_Perp", "o1", request)
+
+    asyncio.run(scenario())
+
+    rows = {row["name"]: row for row in telemetry.snapshot() if row["kind"] == "method"}
+    place = rows["place_limit_order"]
+    assert (place["calls"], place["errors"], place["retries"]) == (3, 2, 1)
+    assert place["errors_by_class"] == {"rejected": 1, "validation": 1}
+    assert rows["cancel_order"]["calls"] == 2 and rows["cancel_order"]["errors_by_class"] == {"timeout": 1}
+    # 撤改时新单失败未发出撤单，不计入 cancel_order。
+    assert all(rows[name]["errors"] == 1 for name in ("place_limit_orders", "cancel_orders", "cancel_replace_order"))
+    assert ADAPTER_ERRORS_TOTAL.labels("place_limit_order", "rejected").value == rejected_before + 1
+
+
+def test_adapter_metrics_endpoint_lists_instrumented_calls(tmp_path, monkeypatch):
+    monkeypatch.setenv("RUNTIME_CONFIG_PATH", str(tmp_path / "runtime.json"))
+    monkeypatch.setenv("EXCHANGE_CONFIG_PATH", str(tmp_path / "exchange.json"))
+    monkeypatch.setenv("TELEGRAM_CONFIG_PATH", str(tmp_path / "telegram.json"))
+    monkeypatch.setenv("TICK_JOURNAL_DIR", str(tmp_path / "journal"))
+    monkeypatch.setenv("APP_JWT_SECRET", "test-secret")
+    get_settings.cache_clear()
+
+    app = create_app()
+    with TestClient(app) as client:
+        container = app.state.container
+        assert isinstance(container.adapter, InstrumentedAdapter)
+        container.adapter_telemetry.record("method", "place_limit_order", 12.5, exc=RuntimeError("rejected"))
+        token = create_access_token(get_settings(), "admin")
+        resp = client.get("/api/metrics/adapter", headers={"Authorization": f"Bearer {token}"})
+
+    assert resp.status_code == 200
+    row = resp.json()[0]
+    assert row["name"] == "place_limit_order"
+    assert row["errors_by_class"] == {"unknown": 1}
+    assert row["time_1m_ms"] == 12.5
+
+    get_settings.cache_clear()
@@ -1,4 +1,16 @@
-﻿from app.engine.adaptive import AdaptiveController
+﻿import math
+import random
+from statistics import mean, pstdev
+
+from app.engine.adaptive import AdaptiveController, _RollingStats
+
+
+def _reference_sigma(returns: list[float], window: int, lam: float = 0.94) -> float:
+    recent = returns[-window:]
+    ewma_var = max(recent[0] * recent[0], 1e-12)
+    for ret in recent[1:]:
+        ewma_var = lam * ewma_var + (1.0 - lam) * (ret * ret)
+    return max(1e-6, math.sqrt(max(ewma_var, 1e-12)))
 
 
 def test_sigma_and_zscore_progression():
@@ -23,3 +35,45 @@ def test_quote_size_factor_reduces_in_high_vol():
 
     factor = c.quote_size_factor()
     assert 0.2 <= factor <= 1.0
+
+
+def test_incremental_sigma_matches_windowed_ewma_across_window_changes():
+    rng = random.Random(7)
+    c = AdaptiveController(maxlen=2000)
+    price = 100.0
+    c.update(price, depth_score=1.0, trade_intensity=1.0)
+    returns: list[float] = []
+    window_sec = 30
+    for i in range(3000):
+        if i % 500 == 0:
+            window_sec = rng.choice([5, 30, 120, 300])
+        c.set_windows(window_sec, 0.5)
+        prev = price
+        price *= math.exp(rng.gauss(0.0, 0.002))
+        sigma, _ = c.update(price, depth_score=1.0, trade_intensity=1.0)
+        returns.append(math.log(price / prev))
+        if len(returns) >= 4:
+            window = max(10, min(600, int(round(window_sec / 0.5))))
+            assert abs(sigma - _reference_sigma(returns, window)) <= 1e-9 * sigma
+
+
+def test_rolling_stats_match_full_scan_after_eviction_and_resize():
+    rng = random.Random(11)
+    history = [rng.uniform(1e-4, 5e-3) for _ in range(2500)]
+    stats = _RollingStats(600)
+    for value in history:
+        stats.push(value)
+    assert abs(stats.mean() - mean(history[-600:])) < 1e-15
+    assert abs(stats.pstdev() - pstdev(history[-600:])) < 1e-12
+
+    stats.resize(1800, history)
+    assert len(stats) == 1800
+    assert abs(stats.pstdev() - pstdev(history[-1800:])) < 1e-12
+
+
+def test_zscore_stays_zero_for_flat_sigma():
+    c = AdaptiveController(maxlen=600)
+    for _ in range(200):
+        _, z = c.update(100.0, depth_score=1.0, trade_intensity=1.0)
+    assert z == 0.0
+    assert c.depth_factor() == 1.2
@@ -0,0 +1,137 @@
+import asyncio
+import json
+import time
+from unittest.mock import Mock
+
+import httpx
+
+from app.services.alerting import AlertService
+from app.services.telegram_config import TelegramConfigRecord
+
+
+def _store(token: str = "bot-token", chat_id: str = "42"):
+    store = Mock()
+    store.get = Mock(return_value=TelegramConfigRecord(telegram_bot_token=token, telegram_chat_id=chat_id))
+    return store
+
+
+def _service(handler, **kwargs) -> AlertService:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return AlertService(_store(), http_client=client, **kwargs)
+
+
+def test_send_event_does_not_wait_for_slow_telegram():
+    async def slow(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.5)
+        return httpx.Response(200, json={"ok": True})
+
+    async def scenario():
+        service = _service(slow, batch_window_sec=0.0)
+        started = time.perf_counter()
+        await service.send_event(level="WARN", event="ENGINE_ERROR", message="boom")
+        enqueue_ms = (time.perf_counter() - started) * 1000.0
+        await service.aclose()
+        return enqueue_ms, service.stats()
+
+    enqueue_ms, stats = asyncio.run(scenario())
+
+    assert enqueue_ms < 50
+    assert stats["sent_alerts"] == 1
+    assert stats["queue_depth"] == 0
+
+
+def test_burst_is_combined_into_single_message():
+    bodies: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(json.loads(request.content))
+        return httpx.Response(200, json={"ok": True})
+
+    async def scenario():
+        service = _service(handler, batch_window_sec=0.05)
+        for i in range(5):
+            await service.send_event(level="INFO", event=f"E{i}", message=f"m{i}")
+        await service.aclose()
+        return service.stats()
+
+    stats = asyncio.run(scenario())
+
+    assert len(bodies) == 1
+    assert bodies[0]["chat_id"] == "42"
+    assert all(f"[E{i}]" in bodies[0]["text"] for i in range(5))
+    assert stats["sent_batches"] == 1
+    assert stats["sent_alerts"] == 5
+
+
+def test_full_queue_drops_oldest_and_counts():
+    texts: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        texts.append(json.loads(request.content)["text"])
+        return httpx.Response(200, json={"ok": True})
+
+    async def scenario():
+        service = _service(handler, queue_size=2, batch_window_sec=0.0, max_batch=10)
+        for i in range(4):
+            await service.send_event(level="INFO", event=f"E{i}", message="x")
+        stats = service.stats()
+        await service.aclose()
+        return stats
+
+    stats = asyncio.run(scenario())
+
+    assert stats["dropped"] == 2
+    assert stats["queue_depth"] == 2
+    assert "[E0]" not in "".join(texts)
+    assert "[E3]" in "".join(texts)
+
+
+def test_unconfigured_telegram_skips_without_enqueue():
+    async def scenario():
+        service = AlertService(_store(token=""))
+        await service.send_event(level="INFO", event="X", message="y")
+        return service.stats()
+
+    assert asyncio.run(scenario())["enqueued"] == 0
+
+
+def test_failed_post_does_not_leak_bot_token(caplog):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(401, json={"ok": False})
+
+    async def scenario():
+        service = _service(handler, batch_window_sec=0.0)
+        await service.send_event(level="WARN", event="ENGINE_ERROR", message="boom")
+        await service.aclose()
+        return service.stats()
+
+    stats = asyncio.run(scenario())
+
+    assert stats["failed_batches"] == 1
+    assert stats["last_error"] == "HTTPStatusError: HTTP 401"
+    assert "bot-token" not in caplog.text
+
+
+def test_owned_client_is_closed_when_event_loop_changes(monkeypatch):
+    clients: list[httpx.AsyncClient] = []
+    real_client = httpx.AsyncClient
+
+    def build_client(**kwargs) -> httpx.AsyncClient:
+        client = real_client(transport=httpx.MockTransport(lambda request: httpx.Response(200, json={"ok": True})))
+        clients.append(client)
+        return client
+
+    monkeypatch.setattr("app.services.alerting.httpx.AsyncClient", build_client)
+    service = AlertService(_store(), batch_window_sec=0.0)
+
+    async def scenario():
+        await service.send_event(level="WARN", event="ENGINE_ERROR", message="boom")
+        await service._queue.join()  # noqa: SLF001
+
+    asyncio.run(scenario())
+    asyncio.run(scenario())
+
+    assert len(clients) == 2
+    assert clients[0].is_closed
+    assert not clients[1].is_closed
+    assert service.stats()["sent_alerts"] == 2
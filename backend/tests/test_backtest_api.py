@@ -73,4 +73,11 @@ def test_backtest_job_api(tmp_path, monkeypatch):
         assert report_resp.status_code == 200
         assert report_resp.json()["symbol"] == "BNB_USDT_Perp"
 
+        lanes_resp = client.get("/api/metrics/executors", headers=headers)
+        assert lanes_resp.status_code == 200
+        lanes = lanes_resp.json()
+        assert lanes["backtest"]["completed"] == 1
+        assert lanes["backtest"]["queue_depth"] == 0
+        assert {"grvt-trade", "grvt-read"} <= set(lanes)
+
     get_settings.cache_clear()
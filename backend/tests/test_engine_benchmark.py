@@ -0,0 +1,25 @@
+import json
+import sys
+from pathlib import Path
+
+from app.exchange.base import ExchangeAdapter
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+from bench_engine_hot_path import STAGES, InstantAdapter, compare, run_benchmark  # noqa: E402
+
+
+def test_hot_path_benchmark_reports_every_stage_per_tick():
+    assert issubclass(InstantAdapter, ExchangeAdapter)
+    result = run_benchmark(ticks=20, warmup=5)
+
+    assert result["ticks"] == 20
+    for name in STAGES:
+        assert result["stages"][name]["count"] == 20
+        assert result["allocations"]["stages"][name]["count"] == 20
+    assert result["tick"]["mean_us"] > sum(result["stages"][name]["mean_us"] for name in ("compute_quote", "post_only_guard"))
+    # 结果可直接落盘并与历史结果对比。
+    restored = json.loads(json.dumps(result))
+    lines = compare(result, restored)
+    assert len(lines) == 1 + 1 + len(STAGES)
+    assert all(line.endswith("+0.0%") for line in lines[1:])
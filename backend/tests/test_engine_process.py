@@ -0,0 +1,123 @@
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.auth import create_access_token
+from app.core.container import build_engine_stack
+from app.core.settings import Settings, get_settings
+from app.engine.process import EngineProcessClient, EngineProcessServer
+from app.main import create_app
+from app.services.event_bus import EventBus
+from app.services.exchange_config import ExchangeConfigStore
+from app.services.runtime_config import RuntimeConfigStore
+from app.services.telegram_config import TelegramConfigStore
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="引擎进程通过 unix socket 通信")
+
+
+def _settings(tmp_path, **overrides) -> Settings:
+    return Settings(
+        EXCHANGE_VENUE="simulated",
+        SIM_SEED=11,
+        SIM_TAKER_RATE_PER_SEC=20.0,
+        ENGINE_IPC_SOCKET=str(tmp_path / "engine.sock"),
+        ENGINE_STATE_INTERVAL_SEC=0.2,
+        TICK_JOURNAL_ENABLED=False,
+        RUNTIME_CONFIG_PATH=str(tmp_path / "runtime.json"),
+        EXCHANGE_CONFIG_PATH=str(tmp_path / "exchange.json"),
+        TELEGRAM_CONFIG_PATH=str(tmp_path / "telegram.json"),
+        **overrides,
+    )
+
+
+def test_client_drives_engine_server_over_unix_socket(tmp_path):
+    settings = _settings(tmp_path)
+    runtime_path = settings.runtime_config_file
+
+    async def scenario():
+        stores = (
+            RuntimeConfigStore(runtime_path),
+            ExchangeConfigStore(settings.exchange_config_file, settings),
+            TelegramConfigStore(settings.telegram_config_file, settings),
+        )
+        stores[0].update({"quote_interval_sec": 0.2, "tg_heartbeat_enabled": False})
+        server = EngineProcessServer(settings, build_engine_stack(settings, *stores), *stores)
+        serving = asyncio.create_task(server.serve())
+
+        api_bus = EventBus()
+        api_ticks = api_bus.subscribe(["tick"])
+        client = EngineProcessClient(settings, api_bus, start_timeout_sec=5.0)
+        await client.connect()
+        assert client.mode == "idle"
+
+        # 请求发出后被取消的调用不应让后续应答错位。
+        abandoned = asyncio.create_task(client._call("state"))  # noqa: SLF001
+        await asyncio.sleep(0)
+        abandoned.cancel()
+        assert await client.start() == "running"
+        await asyncio.wait_for(api_ticks.get(), timeout=5.0)
+        await asyncio.sleep(0.5)
+        assert client.monitor.summary.mid_price > 0
+        assert len(client.monitor.series()["mid_price"]) >= 2
+        assert "loop_elapsed_ms" in client.monitor.quantile_summary()
+
+        # API 进程改写配置文件后通知引擎进程重读。
+        api_store = RuntimeConfigStore(runtime_path)
+        api_store.update({"quote_interval_sec": 0.3})
+        await client.refresh_runtime_config()
+        assert stores[0].get().quote_interval_sec == 0.3
+
+        assert "mm_ticks_total" in await client.prometheus_text()
+        assert await client.stop() == "idle"
+        assert any(row["name"] == "place_limit_order" for row in client.state["adapter_calls"])
+
+        await client.close()
+        await asyncio.wait_for(serving, timeout=5.0)
+        assert not (tmp_path / "engine.sock").exists()
+
+    asyncio.run(scenario())
+
+
+def test_app_runs_engine_in_spawned_process(tmp_path, monkeypatch):
+    pytest.importorskip("uvloop")
+    for key, value in {
+        "RUNTIME_CONFIG_PATH": tmp_path / "runtime.json",
+        "EXCHANGE_CONFIG_PATH": tmp_path / "exchange.json",
+        "TELEGRAM_CONFIG_PATH": tmp_path / "telegram.json",
+        "TICK_JOURNAL_DIR": tmp_path / "journal",
+        "ENGINE_IPC_SOCKET": tmp_path / "engine.sock",
+    }.items():
+        monkeypatch.setenv(key, str(value))
+    monkeypatch.setenv("APP_JWT_SECRET", "test-secret")
+    monkeypatch.setenv("EXCHANGE_VENUE", "simulated")
+    monkeypatch.setenv("SIM_SEED", "5")
+    monkeypatch.setenv("ENGINE_PROCESS", "true")
+    monkeypatch.setenv("ENGINE_UVLOOP", "true")
+    monkeypatch.setenv("ENGINE_STATE_INTERVAL_SEC", "0.2")
+    get_settings.cache_clear()
+
+    app = create_app()
+    headers = {"Authorization": f"Bearer {create_access_token(get_settings(), 'admin')}"}
+    with TestClient(app) as client:
+        info = client.get("/api/engine/process", headers=headers).json()
+        assert info["dedicated"] is True and info["pid"] != os.getpid()
+        assert info["event_loop"] == "uvloop"
+
+        assert client.post("/api/engine/start", headers=headers).json()["mode"] == "running"
+        deadline = time.monotonic() + 10.0
+        while client.get("/api/metrics", headers=headers).json()["summary"]["mid_price"] <= 0:
+            assert time.monotonic() < deadline
+            time.sleep(0.1)
+        assert client.get("/api/status", headers=headers).json()["mode"] == "running"
+        body = client.get("/metrics", headers=headers).text
+        assert body.count("# TYPE mm_ticks_total counter\n") == 1
+        assert "# TYPE mm_stream_subscriber_pending gauge\n" in body
+
+        assert client.post("/api/engine/stop", headers=headers).json()["mode"] == "idle"
+    assert not (tmp_path / "engine.sock").exists()
+
+    get_settings.cache_clear()
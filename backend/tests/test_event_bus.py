@@ -0,0 +1,108 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+
+import orjson
+from fastapi.testclient import TestClient
+
+from app.core.auth import create_access_token
+from app.core.settings import get_settings
+from app.main import create_app
+from app.services.event_bus import EventBus
+
+
+def test_topic_filtered_subscribers_share_one_encoded_event(monkeypatch):
+    calls = 0
+    real_dumps = orjson.dumps
+
+    def counting_dumps(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        return real_dumps(*args, **kwargs)
+
+    monkeypatch.setattr("app.services.event_bus.orjson.dumps", counting_dumps)
+
+    async def scenario():
+        bus = EventBus(queue_size=8)
+        everything = bus.subscribe()
+        ticks = [bus.subscribe(["tick"]) for _ in range(5)]
+        closes = bus.subscribe(["close_*", "error"])
+        await bus.publish("tick", {"summary": {"mid": 100.0}, "at": datetime(2026, 1, 1, tzinfo=timezone.utc)})
+        await bus.publish("close_done", {"symbol": "BNB_USDT_Perp"})
+        await bus.publish("config", {"k": 1})
+        return everything, ticks, closes
+
+    everything, ticks, closes = asyncio.run(scenario())
+
+    assert calls == 3
+    tick_events = [sub.get_nowait() for sub in ticks]
+    assert all(event is tick_events[0] for event in tick_events)
+    assert orjson.loads(tick_events[0].data)["payload"]["at"] == "2026-01-01T00:00:00+00:00"
+    assert closes.qsize() == 1 and closes.get_nowait().type == "close_done"
+    assert [everything.get_nowait().type for _ in range(3)] == ["tick", "close_done", "config"]
+
+
+def test_publish_without_matching_subscriber_skips_encoding(monkeypatch):
+    monkeypatch.setattr("app.services.event_bus.orjson.dumps", None)
+
+    async def scenario():
+        bus = EventBus()
+        bus.subscribe(["error"])
+        await bus.publish("tick", {"x": 1})
+
+    asyncio.run(scenario())
+
+
+def test_slow_subscriber_conflates_ticks_but_keeps_discrete_events():
+    async def scenario():
+        bus = EventBus(queue_size=8)
+        slow = bus.subscribe()
+        raw = bus.subscribe(["tick"], conflate=False)
+        for n in range(100):
+            await bus.publish("tick", {"n": n})
+            if n == 40:
+                await bus.publish("close_done", {"n": n})
+            if n == 60:
+                await bus.publish("error", {"n": n})
+        stats_before = {item["id"]: item for item in bus.stats()}
+        drained = [await slow.get() for _ in range(slow.qsize())]
+        return slow, raw, stats_before, drained, bus.stats()
+
+    slow, raw, before, drained, after = asyncio.run(scenario())
+
+    assert [(event.type, event.payload["n"]) for event in drained] == [("tick", 99), ("close_done", 40), ("error", 60)]
+    assert before[slow.id]["pending"] == 3
+    assert before[slow.id]["conflated"] == 99
+    assert before[slow.id]["dropped"] == 0
+    assert before[slow.id]["lag_ms"] >= 0.0
+    # 关闭合并的订阅者仍按队列上限丢旧。
+    assert raw.qsize() == 8
+    assert before[raw.id]["dropped"] == 92
+    assert after[0]["pending"] == 0 and after[0]["delivered"] == 3
+
+
+def test_stream_ws_filters_topics(tmp_path, monkeypatch):
+    monkeypatch.setenv("RUNTIME_CONFIG_PATH", str(tmp_path / "runtime.json"))
+    monkeypatch.setenv("EXCHANGE_CONFIG_PATH", str(tmp_path / "exchange.json"))
+    monkeypatch.setenv("TELEGRAM_CONFIG_PATH", str(tmp_path / "telegram.json"))
+    monkeypatch.setenv("APP_JWT_SECRET", "test-secret")
+    get_settings.cache_clear()
+
+    app = create_app()
+    with TestClient(app) as client:
+        token = create_access_token(get_settings(), "admin")
+        bus = app.state.container.event_bus
+        with client.websocket_connect(f"/ws/stream?token={token}&topics=error") as ws:
+            hello = ws.receive_json()
+            assert hello["payload"]["topics"] == ["error"]
+            client.portal.call(bus.publish, "tick", {"n": 1})
+            client.portal.call(bus.publish, "error", {"message": "boom"})
+            event = json.loads(ws.receive_text())
+            assert event["type"] == "error"
+            assert event["payload"] == {"message": "boom"}
+
+        headers = {"Authorization": f"Bearer {token}"}
+        stats = client.get("/api/metrics/stream", headers=headers).json()
+        assert stats == []
+
+    get_settings.cache_clear()
@@ -0,0 +1,114 @@
+import asyncio
+from functools import partial
+from unittest.mock import AsyncMock, Mock
+
+from app.core.settings import Settings
+from app.exchange.base import ExchangeAdapter
+from app.exchange.grvt_live import GrvtLiveAdapter
+from app.models import OrderRequest, OrderSnapshot, utcnow
+
+
+def _adapter():
+    adapter = Mock()
+    for name in ("place_limit_orders", "cancel_orders", "cancel_replace_order"):
+        setattr(adapter, name, partial(getattr(ExchangeAdapter, name), adapter))
+    return adapter
+
+
+def _placed(**kwargs) -> OrderSnapshot:
+    if kwargs["price"] <= 0:
+        raise ValueError("bad price")
+    return OrderSnapshot(
+        order_id=f"oid-{kwargs['client_order_id']}",
+        side=kwargs["side"],
+        price=kwargs["price"],
+        size=kwargs["size"],
+        status="open",
+        created_at=utcnow(),
+        client_order_id=kwargs["client_order_id"],
+    )
+
+
+def test_bulk_place_returns_per_request_results():
+    adapter = _adapter()
+    adapter.place_limit_order = AsyncMock(side_effect=_placed)
+
+    results = asyncio.run(
+        adapter.place_limit_orders(
+            "BNB_USDT_Perp",
+            [OrderRequest(side="buy", price=100.0, size=0.1, client_order_id="1"), OrderRequest(side="sell", price=0.0, size=0.1, client_order_id="2")],
+        )
+    )
+
+    assert results[0].order_id == "oid-1"
+    assert isinstance(results[1], ValueError)
+
+
+def test_bulk_cancel_reports_failures_by_position():
+    adapter = _adapter()
+    adapter.cancel_order = AsyncMock(side_effect=[None, RuntimeError("gone")])
+
+    results = asyncio.run(adapter.cancel_orders("BNB_USDT_Perp", ["a", "b"]))
+
+    assert results[0] is None
+    assert isinstance(results[1], RuntimeError)
+
+
+def test_cancel_replace_keeps_new_order_when_cancel_fails():
+    adapter = _adapter()
+    adapter.place_limit_order = AsyncMock(side_effect=_placed)
+    adapter.cancel_order = AsyncMock(side_effect=RuntimeError("cancel timeout"))
+
+    result = asyncio.run(
+        adapter.cancel_replace_order("BNB_USDT_Perp", "old", OrderRequest(side="buy", price=100.0, size=0.1, client_order_id="9"))
+    )
+
+    assert result.order is not None and result.order.order_id == "oid-9"
+    assert result.place_error is None
+    assert str(result.cancel_error) == "cancel timeout"
+
+
+def test_cancel_replace_skips_cancel_when_place_fails():
+    adapter = _adapter()
+    adapter.place_limit_order = AsyncMock(side_effect=RuntimeError("post only"))
+    adapter.cancel_order = AsyncMock()
+
+    result = asyncio.run(
+        adapter.cancel_replace_order("BNB_USDT_Perp", "old", OrderRequest(side="buy", price=100.0, size=0.1, client_order_id="9"))
+    )
+
+    assert result.order is None and str(result.place_error) == "post only"
+    assert result.cancel_skipped is True and result.cancel_error is None
+    adapter.cancel_order.assert_not_awaited()
+
+
+def test_grvt_cancel_replace_dispatches_cancel_alongside_place():
+    adapter = GrvtLiveAdapter(Settings())
+    in_flight = 0
+    peak = 0
+
+    async def round_trip():
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+
+    async def placed(**kwargs):
+        await round_trip()
+        raise RuntimeError("post only")
+
+    async def canceled(symbol, order_id):
+        await round_trip()
+
+    adapter.place_limit_order = placed
+    adapter.cancel_order = canceled
+
+    result = asyncio.run(
+        adapter.cancel_replace_order("BNB_USDT_Perp", "old", OrderRequest(side="buy", price=100.0, size=0.1, client_order_id="9"))
+    )
+
+    # 撤单与下单同时在途；新单失败时旧单已撤，由引擎补挂。
+    assert peak == 2
+    assert str(result.place_error) == "post only"
+    assert result.cancel_error is None and result.cancel_skipped is False
@@ -0,0 +1,95 @@
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from app.backtest.replay import replay_session
+from app.engine.strategy_engine import StrategyEngine
+from app.exchange.base import PositionDustError
+from app.exchange.errors import classify_error
+from app.exchange.recording import RecordingAdapter, ReplayAdapter, ReplayExhaustedError, decode_value, encode_value
+from app.exchange.simulated import OrderRejectedError, SimulatedExchangeAdapter, SimulatedVenueConfig
+from app.models import CancelReplaceResult, OrderSnapshot
+from app.schemas import RuntimeConfig
+from app.services.monitoring import MonitoringService
+
+SYMBOL = "BNB_USDT_Perp"
+
+
+def test_encoding_round_trips_models_and_exceptions():
+    created = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    order = OrderSnapshot("oid-1", "buy", 100.0, 0.1, "open", created, "c1")
+    result = CancelReplaceResult(order=order, cancel_error=OrderRejectedError("post_only_would_take"))
+
+    decoded = decode_value(encode_value(result))
+
+    assert decoded.order == order
+    assert classify_error(decoded.cancel_error) == "rejected"
+    dust = decode_value(encode_value(PositionDustError(SYMBOL, 0.001, 0.01)))
+    assert isinstance(dust, PositionDustError) and dust.min_close_size == 0.01
+
+
+def test_replay_returns_recorded_responses_in_order(tmp_path):
+    path = tmp_path / "session.jsonl.gz"
+    clock = Mock(return_value=1000.0)
+    venue = SimulatedExchangeAdapter(SimulatedVenueConfig(taker_rate_per_sec=0.0, seed=1), clock=clock)
+    recorder = RecordingAdapter(venue, path)
+
+    async def record():
+        first = await recorder.fetch_market_snapshot(SYMBOL)
+        clock.return_value = 1001.0
+        second = await recorder.fetch_market_snapshot(SYMBOL)
+        placed = await recorder.place_limit_order(SYMBOL, "buy", first.bid, 0.01, True, "c-live")
+        with pytest.raises(OrderRejectedError):
+            await recorder.place_limit_order(SYMBOL, "buy", first.ask + 1, 0.01, True, "c-reject")
+        await recorder.close()
+        return first, second, placed
+
+    first, second, placed = asyncio.run(record())
+    replay = ReplayAdapter(path, speed=0.0)
+
+    async def play():
+        assert await replay.fetch_market_snapshot(SYMBOL) == first
+        assert await replay.fetch_market_snapshot(SYMBOL) == second
+        again = await replay.place_limit_order(SYMBOL, "buy", 1.0, 0.01, True, "c-replay")
+        assert again.order_id == placed.order_id and again.client_order_id == "c-replay"
+        with pytest.raises(Exception) as exc_info:
+            await replay.place_limit_order(SYMBOL, "buy", 1.0, 0.01, True, "c-2")
+        assert classify_error(exc_info.value) == "rejected"
+        assert replay.remaining == 0 and replay.finished.is_set()
+        with pytest.raises(ReplayExhaustedError):
+            await replay.fetch_market_snapshot(SYMBOL)
+
+    asyncio.run(play())
+
+
+def test_recorded_engine_session_replays_faster_than_recorded(tmp_path):
+    path = tmp_path / "engine.jsonl.gz"
+    recorder = RecordingAdapter(SimulatedExchangeAdapter(SimulatedVenueConfig(seed=3, taker_rate_per_sec=20.0)), path)
+    config_store = Mock()
+    config_store.get = Mock(return_value=RuntimeConfig(symbol=SYMBOL, quote_interval_sec=0.2, tg_heartbeat_enabled=False))
+    engine = StrategyEngine(
+        adapter=recorder,
+        config_store=config_store,
+        monitor=MonitoringService(max_points=100),
+        event_bus=Mock(publish=AsyncMock()),
+        alert_service=Mock(send_event=AsyncMock()),
+    )
+
+    async def record():
+        engine._mode = "running"  # noqa: SLF001
+        task = asyncio.create_task(engine._run_loop())  # noqa: SLF001
+        await asyncio.sleep(1.0)
+        engine._stop_event.set()  # noqa: SLF001
+        await task
+        await recorder.close()
+
+    asyncio.run(record())
+
+    result = asyncio.run(replay_session(path, speed=0.0, timeout_sec=10.0))
+
+    assert result["ticks"] >= 4
+    assert result["wall_sec"] < 1.0
+    assert result["replayed"] >= result["records"] - 5
+    assert result["cpu_ms_per_tick"] is not None
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+from app.core.executor import ExecutorLane
+from app.core.settings import Settings
+from app.exchange.grvt_live import GrvtLiveAdapter
+
+
+def test_lane_reports_queue_depth_and_wait_when_saturated():
+    lane = ExecutorLane("unit", max_workers=1)
+    release = threading.Event()
+
+    async def scenario():
+        blocker = asyncio.create_task(lane.run(release.wait, 5))
+        queued = asyncio.create_task(lane.run(lambda: "done"))
+        await asyncio.sleep(0.05)
+        during = lane.stats()
+        release.set()
+        results = await asyncio.gather(blocker, queued)
+        return during, results, lane.stats()
+
+    try:
+        during, results, after = asyncio.run(scenario())
+    finally:
+        lane.shutdown()
+
+    assert during["running"] == 1
+    assert during["queue_depth"] == 1
+    assert results == [True, "done"]
+    assert after["queue_depth"] == 0
+    assert after["completed"] == 2
+    assert after["wait_ms_max"] >= 40.0
+
+
+class _SlowReadClient:
+    def __init__(self, release: threading.Event) -> None:
+        self._release = release
+
+    def fetch_balance(self, type: str) -> dict:
+        self._release.wait(5)
+        return {}
+
+    def cancel_all_orders(self, params: dict) -> bool:
+        return True
+
+
+def test_trade_lane_not_blocked_by_saturated_read_lane():
+    release = threading.Event()
+    adapter = GrvtLiveAdapter(Settings(GRVT_READ_WORKERS=1, GRVT_TRADE_WORKERS=1))
+    adapter.__dict__["_client"] = _SlowReadClient(release)
+
+    async def scenario():
+        reads = [asyncio.create_task(adapter.fetch_account_funds()) for _ in range(3)]
+        await asyncio.sleep(0.02)
+        await asyncio.wait_for(adapter.cancel_all_orders("BNB_USDT_Perp"), timeout=1.0)
+        stats = adapter.executor_stats()
+        release.set()
+        await asyncio.gather(*reads)
+        await adapter.close()
+        return stats
+
+    stats = asyncio.run(scenario())
+
+    assert stats["grvt-trade"]["completed"] == 1
+    assert stats["grvt-read"]["queue_depth"] == 2
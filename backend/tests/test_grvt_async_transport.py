@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+
+import httpx
+from eth_account import Account
+from pysdk.grvt_ccxt import GrvtCcxt
+from pysdk.grvt_ccxt_base import GrvtCcxtBase
+from pysdk.grvt_ccxt_env import GrvtEnv
+
+from app.core.settings import Settings
+from app.exchange.grvt_async_transport import GrvtAsyncTransport
+from app.exchange.grvt_live import GrvtLiveAdapter
+from app.services.prometheus import ADAPTER_CALL_SECONDS
+
+
+def _offline_sdk() -> GrvtCcxt:
+    # 跳过 GrvtCcxt.__init__ 中的登录与 load_markets 网络调用。
+    sdk = GrvtCcxt.__new__(GrvtCcxt)
+    GrvtCcxtBase.__init__(
+        sdk,
+        GrvtEnv.TESTNET,
+        parameters={"trading_account_id": "1001", "private_key": Account.create().key.hex()},
+        order_book_ccxt_format=True,
+    )
+    sdk._cookie = {"gravity": "cookie-token", "X-Grvt-Account-Id": "acc-1"}
+    sdk.markets = {"BNB_USDT_Perp": {"instrument_hash": "0x1234", "base_decimals": 9}}
+    return sdk
+
+
+def _transport(handler) -> GrvtAsyncTransport:
+    return GrvtAsyncTransport(_offline_sdk(), http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+
+def test_transport_signs_order_and_reuses_session_cookie():
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path.endswith("create_order"):
+            body = json.loads(request.content)
+            return httpx.Response(200, json={"result": {"order_id": "0xabc", "metadata": body["order"]["metadata"]}})
+        return httpx.Response(200, json={"result": {"ack": True}})
+
+    async def scenario():
+        transport = _transport(handler)
+        try:
+            created = await transport.create_order(
+                "BNB_USDT_Perp", "limit", "buy", 0.5, 600.0, {"post_only": True, "client_order_id": "42"}
+            )
+            acked = await transport.cancel_order("0xabc", "BNB_USDT_Perp", {})
+            return created, acked
+        finally:
+            await transport.aclose()
+
+    created, acked = asyncio.run(scenario())
+
+    assert created["order_id"] == "0xabc"
+    assert acked is True
+    order = json.loads(requests[0].content)["order"]
+    assert order["sub_account_id"] == "1001"
+    assert order["post_only"] is True
+    assert order["metadata"]["client_order_id"] == "42"
+    assert order["signature"]["r"] and order["signature"]["s"]
+    assert json.loads(requests[1].content) == {"sub_account_id": "1001", "order_id": "0xabc"}
+    for request in requests:
+        assert request.headers["Cookie"] == "gravity=cookie-token"
+        assert request.headers["X-Grvt-Account-Id"] == "acc-1"
+
+
+def test_transport_signs_order_off_the_event_loop_thread():
+    sign_threads: list[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"result": {"order_id": "0xabc"}})
+
+    async def runner(fn, *args):
+        def call():
+            sign_threads.append(threading.get_ident())
+            return fn(*args)
+
+        return await asyncio.to_thread(call)
+
+    async def scenario():
+        sdk = _offline_sdk()
+        transport = GrvtAsyncTransport(
+            sdk, http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)), sign_runner=runner
+        )
+        try:
+            await transport.create_order("BNB_USDT_Perp", "limit", "buy", 0.5, 600.0, {"post_only": True})
+            return threading.get_ident()
+        finally:
+            await transport.aclose()
+
+    loop_thread = asyncio.run(scenario())
+
+    assert sign_threads and sign_threads[0] != loop_thread
+
+
+def test_transport_http_error_returns_unacked_instead_of_raising():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(500, json={"code": 1000, "message": "internal"})
+
+    async def scenario():
+        transport = _transport(handler)
+        try:
+            return await transport.cancel_all_orders({"kind": "PERPETUAL"})
+        finally:
+            await transport.aclose()
+
+    assert asyncio.run(scenario()) is False
+
+
+def test_live_adapter_routes_rest_through_async_transport():
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path.endswith("open_orders")
+        return httpx.Response(
+            200,
+            json={
+                "result": [
+                    {
+                        "order_id": "0x01",
+                        "legs": [{"instrument": "BNB_USDT_Perp", "limit_price": "600.5", "size": "0.2", "is_buying_asset": True}],
+                        "metadata": {"client_order_id": "7"},
+                        "state": {"status": "OPEN"},
+                    },
+                    {"order_id": "0x02", "legs": [{"instrument": "ETH_USDT_Perp"}]},
+                ]
+            },
+        )
+
+    async def scenario():
+        adapter = GrvtLiveAdapter(Settings(GRVT_ASYNC_HTTP_ENABLED=True))
+        transport = _transport(handler)
+        adapter.__dict__["_client"] = transport._sdk  # noqa: SLF001
+        adapter._async_transport = transport  # noqa: SLF001
+        try:
+            return await adapter.fetch_open_orders("BNB_USDT-PERP")
+        finally:
+            await adapter.close()
+
+    observed = ADAPTER_CALL_SECONDS.labels("fetch_open_orders", "ok").count
+    orders = asyncio.run(scenario())
+
+    assert ADAPTER_CALL_SECONDS.labels("fetch_open_orders", "ok").count == observed + 1
+    assert [o.order_id for o in orders] == ["0x01"]
+    assert orders[0].side == "buy"
+    assert orders[0].price == 600.5
+    assert orders[0].client_order_id == "7"
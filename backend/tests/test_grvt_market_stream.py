@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+import websockets
+
+from app.core.settings import Settings
+from app.exchange.grvt_live import GrvtLiveAdapter
+from app.exchange.grvt_market_stream import BookSequenceGap, GrvtMarketStream
+
+
+class _RestClient:
+    def __init__(self) -> None:
+        self.ticker_calls = 0
+
+    def fetch_ticker(self, symbol: str) -> dict:
+        self.ticker_calls += 1
+        return {"best_bid_price": 500.0, "best_ask_price": 500.2, "mid_price": 500.1}
+
+    def fetch_order_book(self, symbol: str, depth: int) -> dict:
+        return {}
+
+
+async def _fake_market_server(subscriptions: list[dict]):
+    async def handler(ws):
+        for _ in range(2):
+            subscriptions.append(json.loads(await ws.recv()))
+        frames = (
+            {
+                "stream": "v1.book.d",
+                "selector": "BNB_USDT_Perp@100",
+                "feed": {
+                    "instrument": "BNB_USDT_Perp",
+                    "sequence_number": "0",
+                    "bids": [{"price": "610.0", "size": "5.0"}],
+                    "asks": [{"price": "610.3", "size": "8.0"}],
+                },
+            },
+            {
+                "stream": "v1.book.d",
+                "selector": "BNB_USDT_Perp@100",
+                "feed": {
+                    "instrument": "BNB_USDT_Perp",
+                    "sequence_number": "1",
+                    "prev_sequence_number": "0",
+                    "bids": [{"price": "610.1", "size": "12.0"}, {"price": "610.0", "size": "0"}],
+                    "asks": [],
+                },
+            },
+            {
+                "stream": "v1.ticker.d",
+                "selector": "BNB_USDT_Perp@100",
+                "feed": {"best_bid_price": "610.1", "best_ask_price": "610.3", "mid_price": "610.2"},
+            },
+        )
+        for frame in frames:
+            await ws.send(json.dumps(frame))
+        await ws.wait_closed()
+
+    return await websockets.serve(handler, "127.0.0.1", 0)
+
+
+def _stream_adapter(port: int, stale_sec: float = 5.0) -> tuple[GrvtLiveAdapter, _RestClient]:
+    settings = Settings(
+        GRVT_MARKET_STREAM_ENABLED=True,
+        GRVT_MARKET_WS_URL=f"ws://127.0.0.1:{port}",
+        GRVT_MARKET_STREAM_STALE_SEC=stale_sec,
+    )
+    adapter = GrvtLiveAdapter(settings)
+    client = _RestClient()
+    adapter.__dict__["_client"] = client
+    return adapter, client
+
+
+def test_market_snapshot_served_from_stream():
+    async def scenario():
+        subscriptions: list[dict] = []
+        server = await _fake_market_server(subscriptions)
+        port = server.sockets[0].getsockname()[1]
+        adapter, client = _stream_adapter(port)
+        try:
+            first = await adapter.fetch_market_snapshot("BNB_USDT-PERP")
+            for _ in range(100):
+                await asyncio.sleep(0.01)
+                snap = await adapter.fetch_market_snapshot("BNB_USDT-PERP")
+                if snap.bid == 610.1:
+                    break
+            return first, snap, client.ticker_calls, subscriptions
+        finally:
+            await adapter.close()
+            server.close()
+            await server.wait_closed()
+
+    first, snap, rest_calls, subscriptions = asyncio.run(scenario())
+
+    # 首个 tick 订阅尚未就绪，走 REST 兜底。
+    assert first.bid == 500.0
+    assert snap.bid == 610.1
+    assert snap.ask == 610.3
+    assert abs(snap.mid - 610.2) < 1e-9
+    assert snap.depth_score == 1.0
+    assert {item["stream"] for item in subscriptions} == {"v1.book.d", "v1.ticker.d"}
+    assert all(item["feed"] == ["BNB_USDT_Perp@100"] for item in subscriptions)
+    assert rest_calls < 100
+
+
+def test_market_snapshot_falls_back_to_rest_when_stream_stale():
+    async def scenario():
+        subscriptions: list[dict] = []
+        server = await _fake_market_server(subscriptions)
+        port = server.sockets[0].getsockname()[1]
+        adapter, client = _stream_adapter(port, stale_sec=0.05)
+        try:
+            await adapter.fetch_market_snapshot("BNB_USDT_Perp")
+            for _ in range(100):
+                await asyncio.sleep(0.01)
+                if adapter._market_stream.latest(1.0) is not None:  # noqa: SLF001
+                    break
+            await asyncio.sleep(0.1)
+            calls_before = client.ticker_calls
+            snap = await adapter.fetch_market_snapshot("BNB_USDT_Perp")
+            return snap, client.ticker_calls - calls_before
+        finally:
+            await adapter.close()
+            server.close()
+            await server.wait_closed()
+
+    snap, rest_calls = asyncio.run(scenario())
+
+    assert rest_calls == 1
+    assert snap.bid == 500.0
+
+
+def test_book_delta_sequence_gap_forces_resubscribe():
+    stream = GrvtMarketStream("ws://unused", "BNB_USDT_Perp", lambda ticker, book: None)
+    stream._apply_book_delta({"sequence_number": "0", "bids": [{"price": "1.0", "size": "1"}], "asks": []})  # noqa: SLF001
+    stream._apply_book_delta({"sequence_number": "1", "prev_sequence_number": "0", "bids": [], "asks": []})  # noqa: SLF001
+
+    with pytest.raises(BookSequenceGap):
+        stream._apply_book_delta({"sequence_number": "5", "prev_sequence_number": "4", "bids": [], "asks": []})  # noqa: SLF001
@@ -0,0 +1,104 @@
+import asyncio
+import gc
+import threading
+import time
+from unittest.mock import AsyncMock, Mock
+
+from app.engine.strategy_engine import StrategyEngine
+from app.exchange.simulated import SimulatedExchangeAdapter, SimulatedVenueConfig
+from app.schemas import RuntimeConfig
+from app.services.loop_monitor import GcPauseMonitor, LoopMonitor
+from app.services.monitoring import MonitoringService
+from app.services.prometheus import EVENT_LOOP_LAG_SECONDS, GC_PAUSE_SECONDS, REGISTRY
+
+
+def test_probe_measures_blocking_and_gc_pauses_by_generation():
+    monitor = MonitoringService(max_points=10)
+    loop_monitor = LoopMonitor(probe_interval_sec=0.01, monitor=monitor)
+    lag_before = EVENT_LOOP_LAG_SECONDS.labels().count
+    gen2_before = GC_PAUSE_SECONDS.labels("2").count
+
+    async def scenario():
+        loop_monitor.start()
+        await asyncio.sleep(0.03)
+        time.sleep(0.08)
+        await asyncio.sleep(0.03)
+        gc.collect(2)
+        health = loop_monitor.drain()
+        await loop_monitor.stop()
+        return health
+
+    health = asyncio.run(scenario())
+
+    assert health["loop_lag_max_ms"] >= 50.0
+    assert health["gc_collections"] >= 1 and health["gc_pause_ms"] > 0
+    assert loop_monitor.drain()["loop_lag_max_ms"] == 0.0
+    assert EVENT_LOOP_LAG_SECONDS.labels().count > lag_before
+    assert GC_PAUSE_SECONDS.labels("2").count > gen2_before
+    assert loop_monitor.snapshot()["gc"][2]["collections"] >= 1
+    assert "event_loop_lag_ms" in monitor.quantile_summary()
+    assert loop_monitor.gc._on_gc not in gc.callbacks  # noqa: SLF001
+
+
+def test_engine_reports_loop_health_and_alerts_above_interval_ratio():
+    loop_monitor = LoopMonitor(alert_ratio=0.5)
+    # 报价间隔 0.2s、比例 0.5 时阈值为 100ms。
+    loop_monitor.probe.observe(150.0)
+    config_store = Mock()
+    config_store.get = Mock(return_value=RuntimeConfig(symbol="BNB_USDT_Perp", quote_interval_sec=0.2, tg_heartbeat_enabled=False))
+    event_bus = Mock(publish=AsyncMock())
+    alert = Mock(send_event=AsyncMock())
+    engine = StrategyEngine(
+        adapter=SimulatedExchangeAdapter(SimulatedVenueConfig(seed=5, taker_rate_per_sec=0.0)),
+        config_store=config_store,
+        monitor=MonitoringService(max_points=100),
+        event_bus=event_bus,
+        alert_service=alert,
+        loop_monitor=loop_monitor,
+    )
+
+    async def scenario():
+        engine._mode = "running"  # noqa: SLF001
+        task = asyncio.create_task(engine._run_loop())  # noqa: SLF001
+        await asyncio.sleep(0.5)
+        engine._stop_event.set()  # noqa: SLF001
+        await asyncio.wait_for(task, timeout=5.0)
+
+    asyncio.run(scenario())
+
+    ticks = [call.args[1] for call in event_bus.publish.await_args_list if call.args[0] == "tick"]
+    assert len(ticks) >= 2
+    assert ticks[0]["diagnostics"]["loop_lag_max_ms"] == 150.0
+    assert ticks[1]["diagnostics"]["loop_lag_max_ms"] == 0.0
+    assert "gc_pause_ms" in ticks[0]["diagnostics"]
+    lag_alerts = [call.kwargs for call in alert.send_event.await_args_list if call.kwargs.get("event") == "LOOP_LAG"]
+    assert len(lag_alerts) == 1
+    assert lag_alerts[0]["details"]["threshold_ms"] == 100.0
+
+
+def test_gc_callback_does_not_deadlock_while_rendering_metrics():
+    monitor = GcPauseMonitor()
+    before = GC_PAUSE_SECONDS.labels("0").count
+    threshold = gc.get_threshold()
+    done = threading.Event()
+
+    def scrape():
+        # 每次分配都可能触发回收，渲染持有直方图锁时回调不得再取同一把锁。
+        for _ in range(200):
+            GC_PAUSE_SECONDS.labels("0").observe(0.0)
+            REGISTRY.render()
+        done.set()
+
+    monitor.install()
+    gc.set_threshold(1)
+    try:
+        worker = threading.Thread(target=scrape, daemon=True)
+        worker.start()
+        worker.join(timeout=10.0)
+    finally:
+        gc.set_threshold(*threshold)
+        monitor.uninstall()
+
+    assert done.is_set()
+    monitor.flush()
+    assert GC_PAUSE_SECONDS.labels("0").count > before + 200
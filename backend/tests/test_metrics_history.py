@@ -0,0 +1,140 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+
+from app.core.auth import create_access_token
+from app.core.settings import get_settings
+from app.main import create_app
+from app.models import EngineTick, MarketSnapshot, PositionSnapshot, QuoteDecision
+from app.services.metrics_history import (
+    HistoryPoint,
+    MetricsHistory,
+    RollupWriter,
+    downsample_lttb,
+    read_rollup,
+    rollup_path,
+)
+from app.services.tick_journal import RECORD_FIELDS, TickJournal
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _tick(seconds: float, mid: float) -> EngineTick:
+    ts = T0 + timedelta(seconds=seconds)
+    return EngineTick(
+        timestamp=ts,
+        market=MarketSnapshot("BNB_USDT_Perp", mid - 0.05, mid + 0.05, mid, 1.0, 0.5, ts),
+        decision=QuoteDecision(mid - 0.1, mid + 0.1, 0.2, 120.0, 3.3, 0.1, mid),
+        position=PositionSnapshot("BNB_USDT_Perp", 0.1, 60.0),
+        equity=1000.0,
+        pnl=0.0,
+        pnl_total=seconds / 100.0,
+        pnl_daily=0.0,
+        sigma=0.001,
+        sigma_zscore=0.0,
+    )
+
+
+def _mid(i: int) -> float:
+    # 锯齿 + 单个尖峰，用来检查降采样是否保住极值。
+    return 999.0 if i == 777 else 600.0 + (i % 37) * 0.1
+
+
+def test_rollups_are_incremental_and_long_ranges_skip_raw_ticks(tmp_path, monkeypatch):
+    writers = MetricsHistory.build_writers(tmp_path)
+    journal = TickJournal(tmp_path, sinks=writers)
+    for i in range(1080):  # 3 小时，每 10 秒一个 tick
+        journal.append(_tick(i * 10, _mid(i)))
+    journal.close()
+
+    minute_rows = read_rollup(rollup_path(tmp_path, 60), 0, float("inf"))
+    assert len(minute_rows) == 180
+    assert [len(read_rollup(rollup_path(tmp_path, s), 0, float("inf"))) for s in (1, 3600)] == [1080, 3]
+    mid_base = 2 + 5 * 4  # mid_price 为第 6 个序列
+    first = minute_rows[0]
+    assert first[0] == T0.timestamp() and first[1] == 6
+    assert first[mid_base : mid_base + 4] == (600.0, 600.5, 600.5, sum(600.0 + k * 0.1 for k in range(6)))
+
+    history = MetricsHistory(tmp_path, writers)
+    monkeypatch.setattr(history._reader, "read_range", None)  # noqa: SLF001  长区间不应读原始 tick
+    start, end = T0.timestamp(), T0.timestamp() + 3 * 3600
+    resolution, points = history.query("mid_price", start, end, points=100)
+    assert resolution == "1m"
+    assert len(points) == 100
+    assert max(p.max for p in points) == 999.0
+    assert min(p.min for p in points) == 600.0
+
+
+def test_short_ranges_read_raw_ticks_and_live_bucket_is_visible(tmp_path):
+    writers = MetricsHistory.build_writers(tmp_path)
+    history = MetricsHistory(tmp_path, writers)
+    journal = TickJournal(tmp_path, sinks=writers, flush_interval_sec=0.05)
+    try:
+        for i in range(30):
+            journal.append(_tick(i, _mid(i)))
+        deadline = time.monotonic() + 2.0
+        while journal.stats()["written"] < 30 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        resolution, raw = history.query("pnl_total", T0.timestamp(), T0.timestamp() + 60, points=500)
+        assert resolution == "raw"
+        assert [p.value for p in raw] == [i / 100.0 for i in range(30)]
+        # 未结束的 1 分钟桶尚未落盘，查询时由内存补齐。
+        assert read_rollup(rollup_path(tmp_path, 60), 0, float("inf")) == []
+        live = history._rollup_points("mid_price", 60, T0.timestamp(), T0.timestamp() + 60)  # noqa: SLF001
+        assert len(live) == 1 and live[0].value == _mid(29)
+    finally:
+        journal.close()
+
+
+def test_rollup_buckets_split_across_restart_are_merged(tmp_path):
+    row = [0.0] * len(RECORD_FIELDS)
+    mid_idx = RECORD_FIELDS.index("mid")
+    for mid, ts in ((601.0, 5.0), (603.0, 20.0)):
+        writer = RollupWriter(tmp_path, 60)
+        row[0], row[mid_idx] = ts, mid
+        writer.add(tuple(row))
+        writer.close()
+    rows = read_rollup(rollup_path(tmp_path, 60), 0, 100)
+    mid_base = 2 + 5 * 4
+    assert len(rows) == 1
+    assert rows[0][1] == 2
+    assert rows[0][mid_base : mid_base + 3] == (601.0, 603.0, 603.0)
+
+
+def test_lttb_keeps_endpoints_and_spike():
+    points = [HistoryPoint(t=float(i), value=_mid(i), min=_mid(i), max=_mid(i)) for i in range(2000)]
+    sampled = downsample_lttb(points, 50)
+    assert len(sampled) == 50
+    assert sampled[0] is points[0] and sampled[-1] is points[-1]
+    assert any(p.value == 999.0 for p in sampled)
+
+
+def test_history_endpoint(tmp_path, monkeypatch):
+    monkeypatch.setenv("RUNTIME_CONFIG_PATH", str(tmp_path / "runtime.json"))
+    monkeypatch.setenv("EXCHANGE_CONFIG_PATH", str(tmp_path / "exchange.json"))
+    monkeypatch.setenv("TELEGRAM_CONFIG_PATH", str(tmp_path / "telegram.json"))
+    monkeypatch.setenv("TICK_JOURNAL_DIR", str(tmp_path / "journal"))
+    monkeypatch.setenv("APP_JWT_SECRET", "test-secret")
+    get_settings.cache_clear()
+
+    app = create_app()
+    with TestClient(app) as client:
+        headers = {"Authorization": f"Bearer {create_access_token(get_settings(), 'admin')}"}
+        journal = app.state.container.journal
+        for i in range(20):
+            journal.append(_tick(i, _mid(i)))
+        journal.close()
+
+        params = {"series": "mid_price", "start": T0.isoformat(), "end": (T0 + timedelta(minutes=5)).isoformat(), "points": 10}
+        resp = client.get("/api/metrics/history", params=params, headers=headers)
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["resolution"] == "1s" and body["method"] == "minmax"
+        assert len(body["points"]) == 10
+        assert body["points"][0]["min"] == 600.0 and body["points"][0]["max"] == 600.1
+
+        resp = client.get("/api/metrics/history", params={**params, "series": "nope"}, headers=headers)
+        assert resp.status_code == 400
+
+    get_settings.cache_clear()
@@ -1,6 +1,11 @@
 from datetime import timedelta
 
-from app.models import EngineTick, MarketSnapshot, PositionSnapshot, QuoteDecision, TradeSnapshot, utcnow
+from fastapi.testclient import TestClient
+
+from app.core.auth import create_access_token
+from app.core.settings import get_settings
+from app.main import create_app
+from app.models import EngineTick, MarketSnapshot, OrderSnapshot, PositionSnapshot, QuoteDecision, TradeSnapshot, utcnow
 from app.services.monitoring import MonitoringService
 
 
@@ -123,3 +128,92 @@ def test_monitoring_ignores_trades_before_session_start():
     assert monitor.summary.total_trade_count == 1
     assert monitor.summary.total_trade_volume_notional == abs(101.0 * 0.4)
     assert monitor.summary.total_fee == 0.03
+
+
+def test_monitoring_rolling_windows_expire_incrementally():
+    now = utcnow()
+    monitor = MonitoringService(max_points=100)
+    monitor.reset_session(started_at=now - timedelta(hours=3))
+
+    trades = [
+        TradeSnapshot(
+            trade_id=f"t{i}",
+            side="buy" if i % 2 else "sell",
+            price=100.0,
+            size=1.0,
+            fee=0.0,
+            created_at=now - timedelta(seconds=7200 - i * 10),
+        )
+        for i in range(720)
+    ]
+    monitor.update_trades(trades)
+    for seconds_ago in (90, 30, 5):
+        monitor.record_cancel(now - timedelta(seconds=seconds_ago))
+    monitor.update_orders(
+        [
+            OrderSnapshot("b1", "buy", 99.9, 0.1, "open", now - timedelta(seconds=40)),
+            OrderSnapshot("b2", "buy", 99.8, 0.1, "open", now - timedelta(seconds=10)),
+            OrderSnapshot("s1", "sell", 100.3, 0.1, "open", now - timedelta(seconds=25)),
+            OrderSnapshot("s2", "sell", 100.4, 0.1, "open", now + timedelta(seconds=5)),
+        ]
+    )
+    monitor.update_tick(_build_tick(now, pnl_total=0.0, pnl_daily=0.0), drawdown_pct=0.0, mode="running", consecutive_failures=0)
+    summary = monitor.summary
+
+    # 成交间隔 10 秒，最近 1 小时内（含恰好 1 小时前那一笔）共 360 笔，每笔名义 100。
+    assert summary.trade_volume_notional_1h == 360 * 100.0
+    assert summary.total_trade_volume_notional == 720 * 100.0
+    assert summary.maker_fill_count_1m == 6
+    assert summary.cancel_count_1m == 2
+    assert summary.time_in_book_p50_sec == 25.0
+    assert summary.time_in_book_p90_sec == 40.0
+    assert summary.open_order_age_buy_sec == 40.0
+    assert summary.open_order_age_sell_sec == 25.0
+
+    later = now + timedelta(minutes=30)
+    assert monitor.trade_volume_notional_last_1h(later) == 180 * 100.0
+    monitor.reset_session(started_at=later)
+    assert monitor.trade_volume_notional_last_1h(later) == 0.0
+
+
+def test_monitoring_tracks_latency_and_fill_quantiles():
+    now = utcnow()
+    monitor = MonitoringService(max_points=100)
+    monitor.reset_session(started_at=now - timedelta(minutes=10))
+
+    monitor.update_orders([OrderSnapshot("o1", "buy", 99.9, 0.1, "open", now - timedelta(seconds=12))])
+    monitor.update_orders([])
+    monitor.update_trades(
+        [TradeSnapshot("f1", "buy", 99.9, 0.1, -0.001, now - timedelta(seconds=2), order_id="o1")]
+    )
+    monitor.record_cancel(now)
+    monitor.record_stage_timings({"loop_elapsed_ms": 80.0, "fetch_market_ms": 30.0}, now)
+    monitor.record_latency("order_rtt_ms", 45.0, now)
+    monitor.update_tick(_build_tick(now, pnl_total=0.0, pnl_daily=0.0), drawdown_pct=0.0, mode="running", consecutive_failures=0)
+
+    quantiles = monitor.quantile_summary(now)
+    assert set(quantiles) == {"fetch_market_ms", "fill_to_cancel_sec", "loop_elapsed_ms", "order_rtt_ms", "time_in_book_filled_sec"}
+    assert abs(quantiles["time_in_book_filled_sec"]["session"]["p50"] - 10.0) <= 0.1
+    assert abs(quantiles["fill_to_cancel_sec"]["1m"]["p99"] - 2.0) <= 0.02
+    assert quantiles["loop_elapsed_ms"]["1h"]["count"] == 1
+    assert abs(monitor.quantile_summary(now)["order_rtt_ms"]["1m"]["p999"] - 45.0) <= 0.45
+
+
+def test_quantiles_endpoint(tmp_path, monkeypatch):
+    monkeypatch.setenv("RUNTIME_CONFIG_PATH", str(tmp_path / "runtime.json"))
+    monkeypatch.setenv("EXCHANGE_CONFIG_PATH", str(tmp_path / "exchange.json"))
+    monkeypatch.setenv("TELEGRAM_CONFIG_PATH", str(tmp_path / "telegram.json"))
+    monkeypatch.setenv("APP_JWT_SECRET", "test-secret")
+    get_settings.cache_clear()
+
+    app = create_app()
+    with TestClient(app) as client:
+        headers = {"Authorization": f"Bearer {create_access_token(get_settings(), 'admin')}"}
+        app.state.container.monitor.record_latency("order_rtt_ms", 12.0)
+        resp = client.get("/api/metrics/quantiles", headers=headers)
+        assert resp.status_code == 200
+        stats = resp.json()["order_rtt_ms"]
+        assert set(stats) == {"1m", "1h", "session"}
+        assert stats["1m"]["count"] == 1 and abs(stats["1m"]["p50"] - 12.0) <= 0.12
+
+    get_settings.cache_clear()
@@ -0,0 +1,164 @@
+import asyncio
+import dataclasses
+from datetime import timedelta
+from unittest.mock import AsyncMock, Mock
+
+from app.engine.order_tracker import OrderTracker
+from app.engine.strategy_engine import StrategyEngine
+from app.exchange.simulated import SimulatedExchangeAdapter, SimulatedVenueConfig
+from app.models import OrderSnapshot, TradeSnapshot, utcnow
+from app.schemas import RuntimeConfig
+from app.services.monitoring import MonitoringService
+
+
+def _order(order_id: str, side: str = "buy", size: float = 0.1, client_order_id: str | None = None) -> OrderSnapshot:
+    return OrderSnapshot(
+        order_id=order_id,
+        side=side,
+        price=100.0,
+        size=size,
+        status="open",
+        created_at=utcnow(),
+        client_order_id=client_order_id,
+    )
+
+
+def _fill(trade_id: str, order_id: str, size: float) -> TradeSnapshot:
+    return TradeSnapshot(trade_id=trade_id, side="buy", price=100.0, size=size, fee=0.0, created_at=utcnow(), order_id=order_id)
+
+
+def test_tracker_indexes_by_order_id_and_client_order_id():
+    tracker = OrderTracker()
+    tracker.reconcile([], now=0.0)
+    tracker.on_placed(_order("o1", client_order_id="c1"))
+
+    assert tracker.get("o1") is tracker.get("c1")
+    tracker.on_canceled("c1")
+    assert tracker.open_orders() == []
+    assert tracker.get("o1") is None
+
+
+def test_tracker_reconcile_interval_and_dirty_flag():
+    tracker = OrderTracker()
+    assert tracker.needs_reconcile(2.0, now=0.0) is True
+
+    tracker.reconcile([_order("o1")], now=10.0)
+    assert tracker.needs_reconcile(2.0, now=11.0) is False
+    assert tracker.needs_reconcile(2.0, now=12.5) is True
+
+    tracker.mark_dirty()
+    assert tracker.needs_reconcile(2.0, now=10.5) is True
+
+
+def test_tracker_applies_fills_once_and_removes_filled_orders():
+    tracker = OrderTracker()
+    tracker.reconcile([_order("o1", size=0.3, client_order_id="c1")], now=0.0)
+
+    partial = _fill("t1", "o1", 0.1)
+    tracker.apply_fills([partial, partial])
+    assert abs(tracker.get("o1").size - 0.2) < 1e-12
+
+    tracker.apply_fills([_fill("t2", "c1", 0.2)])
+    assert tracker.open_orders() == []
+
+
+def test_tracker_ignores_terminal_order_updates():
+    tracker = OrderTracker()
+    tracker.reconcile([], now=0.0)
+    tracker.on_placed(
+        OrderSnapshot(order_id="o1", side="sell", price=1.0, size=1.0, status="rejected", created_at=utcnow())
+    )
+    assert tracker.open_orders() == []
+
+    tracker.on_placed(_order("o2"))
+    tracker.apply_order_update(order_id="o2", status="CANCELLED")
+    assert tracker.open_orders() == []
+
+
+def test_tracker_keys_placeholder_ids_by_client_order_id_until_reconciled():
+    tracker = OrderTracker()
+    tracker.reconcile([], now=0.0)
+    tracker.on_placed(_order("0x00", side="buy", client_order_id="c1"))
+    tracker.on_placed(_order("0x00", side="sell", client_order_id="c2"))
+
+    assert {order.side for order in tracker.open_orders()} == {"buy", "sell"}
+    assert tracker.needs_reconcile(60.0, now=0.0)
+    tracker.on_canceled("0x00")
+    assert len(tracker.open_orders()) == 2
+
+    # REST 尚未返回 c2 时保留占位挂单并继续待对账。
+    tracker.reconcile([_order("o1", side="buy", client_order_id="c1")], now=1.0)
+    assert tracker.get("c1").order_id == "o1"
+    assert tracker.get("c2") is not None
+    assert tracker.needs_reconcile(60.0, now=1.0)
+
+    tracker.reconcile([_order("o1", client_order_id="c1"), _order("o2", side="sell", client_order_id="c2")], now=2.0)
+    assert tracker.get("c2").order_id == "o2"
+    assert not tracker.needs_reconcile(60.0, now=2.0)
+
+
+class _PlaceholderIdAdapter(SimulatedExchangeAdapter):
+    """模拟 GRVT 下单回执：order_id 恒为 0x00。"""
+
+    def __init__(self) -> None:
+        super().__init__(SimulatedVenueConfig(seed=3, taker_rate_per_sec=0.0), price_process=_FixedPrice())
+        self.placed = 0
+        self.canceled: list[str] = []
+
+    async def cancel_order(self, symbol, order_id):
+        self.canceled.append(order_id)
+        return await super().cancel_order(symbol, order_id)
+
+    async def place_limit_order(self, symbol, side, price, size, post_only, client_order_id):
+        order = await super().place_limit_order(symbol, side, price, size, post_only, client_order_id)
+        self.placed += 1
+        return dataclasses.replace(order, order_id="0x00")
+
+
+class _FixedPrice:
+    def mid_at(self, ts: float) -> float:
+        return 600.0
+
+
+def test_engine_does_not_duplicate_quotes_when_ack_ids_are_placeholders():
+    adapter = _PlaceholderIdAdapter()
+    config_store = Mock()
+    config_store.get = Mock(return_value=RuntimeConfig(symbol="BNB_USDT_Perp", quote_interval_sec=0.2, tg_heartbeat_enabled=False))
+    engine = StrategyEngine(
+        adapter=adapter,
+        config_store=config_store,
+        monitor=MonitoringService(max_points=100),
+        event_bus=Mock(publish=AsyncMock()),
+        alert_service=Mock(send_event=AsyncMock()),
+    )
+
+    async def scenario():
+        engine._mode = "running"  # noqa: SLF001
+        task = asyncio.create_task(engine._run_loop())  # noqa: SLF001
+        await asyncio.sleep(1.0)
+        engine._stop_event.set()  # noqa: SLF001
+        await asyncio.wait_for(task, timeout=5.0)
+        return await adapter.fetch_open_orders("BNB_USDT_Perp")
+
+    open_orders = asyncio.run(scenario())
+
+    # 无吃单时交易所上应始终只有买卖各一笔挂单，占位 id 不得导致重复挂单。
+    assert adapter.placed >= 2
+    assert sorted(order.side for order in open_orders) == ["buy", "sell"]
+    assert "0x00" not in adapter.canceled
+
+
+def test_tracker_skips_fills_already_reflected_in_reconciled_remaining_size():
+    tracker = OrderTracker()
+    filled_at = utcnow()
+    # REST 快照的 0.05 已是扣除 T1 后的剩余量。
+    tracker.reconcile([_order("A", size=0.05)], now=0.0, fills_until=filled_at + timedelta(milliseconds=5))
+    covered = TradeSnapshot("T1", "buy", 100.0, 0.05, 0.0, filled_at, order_id="A")
+    tracker.apply_fills([covered])
+
+    assert [order.order_id for order in tracker.open_orders()] == ["A"]
+    assert abs(tracker.get("A").size - 0.05) < 1e-12
+
+    later = TradeSnapshot("T2", "buy", 100.0, 0.02, 0.0, filled_at + timedelta(seconds=1), order_id="A")
+    tracker.apply_fills([later, covered])
+    assert abs(tracker.get("A").size - 0.03) < 1e-12
@@ -0,0 +1,82 @@
+from fastapi.testclient import TestClient
+
+from app.core.auth import create_access_token
+from app.core.settings import get_settings
+from app.main import create_app
+from app.services.prometheus import MetricsRegistry
+
+
+def test_registry_renders_text_format_and_reuses_cached_samples():
+    registry = MetricsRegistry()
+    calls = registry.counter("demo_calls_total", "Calls.", ("endpoint",))
+    latency = registry.histogram("demo_latency_seconds", "Latency.", ("endpoint",), buckets=(0.01, 0.1))
+    calls.labels('fetch "ticker"').inc()
+    calls.labels('fetch "ticker"').inc(2)
+    for value in (0.005, 0.05, 0.5):
+        latency.labels("create_order").observe(value)
+
+    text = registry.render()
+    assert "# TYPE demo_calls_total counter\n" in text
+    assert 'demo_calls_total{endpoint="fetch \\"ticker\\""} 3\n' in text
+    assert 'demo_latency_seconds_bucket{endpoint="create_order",le="0.01"} 1\n' in text
+    assert 'demo_latency_seconds_bucket{endpoint="create_order",le="0.1"} 2\n' in text
+    assert 'demo_latency_seconds_bucket{endpoint="create_order",le="+Inf"} 3\n' in text
+    assert 'demo_latency_seconds_sum{endpoint="create_order"} 0.555\n' in text
+    assert 'demo_latency_seconds_count{endpoint="create_order"} 3\n' in text
+
+    # 未变化的样本直接复用上次渲染的文本对象。
+    child = calls.labels('fetch "ticker"')
+    cached = child.render()
+    assert child.render() is cached
+    child.inc()
+    assert child.render() is not cached and child.render().endswith(" 4\n")
+
+
+def test_metrics_endpoint_exposes_pull_metrics_and_honours_token(tmp_path, monkeypatch):
+    monkeypatch.setenv("RUNTIME_CONFIG_PATH", str(tmp_path / "runtime.json"))
+    monkeypatch.setenv("EXCHANGE_CONFIG_PATH", str(tmp_path / "exchange.json"))
+    monkeypatch.setenv("TELEGRAM_CONFIG_PATH", str(tmp_path / "telegram.json"))
+    monkeypatch.setenv("APP_JWT_SECRET", "test-secret")
+    monkeypatch.setenv("METRICS_TOKEN", "scrape-secret")
+    get_settings.cache_clear()
+
+    app = create_app()
+    with TestClient(app) as client:
+        bus = app.state.container.event_bus
+        sub = bus.subscribe(["tick"])
+        for n in range(3):
+            client.portal.call(bus.publish, "tick", {"n": n})
+
+        assert client.get("/metrics").status_code == 401
+        resp = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+        body = resp.text
+        assert f'mm_stream_subscriber_pending{{subscriber="{sub.id}"}} 1\n' in body
+        assert f'mm_stream_subscriber_conflated_total{{subscriber="{sub.id}"}} 2\n' in body
+        assert "mm_alert_queue_depth 0\n" in body
+        assert "# TYPE mm_tick_stage_seconds histogram\n" in body
+        assert "# TYPE mm_adapter_call_seconds histogram\n" in body
+
+        jwt_headers = {"Authorization": f"Bearer {create_access_token(get_settings(), 'admin')}"}
+        assert client.get("/metrics", headers=jwt_headers).status_code == 200
+        assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+
+    get_settings.cache_clear()
+
+
+def test_metrics_endpoint_requires_credentials_without_metrics_token(tmp_path, monkeypatch):
+    monkeypatch.setenv("RUNTIME_CONFIG_PATH", str(tmp_path / "runtime.json"))
+    monkeypatch.setenv("EXCHANGE_CONFIG_PATH", str(tmp_path / "exchange.json"))
+    monkeypatch.setenv("TELEGRAM_CONFIG_PATH", str(tmp_path / "telegram.json"))
+    monkeypatch.setenv("APP_JWT_SECRET", "test-secret")
+    monkeypatch.setenv("METRICS_TOKEN", "")
+    get_settings.cache_clear()
+
+    with TestClient(create_app()) as client:
+        assert client.get("/metrics").status_code == 401
+        assert client.get("/metrics", headers={"Authorization": "Bearer "}).status_code == 401
+        headers = {"Authorization": f"Bearer {create_access_token(get_settings(), 'admin')}"}
+        assert client.get("/metrics", headers=headers).status_code == 200
+
+    get_settings.cache_clear()
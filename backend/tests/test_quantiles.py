@@ -0,0 +1,67 @@
+import math
+import random
+
+from app.services.quantiles import QuantileRegistry, QuantileSketch, WindowedSketch
+
+
+def _exact(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def test_sketch_quantiles_stay_within_relative_error_and_memory_is_bounded():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(math.log(20.0), 1.2) for _ in range(200_000)]
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for value in values:
+        sketch.add(value)
+
+    summary = sketch.summary()
+    assert summary["count"] == len(values)
+    for name, q in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("p999", 0.999)):
+        exact = _exact(values, q)
+        assert abs(summary[name] - exact) / exact <= 0.011
+        assert abs(sketch.quantile(q) - exact) / exact <= 0.011
+    # 20 万个样本只占用数百个桶。
+    assert len(sketch._bins) < 1000  # noqa: SLF001
+
+
+def test_sketches_merge_and_subtract_exactly():
+    a, b, both = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for i in range(1, 1001):
+        (a if i % 2 else b).add(float(i))
+        both.add(float(i))
+    a.merge(b)
+    assert a.summary() == both.summary()
+    a.subtract(b)
+    assert a.count == 500
+    assert a._bins == {k: v for k, v in a._bins.items() if v > 0}  # noqa: SLF001
+
+
+def test_windowed_sketch_expires_old_slots():
+    window = WindowedSketch(window_sec=60.0, slots=6)
+    for ts in range(0, 60):
+        window.add(float(ts), 1000.0)
+    for ts in range(60, 120):
+        window.add(float(ts), 10.0)
+    snapshot = window.snapshot(119.0)
+    assert snapshot.count == 60
+    assert abs(snapshot.quantile(0.999) - 10.0) / 10.0 <= 0.01
+    assert window.snapshot(1000.0).count == 0
+
+
+def test_registry_reports_windows_and_resets_session_only():
+    registry = QuantileRegistry()
+    for i in range(100):
+        registry.record("loop_elapsed_ms", float(i + 1), ts=1000.0 + i)
+    registry.record("loop_elapsed_ms", 5000.0, ts=4000.0)
+
+    summary = registry.summary(4000.0)["loop_elapsed_ms"]
+    assert summary["1m"]["count"] == 1
+    assert summary["1h"]["count"] == 101
+    assert summary["session"]["count"] == 101
+    assert abs(summary["1h"]["p50"] - 51.0) / 51.0 <= 0.01
+
+    registry.reset_session()
+    summary = registry.summary(4000.0)["loop_elapsed_ms"]
+    assert summary["session"]["count"] == 0 and summary["1h"]["count"] == 101
@@ -0,0 +1,113 @@
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from app.core.settings import Settings
+from app.engine.strategy_engine import StrategyEngine
+from app.exchange.factory import build_exchange_adapter
+from app.exchange.instrumented import InstrumentedAdapter
+from app.exchange.simulated import (
+    MatchingBook,
+    OrderRejectedError,
+    SimulatedExchangeAdapter,
+    SimulatedVenueConfig,
+    _RestingOrder,
+)
+from app.schemas import RuntimeConfig
+from app.services.monitoring import MonitoringService
+
+SYMBOL = "BNB_USDT_Perp"
+
+
+class _FixedPrice:
+    def __init__(self, mid: float) -> None:
+        self.mid = mid
+
+    def mid_at(self, ts: float) -> float:
+        return self.mid
+
+
+def _order(order_id: str, side: str, price: float, size: float) -> _RestingOrder:
+    return _RestingOrder(order_id, order_id, side, price, size, datetime.now(timezone.utc))
+
+
+def test_matching_book_fills_by_price_then_time():
+    book = MatchingBook()
+    book.add(_order("b1", "buy", 99.0, 1.0))
+    book.add(_order("b2", "buy", 100.0, 1.0))
+    book.add(_order("b3", "buy", 100.0, 1.0))
+
+    fills = book.match("buy", 99.5, 1.5)
+
+    assert [(f.order.order_id, f.size) for f in fills] == [("b2", 1.0), ("b3", 0.5)]
+    assert book.best("buy") == 100.0
+    assert [o.order_id for o in book.orders()] == ["b1", "b3"]
+    book.cancel("b3")
+    assert book.best("buy") == 99.0
+
+
+def test_post_only_rejection_maker_rebate_and_reduce_only_close():
+    clock = Mock(return_value=1000.0)
+    prices = _FixedPrice(100.0)
+    cfg = SimulatedVenueConfig(spread_bps=20.0, tick_size=0.01, taker_rate_per_sec=0.0, maker_fee_bps=-1.0, taker_fee_bps=5.0)
+    venue = SimulatedExchangeAdapter(cfg, price_process=prices, clock=clock)
+
+    async def scenario():
+        market = await venue.fetch_market_snapshot(SYMBOL)
+        assert (market.bid, market.ask) == (99.9, 100.1)
+        with pytest.raises(OrderRejectedError):
+            await venue.place_limit_order(SYMBOL, "buy", 100.1, 1.0, True, "c1")
+        with pytest.raises(OrderRejectedError):
+            await venue.close_position_taker(SYMBOL, "sell", 1.0)
+
+        resting = await venue.place_limit_order(SYMBOL, "buy", 99.8, 2.0, True, "c2")
+        assert resting.status == "open"
+        # 外部盘口下移穿过挂单，按挂单价成交并获得 maker 返佣。
+        prices.mid = 99.5
+        clock.return_value = 1001.0
+        trades = await venue.fetch_recent_trades(SYMBOL)
+        assert [(t.order_id, t.price, t.size) for t in trades] == [(resting.order_id, 99.8, 2.0)]
+        assert trades[0].fee == pytest.approx(-99.8 * 2.0 * 1e-4)
+        assert await venue.fetch_open_orders(SYMBOL) == []
+
+        closed = await venue.close_position_taker(SYMBOL, "sell", 5.0)
+        assert closed.size == 2.0 and closed.status == "filled"
+        assert (await venue.fetch_position(SYMBOL)).base_position == 0.0
+
+    asyncio.run(scenario())
+    # 平仓按外部买一 99.40 吃单并支付 taker 费。
+    assert venue.venue_stats()["fees"] == pytest.approx(-99.8 * 2.0 * 1e-4 + 99.4 * 2.0 * 5e-4)
+
+
+def test_factory_builds_simulated_venue_that_drives_the_engine():
+    settings = Settings(EXCHANGE_VENUE="simulated", SIM_SEED=7, SIM_TAKER_RATE_PER_SEC=50.0)
+    adapter = build_exchange_adapter(settings)
+    assert isinstance(adapter, InstrumentedAdapter) and isinstance(adapter.inner, SimulatedExchangeAdapter)
+
+    config_store = Mock()
+    config_store.get = Mock(
+        return_value=RuntimeConfig(symbol=SYMBOL, quote_interval_sec=0.2, tg_heartbeat_enabled=False)
+    )
+    engine = StrategyEngine(
+        adapter=adapter,
+        config_store=config_store,
+        monitor=MonitoringService(max_points=100),
+        event_bus=Mock(publish=AsyncMock()),
+        alert_service=Mock(send_event=AsyncMock()),
+    )
+
+    async def scenario():
+        engine._mode = "running"  # noqa: SLF001
+        task = asyncio.create_task(engine._run_loop())  # noqa: SLF001
+        await asyncio.sleep(0.7)
+        engine._stop_event.set()  # noqa: SLF001
+        await asyncio.wait_for(task, timeout=5.0)
+
+    asyncio.run(scenario())
+
+    rows = {row["name"]: row for row in adapter.telemetry.snapshot()}
+    assert rows["fetch_market_snapshot"]["calls"] >= 3
+    assert rows["place_limit_order"]["calls"] >= 2
+    assert engine._last_error is None  # noqa: SLF001
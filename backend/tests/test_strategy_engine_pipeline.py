@@ -0,0 +1,154 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from app.engine.strategy_engine import StrategyEngine
+from app.models import AccountFundsSnapshot, MarketSnapshot, OrderSnapshot, PositionSnapshot, utcnow
+from app.schemas import RuntimeConfig
+from app.services.monitoring import MonitoringService
+from app.services.prometheus import ORDER_ACTIONS_TOTAL, TICK_STAGE_SECONDS
+from app.services.tick_journal import TickJournal
+
+READ_DELAY_SEC = 0.1
+
+
+class _SlowAdapter:
+    """每个读请求固定耗时，用于验证 tick 内读请求是否并发。"""
+
+    def __init__(self) -> None:
+        self.placed: list[str] = []
+
+    async def ping(self) -> bool:
+        return True
+
+    async def fetch_market_snapshot(self, symbol: str) -> MarketSnapshot:
+        await asyncio.sleep(READ_DELAY_SEC)
+        return MarketSnapshot(
+            symbol=symbol, bid=100.0, ask=100.2, mid=100.1, depth_score=1.0, trade_intensity=1.0, timestamp=utcnow()
+        )
+
+    async def fetch_account_funds(self) -> AccountFundsSnapshot:
+        await asyncio.sleep(READ_DELAY_SEC)
+        return AccountFundsSnapshot(equity_usdt=1000.0, free_usdt=800.0, used_usdt=200.0, source="test")
+
+    async def fetch_position(self, symbol: str) -> PositionSnapshot:
+        await asyncio.sleep(READ_DELAY_SEC)
+        return PositionSnapshot(symbol=symbol, base_position=0.0, notional=0.0)
+
+    async def fetch_open_orders(self, symbol: str) -> list[OrderSnapshot]:
+        await asyncio.sleep(READ_DELAY_SEC)
+        return []
+
+    async def fetch_recent_trades(self, symbol: str, limit: int = 50):
+        await asyncio.sleep(READ_DELAY_SEC)
+        return []
+
+    async def place_limit_order(self, **kwargs) -> OrderSnapshot:
+        self.placed.append(kwargs["side"])
+        return OrderSnapshot(
+            order_id=f"oid-{kwargs['side']}",
+            side=kwargs["side"],
+            price=kwargs["price"],
+            size=kwargs["size"],
+            status="open",
+            created_at=utcnow(),
+            client_order_id=kwargs["client_order_id"],
+        )
+
+
+def test_tick_reads_overlap_and_diagnostics_show_critical_path(tmp_path):
+    adapter = _SlowAdapter()
+    journal = TickJournal(tmp_path)
+    config_store = Mock()
+    config_store.get = Mock(return_value=RuntimeConfig(tg_heartbeat_enabled=False))
+    event_bus = Mock()
+    alert = Mock()
+    alert.send_event = AsyncMock()
+    engine = StrategyEngine(
+        adapter=adapter,
+        config_store=config_store,
+        monitor=MonitoringService(max_points=100),
+        event_bus=event_bus,
+        alert_service=alert,
+        journal=journal,
+    )
+    ticks: list[dict] = []
+
+    async def publish(channel: str, payload: dict) -> None:
+        if channel == "tick":
+            ticks.append(payload)
+            engine._stop_event.set()  # noqa: SLF001
+
+    event_bus.publish = publish
+
+    stage_count = TICK_STAGE_SECONDS.labels("quote_ready_ms").count
+    placed = ORDER_ACTIONS_TOTAL.labels("place", "missing-side-buy").value
+
+    async def scenario():
+        engine._mode = "running"  # noqa: SLF001
+        started = time.perf_counter()
+        await asyncio.wait_for(engine._run_loop(), timeout=5.0)  # noqa: SLF001
+        return time.perf_counter() - started
+
+    elapsed = asyncio.run(scenario())
+
+    diagnostics = ticks[0]["diagnostics"]
+    # 五个读请求串行需 0.5s，并发后约等于单个最慢请求。
+    assert diagnostics["loop_elapsed_ms"] < READ_DELAY_SEC * 1000 * 2
+    assert elapsed < READ_DELAY_SEC * 3
+    for key in ("fetch_market_ms", "fetch_account_ms", "fetch_orders_ms", "fetch_trades_ms", "quote_ready_ms"):
+        assert READ_DELAY_SEC * 1000 * 0.9 <= diagnostics[key] < READ_DELAY_SEC * 1000 * 2
+    assert sorted(adapter.placed) == ["buy", "sell"]
+    # 分位数只经 /api/metrics/quantiles 提供，不占每个 tick 的推送带宽。
+    assert "quantiles" not in ticks[0]["summary"]
+    quantiles = engine._monitor.quantile_summary()  # noqa: SLF001
+    assert quantiles["loop_elapsed_ms"]["1m"]["count"] == 1
+    assert quantiles["order_rtt_ms"]["session"]["count"] == 2
+    assert TICK_STAGE_SECONDS.labels("quote_ready_ms").count == stage_count + 1
+    assert ORDER_ACTIONS_TOTAL.labels("place", "missing-side-buy").value == placed + 1
+    assert {o["order_id"] for o in ticks[0]["open_orders"]} == {"oid-buy", "oid-sell"}
+
+    journal.close()
+    recorded = journal.reader().read_range(fields=["mid", "fetch_market_ms", "quote_ready_ms"])
+    assert len(recorded["mid"]) == 1
+    assert recorded["fetch_market_ms"][0] == pytest.approx(diagnostics["fetch_market_ms"], abs=1e-3)
+    assert recorded["quote_ready_ms"][0] == pytest.approx(diagnostics["quote_ready_ms"], abs=1e-3)
+
+
+def test_failed_market_read_cancels_sibling_reads():
+    adapter = _SlowAdapter()
+    adapter.fetch_market_snapshot = AsyncMock(side_effect=RuntimeError("boom"))
+    cancelled: list[str] = []
+
+    async def slow_trades(symbol: str, limit: int = 50):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append("trades")
+            raise
+
+    adapter.fetch_recent_trades = slow_trades
+    config_store = Mock()
+    config_store.get = Mock(return_value=RuntimeConfig())
+    engine = StrategyEngine(
+        adapter=adapter,
+        config_store=config_store,
+        monitor=MonitoringService(max_points=100),
+        event_bus=Mock(publish=AsyncMock()),
+        alert_service=Mock(send_event=AsyncMock()),
+    )
+
+    async def stop_on_alert(**kwargs):
+        engine._stop_event.set()  # noqa: SLF001
+
+    engine._alert.send_event = AsyncMock(side_effect=stop_on_alert)  # noqa: SLF001
+
+    async def scenario():
+        await asyncio.wait_for(engine._run_loop(), timeout=2.0)  # noqa: SLF001
+
+    asyncio.run(scenario())
+
+    assert cancelled == ["trades"]
+    assert engine.consecutive_failures == 1
@@ -0,0 +1,110 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+from app.engine.strategy_engine import StrategyEngine
+from app.models import MarketSnapshot, utcnow
+from app.schemas import RuntimeConfig
+
+
+def _market(bid: float, ask: float) -> MarketSnapshot:
+    return MarketSnapshot(
+        symbol="BNB_USDT_Perp",
+        bid=bid,
+        ask=ask,
+        mid=(bid + ask) / 2,
+        depth_score=1.0,
+        trade_intensity=1.0,
+        timestamp=utcnow(),
+    )
+
+
+def _build_engine(adapter):
+    config_store = Mock()
+    config_store.get = Mock(return_value=RuntimeConfig())
+    return StrategyEngine(
+        adapter=adapter,
+        config_store=config_store,
+        monitor=Mock(),
+        event_bus=Mock(),
+        alert_service=Mock(),
+    )
+
+
+def _stream_adapter(current: MarketSnapshot, updates: list[MarketSnapshot | None]):
+    adapter = Mock()
+    adapter.market_stream_active = Mock(return_value=True)
+    adapter.fetch_market_snapshot = AsyncMock(return_value=current)
+    adapter.wait_market_update = AsyncMock(side_effect=updates)
+    return adapter
+
+
+def test_event_mode_wakes_on_market_move():
+    cfg = RuntimeConfig(quote_schedule_mode="event", event_requote_threshold_bps=1.0, event_min_interval_sec=0.0)
+    adapter = _stream_adapter(
+        _market(100.0, 100.02),
+        [_market(100.0, 100.02), _market(100.001, 100.021), _market(100.05, 100.07)],
+    )
+    engine = _build_engine(adapter)
+    engine._last_market = _market(100.0, 100.02)  # noqa: SLF001
+
+    asyncio.run(engine._wait_next_tick(cfg, 0.25, 0.0))  # noqa: SLF001
+
+    assert engine._wake_reason == "market-move"  # noqa: SLF001
+    assert adapter.wait_market_update.await_count == 3
+
+
+def test_event_mode_wakes_immediately_when_market_moved_during_tick():
+    cfg = RuntimeConfig(quote_schedule_mode="event", event_requote_threshold_bps=1.0, event_min_interval_sec=0.0)
+    adapter = _stream_adapter(_market(101.0, 101.02), [])
+    engine = _build_engine(adapter)
+    engine._last_market = _market(100.0, 100.02)  # noqa: SLF001
+
+    asyncio.run(engine._wait_next_tick(cfg, 0.25, 0.0))  # noqa: SLF001
+
+    assert engine._wake_reason == "market-move"  # noqa: SLF001
+    adapter.wait_market_update.assert_not_awaited()
+
+
+def test_event_mode_wakes_after_max_idle_in_quiet_market():
+    cfg = RuntimeConfig(
+        quote_schedule_mode="event",
+        event_requote_threshold_bps=1.0,
+        event_min_interval_sec=0.0,
+        event_max_idle_sec=0.2,
+    )
+    adapter = Mock()
+    adapter.market_stream_active = Mock(return_value=True)
+    adapter.fetch_market_snapshot = AsyncMock(return_value=_market(100.0, 100.02))
+
+    async def no_update(symbol: str, timeout: float):
+        await asyncio.sleep(timeout)
+        return None
+
+    adapter.wait_market_update = no_update
+    engine = _build_engine(adapter)
+    engine._last_market = _market(100.0, 100.02)  # noqa: SLF001
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await engine._wait_next_tick(cfg, 0.25, 0.0)  # noqa: SLF001
+        return loop.time() - started
+
+    waited = asyncio.run(scenario())
+
+    assert engine._wake_reason == "max-idle"  # noqa: SLF001
+    assert 0.15 <= waited < 1.0
+
+
+def test_event_mode_falls_back_to_fixed_interval_without_stream():
+    cfg = RuntimeConfig(quote_schedule_mode="event")
+    adapter = Mock()
+    adapter.market_stream_active = Mock(return_value=False)
+    adapter.wait_market_update = AsyncMock()
+    engine = _build_engine(adapter)
+    engine._last_market = _market(100.0, 100.02)  # noqa: SLF001
+
+    asyncio.run(engine._wait_next_tick(cfg, 0.2, 0.19))  # noqa: SLF001
+
+    assert engine._wake_reason == "interval"  # noqa: SLF001
+    adapter.wait_market_update.assert_not_awaited()
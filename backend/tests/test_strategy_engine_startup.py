@@ -1,8 +1,10 @@
 ﻿import asyncio
 from datetime import timedelta
+from functools import partial
 from unittest.mock import AsyncMock, Mock
 
 from app.engine.strategy_engine import StrategyEngine
+from app.exchange.base import ExchangeAdapter
 from app.models import AccountFundsSnapshot, OrderSnapshot, PositionSnapshot, QuoteDecision, utcnow
 from app.schemas import RuntimeConfig
 
@@ -18,6 +20,9 @@ def _build_engine(config: RuntimeConfig | None = None):
     )
     adapter.fetch_position = AsyncMock(return_value=PositionSnapshot(symbol="BNB_USDT_Perp", base_position=0.0, notional=0.0))
     adapter.flatten_position_taker = AsyncMock()
+    # 批量接口走基类默认实现（并发逐笔），落到上面的单笔 mock。
+    for name in ("place_limit_orders", "cancel_orders", "cancel_replace_order"):
+        setattr(adapter, name, partial(getattr(ExchangeAdapter, name), adapter))
 
     config_store = Mock()
     config_store.get = Mock(return_value=config or RuntimeConfig())
@@ -400,4 +405,3 @@ def test_effective_liquidity_k_clamped_by_depth_factor():
     assert abs(StrategyEngine._effective_liquidity_k(1.5, 0.2) - 0.75) < 1e-9  # noqa: SLF001
     assert abs(StrategyEngine._effective_liquidity_k(1.5, 1.2) - 1.8) < 1e-9  # noqa: SLF001
     assert abs(StrategyEngine._effective_liquidity_k(1.5, 10.0) - 3.0) < 1e-9  # noqa: SLF001
-
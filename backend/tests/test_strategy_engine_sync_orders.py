@@ -0,0 +1,257 @@
+import asyncio
+from datetime import timedelta
+from functools import partial
+from unittest.mock import AsyncMock, Mock
+
+from app.engine.strategy_engine import StrategyEngine
+from app.exchange.base import ExchangeAdapter
+from app.models import AccountFundsSnapshot, OrderSnapshot, PositionSnapshot, QuoteDecision, utcnow
+from app.schemas import RuntimeConfig
+
+
+def _build_engine(cfg: RuntimeConfig) -> tuple[StrategyEngine, Mock]:
+    adapter = Mock()
+    adapter.cancel_all_orders = AsyncMock()
+    adapter.cancel_order = AsyncMock()
+    adapter.fetch_open_orders = AsyncMock(return_value=[])
+    adapter.place_limit_order = AsyncMock()
+    adapter.fetch_account_funds = AsyncMock(
+        return_value=AccountFundsSnapshot(equity_usdt=1000.0, free_usdt=500.0, used_usdt=500.0, source="test")
+    )
+    adapter.fetch_position = AsyncMock(return_value=PositionSnapshot(symbol=cfg.symbol, base_position=0.0, notional=0.0))
+    # 批量与撤改接口走基类默认实现，落到上面的单笔 mock。
+    for name in ("place_limit_orders", "cancel_orders", "cancel_replace_order"):
+        setattr(adapter, name, partial(getattr(ExchangeAdapter, name), adapter))
+    engine = StrategyEngine(
+        adapter=adapter,
+        config_store=Mock(get=Mock(return_value=cfg)),
+        monitor=Mock(),
+        event_bus=Mock(publish=AsyncMock()),
+        alert_service=Mock(send=AsyncMock(), send_event=AsyncMock()),
+    )
+    return engine, adapter
+
+
+def test_sync_orders_reads_tracked_orders_between_reconciles():
+    cfg = RuntimeConfig(symbol="BNB_USDT_Perp", order_reconcile_interval_sec=60.0)
+    engine, adapter = _build_engine(cfg)
+
+    def placed(**kwargs):
+        return OrderSnapshot(
+            order_id=f"oid-{kwargs['side']}",
+            side=kwargs["side"],
+            price=kwargs["price"],
+            size=kwargs["size"],
+            status="open",
+            created_at=utcnow(),
+            client_order_id=kwargs["client_order_id"],
+        )
+
+    adapter.place_limit_order = AsyncMock(side_effect=placed)
+    position = PositionSnapshot(symbol=cfg.symbol, base_position=0.0, notional=0.0)
+    decision = QuoteDecision(
+        bid_price=100.0,
+        ask_price=100.2,
+        quote_size_base=0.1,
+        quote_size_notional=10.0,
+        spread_bps=20.0,
+        gamma=0.2,
+        reservation_price=100.1,
+    )
+
+    async def scenario():
+        first = await engine._sync_orders(  # noqa: SLF001
+            cfg=cfg,
+            effective_capacity_notional=1000.0,
+            position=position,
+            decision=decision,
+        )
+        second = await engine._sync_orders(  # noqa: SLF001
+            cfg=cfg,
+            effective_capacity_notional=1000.0,
+            position=position,
+            decision=decision,
+        )
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first.requoted is True
+    assert {o.order_id for o in first.open_orders} == {"oid-buy", "oid-sell"}
+    assert second.requoted is False
+    assert adapter.fetch_open_orders.await_count == 1
+    assert adapter.place_limit_order.await_count == 2
+
+
+def _stale_orders(cfg: RuntimeConfig) -> list[OrderSnapshot]:
+    old = utcnow() - timedelta(seconds=cfg.order_ttl_sec + 5)
+    return [
+        OrderSnapshot(order_id="old-buy", side="buy", price=99.0, size=0.1, status="open", created_at=old),
+        OrderSnapshot(order_id="old-sell", side="sell", price=101.0, size=0.1, status="open", created_at=old),
+    ]
+
+
+def _requote_decision() -> QuoteDecision:
+    return QuoteDecision(
+        bid_price=100.0,
+        ask_price=100.2,
+        quote_size_base=0.1,
+        quote_size_notional=10.0,
+        spread_bps=20.0,
+        gamma=0.2,
+        reservation_price=100.1,
+    )
+
+
+def test_sync_orders_dispatches_both_sides_concurrently_and_cancels_after_place():
+    cfg = RuntimeConfig(symbol="BNB_USDT_Perp")
+    engine, adapter = _build_engine(cfg)
+    adapter.fetch_open_orders = AsyncMock(return_value=_stale_orders(cfg))
+    in_flight = 0
+    peak = 0
+
+    async def round_trip():
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+
+    async def placed(**kwargs):
+        await round_trip()
+        return OrderSnapshot(
+            order_id=f"new-{kwargs['side']}",
+            side=kwargs["side"],
+            price=kwargs["price"],
+            size=kwargs["size"],
+            status="open",
+            created_at=utcnow(),
+        )
+
+    async def canceled(symbol, order_id):
+        await round_trip()
+
+    adapter.place_limit_order = AsyncMock(side_effect=placed)
+    adapter.cancel_order = AsyncMock(side_effect=canceled)
+    position = PositionSnapshot(symbol=cfg.symbol, base_position=0.0, notional=0.0)
+
+    result = asyncio.run(
+        engine._sync_orders(  # noqa: SLF001
+            cfg=cfg,
+            effective_capacity_notional=1000.0,
+            position=position,
+            decision=_requote_decision(),
+        )
+    )
+
+    # 两侧并发；每侧先挂新单再撤旧单。
+    assert peak == 2
+    assert adapter.cancel_order.await_count == 2
+    assert result.requoted is True
+    assert {o.order_id for o in result.open_orders} == {"new-buy", "new-sell"}
+
+
+def test_sync_orders_one_side_failure_raises_after_other_side_tracked():
+    cfg = RuntimeConfig(symbol="BNB_USDT_Perp")
+    engine, adapter = _build_engine(cfg)
+    engine._consecutive_failures = 2  # noqa: SLF001
+
+    async def placed(**kwargs):
+        if kwargs["side"] == "sell":
+            raise RuntimeError("sell rejected")
+        return OrderSnapshot(
+            order_id="new-buy",
+            side="buy",
+            price=kwargs["price"],
+            size=kwargs["size"],
+            status="open",
+            created_at=utcnow(),
+        )
+
+    adapter.place_limit_order = AsyncMock(side_effect=placed)
+    position = PositionSnapshot(symbol=cfg.symbol, base_position=0.0, notional=0.0)
+
+    async def scenario():
+        try:
+            await engine._sync_orders(  # noqa: SLF001
+                cfg=cfg,
+                effective_capacity_notional=1000.0,
+                position=position,
+                decision=_requote_decision(),
+            )
+        except RuntimeError as exc:
+            return exc
+        return None
+
+    error = asyncio.run(scenario())
+
+    assert str(error) == "sell rejected"
+    # 失败不清零，由主循环累加。
+    assert engine.consecutive_failures == 2
+    assert engine._orders.get("new-buy") is not None  # noqa: SLF001
+    assert engine._orders.needs_reconcile(60.0)  # noqa: SLF001
+
+
+def test_sync_orders_replaces_immediately_when_replace_place_fails_after_cancel():
+    cfg = RuntimeConfig(symbol="BNB_USDT_Perp")
+    engine, adapter = _build_engine(cfg)
+    adapter.fetch_open_orders = AsyncMock(return_value=_stale_orders(cfg))
+    attempts: dict[str, int] = {}
+
+    async def placed(**kwargs):
+        side = kwargs["side"]
+        attempts[side] = attempts.get(side, 0) + 1
+        if side == "buy" and attempts[side] == 1:
+            raise RuntimeError("buy rejected")
+        return OrderSnapshot(
+            order_id=f"new-{side}-{attempts[side]}",
+            side=side,
+            price=kwargs["price"],
+            size=kwargs["size"],
+            status="open",
+            created_at=utcnow(),
+        )
+
+    adapter.place_limit_order = AsyncMock(side_effect=placed)
+    # 与 GRVT 相同的并发撤改实现。
+    adapter.cancel_replace_order = partial(ExchangeAdapter._cancel_replace_concurrently, adapter)  # noqa: SLF001
+    position = PositionSnapshot(symbol=cfg.symbol, base_position=0.0, notional=0.0)
+
+    result = asyncio.run(
+        engine._sync_orders(  # noqa: SLF001
+            cfg=cfg,
+            effective_capacity_notional=1000.0,
+            position=position,
+            decision=_requote_decision(),
+        )
+    )
+
+    # 旧买单已撤、新买单失败时同一 tick 内补挂，该侧不留空窗。
+    assert attempts == {"buy": 2, "sell": 1}
+    assert result.requoted is True
+    assert engine._orders.get("new-buy-2") is not None  # noqa: SLF001
+
+
+def test_sync_orders_keeps_old_order_when_default_replace_place_fails():
+    cfg = RuntimeConfig(symbol="BNB_USDT_Perp")
+    engine, adapter = _build_engine(cfg)
+    stale = _stale_orders(cfg)
+    adapter.fetch_open_orders = AsyncMock(return_value=stale)
+    adapter.place_limit_order = AsyncMock(side_effect=RuntimeError("rejected"))
+    position = PositionSnapshot(symbol=cfg.symbol, base_position=0.0, notional=0.0)
+
+    async def scenario():
+        try:
+            await engine._sync_orders(  # noqa: SLF001
+                cfg=cfg,
+                effective_capacity_notional=1000.0,
+                position=position,
+                decision=_requote_decision(),
+            )
+        except RuntimeError as exc:
+            return exc
+        return None
+
+    assert str(asyncio.run(scenario())) == "rejected"
+    adapter.cancel_order.assert_not_awaited()
+    assert {o.order_id for o in engine._orders.open_orders()} == {o.order_id for o in stale}  # noqa: SLF001
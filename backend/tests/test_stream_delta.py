@@ -0,0 +1,120 @@
+import copy
+import json
+
+from fastapi.testclient import TestClient
+
+from app.core.auth import create_access_token
+from app.core.settings import get_settings
+from app.main import create_app
+from app.services.event_bus import EncodedEvent
+from app.services.stream_delta import TickDeltaEncoder
+
+
+def _apply(state: dict | None, message: dict) -> dict:
+    """参考客户端：按协议把快照/增量还原成完整 tick。"""
+    body = message["payload"]
+    if message["type"] == "tick_snapshot":
+        return copy.deepcopy(body["state"])
+    assert state is not None
+    state = copy.deepcopy(state)
+    for key, fields in body.get("fields", {}).items():
+        state[key].update(fields)
+    for key, removed in body.get("unset", {}).items():
+        for field in removed:
+            state[key].pop(field, None)
+    for key, diff in body.get("lists", {}).items():
+        items = {item["order_id"]: item for item in state[key] if item["order_id"] not in diff.get("remove", [])}
+        for item in diff.get("upsert", []):
+            items[item["order_id"]] = item
+        state[key] = list(items.values())
+    state.update(body.get("replace", {}))
+    for key in body.get("drop", []):
+        state.pop(key, None)
+    return state
+
+
+def _tick(n: int, orders: list[dict]) -> dict:
+    summary = {f"field_{i}": i for i in range(40)}
+    summary["mid"] = 600.0 + (n % 3) * 0.01
+    summary["loop_count"] = n
+    return {
+        "summary": summary,
+        "open_orders": orders,
+        "diagnostics": {"target_bid": 599.9, "target_ask": 600.1, "requote_reason": "none"},
+    }
+
+
+def _order(order_id: str, price: float) -> dict:
+    return {"order_id": order_id, "side": "buy", "price": price, "size": 0.1, "status": "open", "created_at": "2026-01-01T00:00:00"}
+
+
+def test_delta_stream_reconstructs_every_tick_and_shrinks_payload():
+    encoder = TickDeltaEncoder(resync_interval_sec=3600)
+    state = None
+    full_bytes = delta_bytes = 0
+    for n in range(50):
+        orders = [_order("a", 599.9)] if n < 25 else [_order("a", 599.9), _order("b", 600.1)]
+        if n >= 40:
+            orders = [_order("b", 600.2)]
+        payload = _tick(n, orders)
+        event = EncodedEvent("tick", payload)
+        text = encoder.encode(event)
+        state = _apply(state, json.loads(text))
+        assert state == json.loads(event.data)["payload"]
+        full_bytes += len(event.data)
+        delta_bytes += len(text)
+
+    assert encoder.snapshots == 1
+    assert encoder.deltas == 49
+    assert delta_bytes * 5 < full_bytes
+
+
+def test_delta_encoder_sends_order_add_remove_and_periodic_snapshot():
+    encoder = TickDeltaEncoder(resync_interval_sec=0.0)
+    first = json.loads(encoder.encode(EncodedEvent("tick", _tick(1, []))))
+    second = json.loads(encoder.encode(EncodedEvent("tick", _tick(2, []))))
+    assert first["type"] == second["type"] == "tick_snapshot"
+    assert second["payload"]["seq"] == 2
+
+    encoder = TickDeltaEncoder(resync_interval_sec=3600)
+    encoder.encode(EncodedEvent("tick", _tick(1, [_order("a", 1.0)])))
+    delta = json.loads(encoder.encode(EncodedEvent("tick", _tick(2, [_order("b", 2.0)]))))
+    assert delta["type"] == "tick_delta"
+    assert delta["payload"]["lists"]["open_orders"] == {"upsert": [_order("b", 2.0)], "remove": ["a"]}
+    assert delta["payload"]["fields"]["summary"] == {"mid": 600.02, "loop_count": 2}
+    assert "diagnostics" not in delta["payload"].get("fields", {})
+
+
+def test_stream_ws_delta_protocol_is_opt_in(tmp_path, monkeypatch):
+    monkeypatch.setenv("RUNTIME_CONFIG_PATH", str(tmp_path / "runtime.json"))
+    monkeypatch.setenv("EXCHANGE_CONFIG_PATH", str(tmp_path / "exchange.json"))
+    monkeypatch.setenv("TELEGRAM_CONFIG_PATH", str(tmp_path / "telegram.json"))
+    monkeypatch.setenv("APP_JWT_SECRET", "test-secret")
+    get_settings.cache_clear()
+
+    app = create_app()
+    with TestClient(app) as client:
+        token = create_access_token(get_settings(), "admin")
+        bus = app.state.container.event_bus
+        with client.websocket_connect(f"/ws/stream?token={token}&topics=tick,error&protocol=delta") as ws:
+            hello = ws.receive_json()
+            assert hello["payload"]["protocol"] == "delta"
+            assert hello["payload"]["version"] == 1
+            client.portal.call(bus.publish, "tick", _tick(1, []))
+            snapshot = json.loads(ws.receive_text())
+            client.portal.call(bus.publish, "tick", _tick(2, []))
+            delta = json.loads(ws.receive_text())
+            client.portal.call(bus.publish, "error", {"message": "boom"})
+            error = json.loads(ws.receive_text())
+
+        with client.websocket_connect(f"/ws/stream?token={token}&topics=tick") as ws:
+            assert ws.receive_json()["payload"]["protocol"] == "full"
+            client.portal.call(bus.publish, "tick", _tick(3, []))
+            legacy = json.loads(ws.receive_text())
+
+    assert snapshot["type"] == "tick_snapshot" and snapshot["payload"]["state"]["summary"]["loop_count"] == 1
+    assert delta["type"] == "tick_delta" and delta["payload"]["fields"] == {"summary": {"mid": 600.02, "loop_count": 2}}
+    assert error == {"type": "error", "ts": error["ts"], "payload": {"message": "boom"}}
+    assert legacy["type"] == "tick" and legacy["payload"]["summary"]["loop_count"] == 3
+
+    get_settings.cache_clear()
@@ -0,0 +1,119 @@
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.models import EngineTick, MarketSnapshot, PositionSnapshot, QuoteDecision
+from app.services.metrics_history import ROLLUP_HEADER_SIZE, ROLLUP_RECORD, RollupWriter, read_rollup
+from app.services.tick_journal import HEADER_SIZE, RECORD, RECORD_FIELDS, TickJournal, TickJournalReader
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _tick(i: int) -> EngineTick:
+    ts = T0 + timedelta(seconds=i)
+    mid = 600.0 + i * 0.01
+    return EngineTick(
+        timestamp=ts,
+        market=MarketSnapshot("BNB_USDT_Perp", mid - 0.05, mid + 0.05, mid, 1.0, 0.5, ts),
+        decision=QuoteDecision(mid - 0.1, mid + 0.1, 0.2, 120.0, 3.3, 0.1, mid),
+        position=PositionSnapshot("BNB_USDT_Perp", 0.1 * i, 60.0 * i),
+        equity=1000.0 + i,
+        pnl=float(i),
+        pnl_total=float(i),
+        pnl_daily=float(i),
+        sigma=0.001,
+        sigma_zscore=0.5,
+    )
+
+
+def test_journal_rotates_segments_and_serves_range_queries(tmp_path):
+    journal = TickJournal(tmp_path, segment_records=40, flush_interval_sec=0.05)
+    for i in range(100):
+        journal.append(_tick(i), {"loop_elapsed_ms": i * 0.5, "quote_ready_ms": 1.25})
+    journal.close()
+
+    stats = journal.stats()
+    assert stats["written"] == 100 and stats["dropped"] == 0
+    assert stats["segments_rotated"] == 2
+    segments = sorted(tmp_path.glob("ticks-*.seg"))
+    assert len(segments) == 3
+    # 封段后截掉预分配空间，每段仅保留实际记录。
+    assert [os.path.getsize(p) for p in segments] == [HEADER_SIZE + n * RECORD.size for n in (40, 40, 20)]
+
+    reader = TickJournalReader(tmp_path)
+    cols = reader.read_range(T0 + timedelta(seconds=35), T0 + timedelta(seconds=45), fields=["ts", "mid", "loop_elapsed_ms"])
+    assert list(cols["ts"]) == [(T0 + timedelta(seconds=s)).timestamp() for s in range(35, 46)]
+    assert cols["mid"][0] == 600.35
+    assert cols["loop_elapsed_ms"][-1] == 22.5
+
+    rows = list(reader.iter_records())
+    assert len(rows) == 100
+    row = dict(zip(RECORD_FIELDS, rows[7]))
+    assert row["inventory_notional"] == 420.0 and row["quote_ready_ms"] == 1.25 and row["fetch_market_ms"] == 0.0
+
+
+def test_journal_is_readable_while_segment_is_still_active(tmp_path):
+    journal = TickJournal(tmp_path, segment_records=1000, flush_interval_sec=0.05)
+    try:
+        for i in range(10):
+            journal.append(_tick(i))
+        deadline = time.monotonic() + 2.0
+        while journal.stats()["written"] < 10 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        cols = journal.reader().read_range(start=(T0 + timedelta(seconds=8)).timestamp(), fields=["equity"])
+        assert list(cols["equity"]) == [1008.0, 1009.0]
+    finally:
+        journal.close()
+
+
+def test_journal_drops_instead_of_blocking_when_writer_lags(tmp_path):
+    journal = TickJournal(tmp_path, queue_size=1)
+    journal._ensure_writer = lambda: None  # noqa: SLF001  写线程未启动，模拟落盘严重滞后
+    for i in range(5):
+        journal.append(_tick(i))
+    assert journal.stats()["dropped"] == 4
+
+
+def test_journal_prunes_oldest_segments_beyond_byte_budget(tmp_path):
+    segment_bytes = HEADER_SIZE + 20 * RECORD.size
+    journal = TickJournal(tmp_path, segment_records=20, retention_max_bytes=segment_bytes * 2, flush_interval_sec=0.05)
+    for i in range(100):
+        journal.append(_tick(i))
+    journal.close()
+
+    segments = TickJournalReader(tmp_path).segments()
+    assert journal.stats()["segments_pruned"] == 3
+    assert len(segments) == 2
+    assert next(TickJournalReader(tmp_path).iter_records())[0] == (T0 + timedelta(seconds=60)).timestamp()
+
+
+def test_rollup_files_follow_journal_retention_and_byte_budget(tmp_path):
+    by_age = RollupWriter(tmp_path, 1, retention_sec=20)
+    by_size = RollupWriter(tmp_path, 5, retention_max_bytes=ROLLUP_HEADER_SIZE + 4 * ROLLUP_RECORD.size)
+    journal = TickJournal(tmp_path, sinks=[by_age, by_size], flush_interval_sec=0.05)
+    for i in range(100):
+        journal.append(_tick(i))
+    journal.close()
+
+    newest = (T0 + timedelta(seconds=99)).timestamp()
+    kept = read_rollup(by_age.path, 0, newest)
+    assert by_age.buckets_pruned > 0
+    assert newest - kept[0][0] <= 20 * 1.1
+    assert kept[-1][0] == newest
+    assert by_size.path.stat().st_size <= ROLLUP_HEADER_SIZE + 4 * ROLLUP_RECORD.size
+    assert read_rollup(by_size.path, 0, newest)[-1][0] == (T0 + timedelta(seconds=95)).timestamp()
+
+
+def test_journal_close_returns_when_writer_thread_is_gone(tmp_path):
+    journal = TickJournal(tmp_path, queue_size=1)
+    # 写线程已退出且队列已满时，close 不能阻塞在哨兵入队上。
+    dead = threading.Thread(target=lambda: None)
+    dead.start()
+    dead.join()
+    journal._thread = dead  # noqa: SLF001
+    journal._queue.put_nowait(b"")  # noqa: SLF001
+
+    started = time.monotonic()
+    journal.close(timeout_sec=2.0)
+    assert time.monotonic() - started < 0.5
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import sys
+import time
+from collections import deque
+from pathlib import Path
+from statistics import mean, pstdev
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+from app.engine.adaptive import AdaptiveController  # noqa: E402
+
+
+class LegacyAdaptiveController:
+    """改造前的逐 tick 全量扫描实现，仅作为基准对照。"""
+
+    def __init__(self, maxlen: int) -> None:
+        self._returns: deque[float] = deque(maxlen=maxlen)
+        self._depth_scores: deque[float] = deque(maxlen=maxlen)
+        self._trade_intensity: deque[float] = deque(maxlen=maxlen)
+        self._sigma_history: deque[float] = deque(maxlen=maxlen)
+        self._last_mid: float | None = None
+        self._sigma_window_points = 60
+        self._sigma_z_window_points = 180
+
+    def set_windows(self, sigma_window_sec: int, quote_interval_sec: float) -> None:
+        points = max(10, min(600, int(round(float(sigma_window_sec) / max(quote_interval_sec, 0.05)))))
+        self._sigma_window_points = points
+        self._sigma_z_window_points = max(20, min(2000, points * 3))
+
+    def update(self, mid: float, depth_score: float, trade_intensity: float) -> tuple[float, float]:
+        if self._last_mid:
+            self._returns.append(math.log(mid / self._last_mid))
+        self._last_mid = mid
+        self._depth_scores.append(depth_score)
+        self._trade_intensity.append(trade_intensity)
+        sigma = self.current_sigma()
+        self._sigma_history.append(sigma)
+        z = 0.0
+        if len(self._sigma_history) >= 20:
+            recent = list(self._sigma_history)[-self._sigma_z_window_points :]
+            sd = pstdev(recent)
+            z = (sigma - mean(recent)) / sd if sd >= 1e-12 else 0.0
+        return sigma, z
+
+    def current_sigma(self) -> float:
+        recent = list(self._returns)[-self._sigma_window_points :]
+        if len(recent) < 4:
+            return 0.001
+        ewma_var = max(recent[0] * recent[0], 1e-12)
+        for ret in recent[1:]:
+            ewma_var = 0.94 * ewma_var + 0.06 * (ret * ret)
+        return max(1e-6, math.sqrt(ewma_var))
+
+    def depth_factor(self) -> float:
+        return self._depth_scores[-1] / max(mean(self._depth_scores), 1e-9)
+
+    def intensity_factor(self) -> float:
+        return self._trade_intensity[-1] / max(mean(self._trade_intensity), 1e-9)
+
+    def quote_size_factor(self) -> float:
+        return self.current_sigma()
+
+
+def _per_tick_us(controller, window: int, ticks: int, seed: int) -> float:
+    """与引擎一致：每 tick 调用 update + 三个因子；返回稳态单 tick 平均耗时（微秒）。"""
+    rng = random.Random(seed)
+    # 历史长度取 window；sigma 窗口取其 1/3（上限 600），z 窗口为 sigma 窗口的 3 倍。
+    controller.set_windows(window // 3, 1.0)
+    price = 100.0
+    for _ in range(window * 3):
+        price *= math.exp(rng.gauss(0.0, 0.001))
+        controller.update(price, rng.uniform(0.5, 2.0), rng.uniform(0.5, 2.0))
+
+    started = time.perf_counter()
+    for _ in range(ticks):
+        price *= math.exp(rng.gauss(0.0, 0.001))
+        controller.update(price, rng.uniform(0.5, 2.0), rng.uniform(0.5, 2.0))
+        controller.depth_factor()
+        controller.intensity_factor()
+        controller.quote_size_factor()
+    return (time.perf_counter() - started) / ticks * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="AdaptiveController 单 tick 耗时基准")
+    parser.add_argument("--ticks", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{'window':>8} {'legacy_us':>12} {'rolling_us':>12} {'speedup':>9}")
+    for window in (600, 2000):
+        legacy = _per_tick_us(LegacyAdaptiveController(maxlen=window), window, args.ticks, seed=window)
+        rolling = _per_tick_us(AdaptiveController(maxlen=window), window, args.ticks, seed=window)
+        print(f"{window:>8} {legacy:>12.2f} {rolling:>12.2f} {legacy / rolling:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+"""StrategyEngine 热路径基准：瞬时内存适配器驱动真实 tick，按阶段统计 CPU 耗时与内存分配，结果写 JSON。
+
+用法（在仓库根目录下）：
+    python scripts/bench_engine_hot_path.py --ticks 2000 --out backend/data/bench/engine.json
+    python scripts/bench_engine_hot_path.py --baseline backend/data/bench/engine-<旧提交>.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import functools
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+BACKEND_DIR = Path(__file__).resolve().parents[1] / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.engine.strategy_engine import StrategyEngine  # noqa: E402
+from app.exchange.base import ExchangeAdapter  # noqa: E402
+from app.models import (  # noqa: E402
+    AccountFundsSnapshot,
+    MarketSnapshot,
+    OrderSnapshot,
+    PositionSnapshot,
+    TradeSnapshot,
+    utcnow,
+)
+from app.schemas import RuntimeConfig  # noqa: E402
+from app.services.event_bus import EventBus  # noqa: E402
+from app.services.monitoring import MonitoringService  # noqa: E402
+from app.services.quantiles import QuantileSketch  # noqa: E402
+
+SYMBOL = "BNB_USDT_Perp"
+STAGES: tuple[str, ...] = (
+    "adaptive_update",
+    "compute_quote",
+    "post_only_guard",
+    "sync_orders",
+    "monitor_update_tick",
+    "event_bus_publish",
+)
+
+
+class InstantAdapter(ExchangeAdapter):
+    """零延迟内存交易所：中间价随机游走，挂单即时受理，每隔若干 tick 成交一笔以覆盖成交路径。"""
+
+    def __init__(self, seed: int = 7, fill_every: int = 5) -> None:
+        self._rng = random.Random(seed)
+        self._mid = 600.0
+        self._orders: dict[str, OrderSnapshot] = {}
+        self._trades: list[TradeSnapshot] = []
+        self._position = 0.0
+        self._ids = 0
+        self._reads = 0
+        self._fill_every = fill_every
+
+    async def ping(self) -> bool:
+        return True
+
+    async def fetch_market_snapshot(self, symbol: str) -> MarketSnapshot:
+        self._mid *= 1.0 + self._rng.gauss(0.0, 0.0002)
+        self._reads += 1
+        if self._fill_every and self._reads % self._fill_every == 0 and self._orders:
+            self._fill(next(iter(self._orders.values())))
+        half = self._mid * 0.0001
+        return MarketSnapshot(
+            symbol=symbol,
+            bid=round(self._mid - half, 2),
+            ask=round(self._mid + half, 2),
+            mid=self._mid,
+            depth_score=1.0,
+            trade_intensity=1.0,
+            timestamp=utcnow(),
+        )
+
+    async def fetch_account_funds(self) -> AccountFundsSnapshot:
+        equity = 10_000.0 + self._position * self._mid
+        return AccountFundsSnapshot(equity_usdt=equity, free_usdt=equity * 0.8, used_usdt=equity * 0.2, source="bench")
+
+    async def fetch_equity(self) -> float:
+        return (await self.fetch_account_funds()).equity_usdt
+
+    async def fetch_position(self, symbol: str) -> PositionSnapshot:
+        return PositionSnapshot(symbol=symbol, base_position=self._position, notional=self._position * self._mid)
+
+    async def fetch_open_orders(self, symbol: str) -> list[OrderSnapshot]:
+        return list(self._orders.values())
+
+    async def fetch_recent_trades(self, symbol: str, limit: int = 50) -> list[TradeSnapshot]:
+        return self._trades[-limit:]
+
+    async def place_limit_order(self, symbol, side, price, size, post_only, client_order_id) -> OrderSnapshot:
+        self._ids += 1
+        order = OrderSnapshot(
+            order_id=f"bench-{self._ids}",
+            side=side,
+            price=price,
+            size=size,
+            status="open",
+            created_at=utcnow(),
+            client_order_id=client_order_id,
+        )
+        self._orders[order.order_id] = order
+        return order
+
+    async def cancel_order(self, symbol: str, order_id: str) -> None:
+        self._orders.pop(order_id, None)
+
+    async def cancel_all_orders(self, symbol: str) -> None:
+        self._orders.clear()
+
+    async def close_position_taker(self, symbol: str, side: str, size: float, reduce_only: bool = True) -> OrderSnapshot:
+        self._position += size if side == "buy" else -size
+        self._ids += 1
+        return OrderSnapshot(
+            order_id=f"bench-{self._ids}",
+            side=side,
+            price=self._mid,
+            size=size,
+            status="filled",
+            created_at=utcnow(),
+        )
+
+    async def flatten_position_taker(self, symbol: str) -> None:
+        self._position = 0.0
+
+    def _fill(self, order: OrderSnapshot) -> None:
+        self._orders.pop(order.order_id, None)
+        self._position += order.size if order.side == "buy" else -order.size
+        self._ids += 1
+        self._trades.append(
+            TradeSnapshot(
+                trade_id=f"bench-t{self._ids}",
+                side=order.side,
+                price=order.price,
+                size=order.size,
+                fee=-order.price * order.size * 0.00005,
+                created_at=utcnow(),
+                symbol=SYMBOL,
+                order_id=order.order_id,
+            )
+        )
+
+
+class _StaticConfig:
+    def __init__(self, config: RuntimeConfig) -> None:
+        self._config = config
+
+    def get(self) -> RuntimeConfig:
+        return self._config
+
+
+class _NullAlerts:
+    async def send_event(self, **kwargs) -> None:
+        return None
+
+
+class StageProbe:
+    """给引擎各阶段套上计时（或分配统计）包装；alloc 模式下记录每次调用相对起点的内存峰值增量。"""
+
+    def __init__(self, track_allocations: bool) -> None:
+        self.track_allocations = track_allocations
+        self.samples: dict[str, list[float]] = {name: [] for name in STAGES}
+
+    def _measure_start(self) -> float:
+        if self.track_allocations:
+            tracemalloc.reset_peak()
+            return float(tracemalloc.get_traced_memory()[0])
+        return time.thread_time_ns() / 1000.0
+
+    def _measure_end(self, name: str, start: float) -> None:
+        if self.track_allocations:
+            self.samples[name].append(tracemalloc.get_traced_memory()[1] - start)
+        else:
+            self.samples[name].append(time.thread_time_ns() / 1000.0 - start)
+
+    def wrap(self, name: str, fn: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def timed_async(*args, **kwargs):
+                start = self._measure_start()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    self._measure_end(name, start)
+
+            return timed_async
+
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            start = self._measure_start()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._measure_end(name, start)
+
+        return timed
+
+
+async def _drive(ticks: int, warmup: int, probe: StageProbe, seed: int) -> list[dict[str, float]]:
+    bus = EventBus()
+    subscriber = bus.subscribe(["tick"], label="bench")
+    monitor = MonitoringService(max_points=2000)
+    engine = StrategyEngine(
+        adapter=InstantAdapter(seed=seed),
+        config_store=_StaticConfig(RuntimeConfig(symbol=SYMBOL, tg_heartbeat_enabled=False)),
+        monitor=monitor,
+        event_bus=bus,
+        alert_service=_NullAlerts(),
+        interval_scale=0.0,
+    )
+    engine._adaptive.update = probe.wrap("adaptive_update", engine._adaptive.update)  # noqa: SLF001
+    engine._as_model.compute_quote = probe.wrap("compute_quote", engine._as_model.compute_quote)  # noqa: SLF001
+    engine._post_only_guard = probe.wrap("post_only_guard", engine._post_only_guard)  # noqa: SLF001
+    engine._sync_orders = probe.wrap("sync_orders", engine._sync_orders)  # noqa: SLF001
+    monitor.update_tick = probe.wrap("monitor_update_tick", monitor.update_tick)
+
+    publish = probe.wrap("event_bus_publish", bus.publish)
+    per_tick: list[dict[str, float]] = []
+    seen = 0
+    mark = {"cpu": time.thread_time_ns(), "wall": time.perf_counter_ns(), "mem": 0.0}
+    if probe.track_allocations:
+        mark["mem"] = float(tracemalloc.get_traced_memory()[0])
+
+    async def counting_publish(topic: str, payload: dict) -> None:
+        nonlocal seen
+        await publish(topic, payload)
+        if topic != "tick":
+            return
+        while subscriber.qsize():
+            subscriber.get_nowait()
+        seen += 1
+        now_cpu, now_wall = time.thread_time_ns(), time.perf_counter_ns()
+        row = {"cpu_us": (now_cpu - mark["cpu"]) / 1000.0, "wall_us": (now_wall - mark["wall"]) / 1000.0}
+        if probe.track_allocations:
+            # 阶段包装会重置峰值，tick 级只统计净增长（持续为正说明有泄漏或无界缓存）。
+            current = tracemalloc.get_traced_memory()[0]
+            row["net_bytes"] = current - mark["mem"]
+            mark["mem"] = float(current)
+        if seen == warmup:
+            for samples in probe.samples.values():
+                samples.clear()
+        elif seen > warmup:
+            per_tick.append(row)
+        if seen >= warmup + ticks:
+            engine._stop_event.set()  # noqa: SLF001
+        mark["cpu"], mark["wall"] = time.thread_time_ns(), time.perf_counter_ns()
+
+    bus.publish = counting_publish  # type: ignore[method-assign]
+    engine._mode = "running"  # noqa: SLF001
+    await engine._run_loop()  # noqa: SLF001
+    return per_tick
+
+
+def _summary(values: list[float], unit: str) -> dict[str, float]:
+    sketch = QuantileSketch()
+    for value in values:
+        sketch.add(value)
+    stats = sketch.summary()
+    mean = sum(values) / len(values) if values else 0.0
+    return {
+        "count": len(values),
+        f"mean_{unit}": round(mean, 3),
+        f"p50_{unit}": round(stats["p50"], 3),
+        f"p99_{unit}": round(stats["p99"], 3),
+    }
+
+
+def _git_commit() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_benchmark(ticks: int = 2000, warmup: int = 100, seed: int = 7, allocations: bool = True) -> dict[str, Any]:
+    """先跑一轮纯计时，再在 tracemalloc 下跑一轮统计分配，避免追踪开销污染 CPU 数据。"""
+    timing = StageProbe(track_allocations=False)
+    per_tick = asyncio.run(_drive(ticks, warmup, timing, seed))
+    tick_cpu = [row["cpu_us"] for row in per_tick]
+    total_cpu = sum(tick_cpu) or 1.0
+    stages = {}
+    for name in STAGES:
+        values = timing.samples[name]
+        stages[name] = {**_summary(values, "us"), "share_pct": round(sum(values) / total_cpu * 100.0, 2)}
+    result: dict[str, Any] = {
+        "benchmark": "engine_hot_path",
+        "commit": _git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "ticks": len(per_tick),
+        "warmup": warmup,
+        "tick": {
+            **_summary(tick_cpu, "us"),
+            "mean_wall_us": round(sum(row["wall_us"] for row in per_tick) / max(1, len(per_tick)), 3),
+        },
+        "stages": stages,
+    }
+    if allocations:
+        alloc = StageProbe(track_allocations=True)
+        tracemalloc.start()
+        try:
+            alloc_ticks = asyncio.run(_drive(ticks, warmup, alloc, seed))
+        finally:
+            tracemalloc.stop()
+        result["allocations"] = {
+            "tick": _summary([row["net_bytes"] for row in alloc_ticks], "net_bytes"),
+            "stages": {name: _summary(alloc.samples[name], "peak_bytes") for name in STAGES},
+        }
+    return result
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any]) -> list[str]:
+    """按阶段对比平均 CPU 耗时，输出便于贴进评审的变化百分比。"""
+    lines = [f"baseline {baseline.get('commit')} -> current {current.get('commit')}"]
+    rows = [("tick", baseline["tick"], current["tick"])]
+    rows += [(name, baseline["stages"].get(name), current["stages"][name]) for name in STAGES]
+    for name, old, new in rows:
+        if not old:
+            continue
+        before, after = old["mean_us"], new["mean_us"]
+        delta = (after - before) / before * 100.0 if before else 0.0
+        lines.append(f"{name:<22}{before:>10.1f}us -> {after:>10.1f}us  {delta:+6.1f}%")
+    return lines
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="StrategyEngine 热路径基准")
+    parser.add_argument("--ticks", type=int, default=2000, help="计入统计的 tick 数")
+    parser.add_argument("--warmup", type=int, default=100, help="预热 tick 数（不计入）")
+    parser.add_argument("--seed", type=int, default=7, help="价格随机游走种子")
+    parser.add_argument("--no-alloc", action="store_true", help="跳过 tracemalloc 分配统计")
+    parser.add_argument("--out", default="", help="结果 JSON 路径，默认 backend/data/bench/engine-hot-path-<提交>.json")
+    parser.add_argument("--baseline", default="", help="与之对比的历史结果 JSON")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.ticks, args.warmup, args.seed, allocations=not args.no_alloc)
+    out = Path(args.out) if args.out else BACKEND_DIR / "data" / "bench" / f"engine-hot-path-{result['commit']}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"基准结果已写入: {out}")
+    print(f"tick CPU 均值 {result['tick']['mean_us']:.1f}us  p99 {result['tick']['p99_us']:.1f}us")
+    for name, stats in result["stages"].items():
+        print(f"  {name:<22}{stats['mean_us']:>10.1f}us  {stats['share_pct']:>6.2f}%")
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        print("\n".join(compare(result, baseline)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())